@@ -2,20 +2,55 @@
 Advanced Simulation API Endpoint
 Integrates the complete simulation engine with the FastAPI backend
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime
+import asyncio
 import json
+import numpy as np
 
-from database import get_db, DigitalTwin, Simulation
-from sdg_graph import SDGIndicatorGraph
-from simulation_core import TimeStepSimulationEngine
-from simulation_explainer import SimulationExplainer
+from database import get_db, SessionLocal, DigitalTwin, Simulation, SimulationCheckpoint, SimulationJob, SimulationSweep
+from sdg_graph import get_compiled_graph
+from simulation_core import ConstraintEngine, SimulationTrajectory, DelayQueue
+from simulation_ensemble import net_progress
+from simulation_sweep import ParameterSweep
+from simulation_sensitivity import SensitivityAnalysis
+from simulation_preview import get_preview_model, PREVIEW_MAX_YEARS
+from simulation_explainer import SimulationExplainer, SUMMARY_SECTIONS
+from simulation_scenarios import SCENARIOS, default_variant
+from simulation_cache import simulation_cache, combine_stats
+from simulation_jobs import submit_job, job_status, save_sweep
+from simulation_executor import (
+    ENGINE_MODES, QueueFull, run_blocking, run_cpu, run_engine, stream_cpu,
+    simulate_task, simulate_stream, scenarios_task, ensemble_task, ensemble_stream,
+    exact_trajectory_task, goal_seek_task, pool_cache_stats
+)
 
 router = APIRouter(prefix="/api/simulation", tags=["advanced_simulation"])
 
+# Seconds a client is asked to wait when the simulation queue is full
+RETRY_AFTER_SECONDS = 5
+
+# Streamed response formats: one JSON event per line, or Server-Sent Events
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream',
+}
+
+# Longest simulated horizon a request may ask for
+MAX_TIMELINE_YEARS = 100
+
+# First horizon of each timeline bracket (see ConstraintEngine.timeline_factor);
+# checkpoints only resume within a bracket
+TIMELINE_BRACKETS = (0, 3, 8)
+
+# End-of-run checkpoints a what-if session keeps for extending its runs
+SESSION_CHECKPOINTS = 8
+
 
 class SimulationRequest(BaseModel):
     """Request model for running a simulation"""
@@ -26,6 +61,10 @@ class SimulationRequest(BaseModel):
     timeline_years: int = 5
     delay_months: int = 0
     project_id: Optional[int] = None
+    engine_mode: str = 'standard'  # 'standard', 'vectorized' or 'worklist'
+    propagation_epsilon: Optional[float] = None  # Worklist engine only (default 0.1)
+    seed: Optional[int] = None  # Set for reproducible (and cacheable) runs
+    fields: Optional[List[str]] = None  # Summary sections to generate (default all)
 
 
 class YearlyState(BaseModel):
@@ -48,47 +87,154 @@ class SimulationResponse(BaseModel):
     net_sdg_progress: float
     confidence_score: float
     
-    # Explanations
-    narrative: str
+    # Explanations (optional sections are None unless requested)
+    narrative: Optional[str] = None
     top_changes: List[Dict]
-    bottlenecks: List[Dict]
-    risk_factors: List[str]
-    recommendations: List[str]
+    bottlenecks: Optional[List[Dict]] = None
+    risk_factors: Optional[List[str]] = None
+    recommendations: Optional[List[str]] = None
     
     # Metadata
     created_at: datetime
     effectiveness: float
+    resumed_from_year: int = 0  # Years restored from a checkpoint instead of recomputed
+    resume_note: Optional[str] = None  # Why a shorter stored run was not resumed, if one exists
 
 
-@router.post("/run", response_model=SimulationResponse)
-async def run_advanced_simulation(
-    request: SimulationRequest,
-    db: Session = Depends(get_db)
-):
-    """
-    Run an advanced SDG Digital Twin simulation
+class EnsembleRequest(BaseModel):
+    """Request model for a Monte Carlo ensemble"""
+    digital_twin_id: int
+    target_sdgs: List[int]
+    scenario_type: str
+    funding_percentage: float = 100.0
+    timeline_years: int = 5
+    delay_months: int = 0
+    n_runs: int = 10000
+    seed: Optional[int] = None
+
+
+MAX_ENSEMBLE_RUNS = 100000
+
+# Trajectory values (runs x years x indicators) one ensemble may allocate,
+# about 160 MB per array in float64
+MAX_ENSEMBLE_VALUES = 20000000
+
+
+class ParameterRange(BaseModel):
+    """Evenly spaced parameter values from start to stop (inclusive)"""
+    start: float
+    stop: float
+    steps: int = 1
     
-    This endpoint uses the sophisticated simulation engine that includes:
-    - SDG indicator interdependencies
-    - Time-delayed effects
-    - Diminishing returns
-    - Constraints and trade-offs
-    - Feedback loops
-    - Scenario-based outcomes
-    """
+    def values(self, integer: bool = False) -> List:
+        values = np.linspace(self.start, self.stop, self.steps)
+        if integer:
+            return np.unique(np.round(values).astype(int)).tolist()
+        return values.tolist()
+
+
+class SweepRequest(BaseModel):
+    """Request model for a parameter sweep"""
+    digital_twin_id: int
+    target_sdgs: List[int]
+    scenario_type: str
+    funding_percentage: ParameterRange = ParameterRange(start=50.0, stop=100.0, steps=6)
+    delay_months: ParameterRange = ParameterRange(start=0, stop=24, steps=5)
+    timeline_years: ParameterRange = ParameterRange(start=5, stop=5, steps=1)
+    seed: Optional[int] = None
+
+
+MAX_SWEEP_POINTS = 100000
+
+
+class GoalSeekRequest(BaseModel):
+    """Request model for the goal-seeking solver"""
+    digital_twin_id: int
+    target_sdgs: List[int]
+    scenario_type: str
+    parameter: str = 'funding_percentage'  # 'funding_percentage' or 'delay_months'
+    metric: str = 'net_sdg_progress'  # or an indicator key, e.g. 'water_access'
+    target_value: float  # % change the metric must reach
+    funding_percentage: float = 100.0
+    timeline_years: int = 5
+    delay_months: int = 0
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    seed: Optional[int] = None
+
+
+class SensitivityRequest(BaseModel):
+    """Request model for global sensitivity analysis"""
+    digital_twin_id: int
+    target_sdgs: List[int]
+    scenario_type: str
+    method: str = 'sobol'  # 'sobol' or 'morris'
+    n_samples: int = 512  # Base samples (Sobol) or trajectories (Morris)
+    funding_percentage: List[float] = [50.0, 100.0]  # [lower, upper]
+    delay_months: List[float] = [0.0, 24.0]
+    timeline_years: List[int] = [3, 10]
+    weight_uncertainty: float = 0.5  # Influence weights vary by +/- this fraction
+    include_weights: bool = True
+    seed: Optional[int] = None
+
+
+MAX_SENSITIVITY_EVALUATIONS = 200000
+
+
+class PreviewRequest(BaseModel):
+    """Request model for the linearized fast preview"""
+    digital_twin_id: int
+    target_sdgs: List[int]
+    scenario_type: str
+    funding_percentage: float = 100.0
+    timeline_years: int = 5
+    delay_months: int = 0
+    seed: Optional[int] = None  # Use the exact engine's draws for this seed
+    verify: bool = False  # Also run the exact engine and report the actual error (needs a seed)
+
+
+class ScenarioVariant(BaseModel):
+    """One scenario of a batch comparison"""
+    scenario_type: str
+    funding_percentage: Optional[float] = None  # Default 100 (50 for 'underfunded')
+    delay_months: Optional[int] = None  # Default 0 (12 for 'delay')
+    name: Optional[str] = None  # Label in the results (default the scenario type)
+
+
+class BatchScenariosRequest(BaseModel):
+    """Request model for comparing custom scenario variants"""
+    target_sdgs: List[int]
+    scenarios: List[ScenarioVariant]
+
+
+MAX_SCENARIO_VARIANTS = 1000
+
+
+def _validate_simulation_request(request, db: Session) -> DigitalTwin:
+    """Validate the twin, target SDGs and scenario of a simulation request"""
     
     # Validate digital twin exists
     twin = db.query(DigitalTwin).filter(DigitalTwin.id == request.digital_twin_id).first()
     if not twin:
         raise HTTPException(status_code=404, detail="Digital twin not found")
     
-    # Validate SDGs
-    if not request.target_sdgs or len(request.target_sdgs) == 0:
+    _validate_simulation_parameters(request)
+    return twin
+
+
+def _validate_target_sdgs(target_sdgs: List[int]):
+    """Require at least one target SDG, each numbered 1-17"""
+    if not target_sdgs:
         raise HTTPException(status_code=400, detail="At least one target SDG is required")
     
-    for sdg in request.target_sdgs:
+    for sdg in target_sdgs:
         if sdg < 1 or sdg > 17:
             raise HTTPException(status_code=400, detail=f"Invalid SDG number: {sdg}")
+
+
+def _validate_simulation_parameters(request):
+    """Validate the target SDGs, scenario, horizon and seed of a simulation request"""
+    _validate_target_sdgs(request.target_sdgs)
     
     # Validate scenario type
     valid_scenarios = ['success', 'partial_success', 'delay', 'failure', 'underfunded']
@@ -98,30 +244,229 @@ async def run_advanced_simulation(
             detail=f"Invalid scenario type. Must be one of: {', '.join(valid_scenarios)}"
         )
     
-    # Initialize the simulation engine
-    graph = SDGIndicatorGraph()
+    # Sweeps and sensitivity analyses give horizon ranges, checked with the rest of their grid
+    timeline_years = getattr(request, 'timeline_years', None)
+    if isinstance(timeline_years, int) and not 0 <= timeline_years <= MAX_TIMELINE_YEARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"timeline_years must be between 0 and {MAX_TIMELINE_YEARS}"
+        )
+    
+    if request.seed is not None and request.seed < 0:
+        raise HTTPException(status_code=400, detail="seed must be a non-negative integer")
+
+
+def _validate_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+    """Check a summary section selector"""
+    if fields is None:
+        return None
     
-    engine = TimeStepSimulationEngine(
+    invalid = [field for field in fields if field not in SUMMARY_SECTIONS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {', '.join(invalid)}. Must be among: {', '.join(SUMMARY_SECTIONS)}"
+        )
+    return fields
+
+
+def _stored_explainer(simulation: Simulation) -> Optional[SimulationExplainer]:
+    """Rebuild the explainer of a stored simulation, if it kept enough to do so"""
+    outcomes = simulation.predicted_outcomes or {}
+    parameters = outcomes.get('parameters')
+    if parameters is None or not outcomes.get('yearly_states'):
+        return None
+    
+    graph = get_compiled_graph()
+    values = np.array([graph.to_vector(state['indicators']) for state in outcomes['yearly_states']])
+    if simulation.checkpoint is not None:
+        delayed_effects = DelayQueue.from_dict(simulation.checkpoint.state['delayed_effects'])
+    else:
+        delayed_effects = DelayQueue(len(graph), graph.max_delay)
+    
+    constraint_engine = ConstraintEngine(
+        simulation.scenario_type, simulation.funding_percentage,
+        simulation.timeline_years, simulation.delay_months
+    )
+    constraint_engine.set_infrastructure_factor(parameters['infrastructure_factor'])
+    
+    return SimulationExplainer(
         graph=graph,
-        target_sdgs=request.target_sdgs,
-        scenario_type=request.scenario_type,
-        funding_percentage=request.funding_percentage,
-        timeline_years=request.timeline_years,
-        delay_months=request.delay_months
+        states=SimulationTrajectory(graph, values, delayed_effects).states(),
+        constraint_engine=constraint_engine,
+        target_sdgs=parameters['target_sdgs']
     )
+
+
+def _stored_summary(simulation: Simulation, fields: List[str], db: Session) -> Dict:
+    """
+    Summary of a stored simulation, generating and saving any requested
+    section that was skipped when it was run
+    """
+    outcomes = simulation.predicted_outcomes or {}
+    summary = dict(outcomes.get('summary', {}))
     
-    # Run the simulation
-    states = engine.run_simulation()
+    missing = [field for field in fields if field not in summary]
+    explainer = _stored_explainer(simulation) if missing else None
+    if explainer is None:
+        return summary
     
-    # Generate explanations
-    explainer = SimulationExplainer(
-        graph=graph,
-        states=states,
-        constraint_engine=engine.constraint_engine,
-        target_sdgs=request.target_sdgs
+    generated = explainer.generate_summary(missing)
+    summary.update({field: generated[field] for field in missing})
+    
+    # Assign new objects so the JSON column is flagged as changed
+    simulation.predicted_outcomes = dict(outcomes, summary=summary)
+    if 'narrative' in missing:
+        simulation.explanation = summary['narrative']
+    if 'recommendations' in missing:
+        simulation.policy_insight = '\n'.join(summary['recommendations'])
+    if 'risks' in missing:
+        simulation.risk_warning = '\n'.join(summary['risks'])
+    db.commit()
+    
+    return summary
+
+
+def _queue_full(e: QueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"{e}, retry later",
+        headers={'Retry-After': str(RETRY_AFTER_SECONDS)}
+    )
+
+
+async def _offload(function, *args, **kwargs):
+    """Run an engine task in the process pool, answering 503 when the queue is full"""
+    try:
+        return await run_cpu(function, *args, **kwargs)
+    except QueueFull as e:
+        raise _queue_full(e)
+
+
+async def _offload_engine(function, *args, **kwargs):
+    """Run engine work that drives the process pool in an engine thread, answering 503 when the queue is full"""
+    try:
+        return await run_engine(function, *args, **kwargs)
+    except QueueFull as e:
+        raise _queue_full(e)
+
+
+def _stream_media_type(format: str) -> str:
+    if format not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Must be one of: {', '.join(STREAM_FORMATS)}"
+        )
+    return STREAM_FORMATS[format]
+
+
+def _stream_event(format: str, event: str, data: Dict) -> str:
+    """One event of a streamed response"""
+    payload = jsonable_encoder(data)
+    if format == 'sse':
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({'event': event, **payload}) + "\n"
+
+
+def _stream_response(format: str, header: Dict, items, finish=None) -> StreamingResponse:
+    """
+    Stream a `start` event with the header, a `year` event per yielded year
+    and a final `summary` event from the last item (passed through the async
+    `finish` if given); a failure mid-stream ends it with an `error` event
+    """
+    async def events():
+        yield _stream_event(format, 'start', header)
+        try:
+            async for item in items:
+                if 'year' in item:
+                    yield _stream_event(format, 'year', item)
+                else:
+                    yield _stream_event(format, 'summary', await finish(item) if finish else item)
+        except Exception as e:
+            yield _stream_event(format, 'error', {'detail': str(e)})
+    
+    return StreamingResponse(events(), media_type=STREAM_FORMATS[format])
+
+
+def _engine_options(request: SimulationRequest) -> Dict:
+    """Validated engine mode options of a simulation request"""
+    if request.engine_mode not in ENGINE_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid engine mode. Must be one of: {', '.join(ENGINE_MODES)}"
+        )
+    
+    engine_options = {}
+    if request.propagation_epsilon is not None:
+        if request.engine_mode != 'worklist':
+            raise HTTPException(status_code=400, detail="propagation_epsilon requires the worklist engine")
+        if request.propagation_epsilon <= 0:
+            raise HTTPException(status_code=400, detail="propagation_epsilon must be positive")
+        engine_options['epsilon'] = request.propagation_epsilon
+    return engine_options
+
+
+def _find_checkpoint(request: SimulationRequest, engine_options: Dict, db: Session) -> Optional[Dict]:
+    """
+    Latest stored checkpoint the requested run can extend to its horizon
+    Only runs in the same timeline bracket share a checkpoint key
+    """
+    query = db.query(SimulationCheckpoint).filter(
+        SimulationCheckpoint.checkpoint_key == _checkpoint_key(request, engine_options),
+        SimulationCheckpoint.timeline_years <= request.timeline_years
     )
+    if request.seed is None:
+        # An unseeded run with the same horizon is a fresh draw, not a replay
+        query = query.filter(SimulationCheckpoint.timeline_years < request.timeline_years)
     
-    summary = explainer.generate_summary()
+    checkpoint = query.order_by(SimulationCheckpoint.timeline_years.desc()).first()
+    return checkpoint.state if checkpoint else None
+
+
+def _resume_note(request: SimulationRequest, engine_options: Dict, db: Session) -> Optional[str]:
+    """
+    Why a run that found no checkpoint starts from year 0 although a shorter
+    run with the same parameters is stored: it is in another timeline bracket
+    """
+    bracket = ConstraintEngine.timeline_factor(request.timeline_years)
+    keys = [
+        _checkpoint_key(request.copy(update={'timeline_years': start}), engine_options)
+        for start in TIMELINE_BRACKETS
+        if ConstraintEngine.timeline_factor(start) != bracket
+    ]
+    checkpoint = db.query(SimulationCheckpoint).filter(
+        SimulationCheckpoint.checkpoint_key.in_(keys),
+        SimulationCheckpoint.timeline_years < request.timeline_years
+    ).order_by(SimulationCheckpoint.timeline_years.desc()).first()
+    if checkpoint is None:
+        return None
+    return (
+        f"Not resumed from the stored {checkpoint.timeline_years}-year run: it is in another "
+        f"timeline bracket (under 3, 3 to 7, over 7 years), whose effectiveness differs every year"
+    )
+
+
+def _checkpoint_key(request: SimulationRequest, engine_options: Dict) -> str:
+    """Address of the checkpoints the requested run can resume from"""
+    
+    # The checkpoint key does not depend on the random draws, so this engine
+    # only addresses the lookup; the run itself happens in a worker
+    engine = ENGINE_MODES[request.engine_mode](
+        graph=get_compiled_graph(),
+        target_sdgs=request.target_sdgs,
+        scenario_type=request.scenario_type,
+        funding_percentage=request.funding_percentage,
+        timeline_years=request.timeline_years,
+        delay_months=request.delay_months,
+        seed=request.seed,
+        **engine_options
+    )
+    return engine.checkpoint_key()
+
+
+def _save_simulation(request: SimulationRequest, twin: DigitalTwin, result: Dict, db: Session) -> Simulation:
+    """Store a finished advanced simulation with its end-of-run checkpoint"""
+    summary = result['summary']
     
     # Save simulation to database (matching existing schema)
     simulation = Simulation(
@@ -134,22 +479,84 @@ async def run_advanced_simulation(
         delay_months=request.delay_months,
         scale_factor=1.0,
         predicted_outcomes={
-            'yearly_states': [
-                {'year': state.year, 'indicators': state.indicators}
-                for state in states
-            ],
-            'summary': summary
+            'yearly_states': result['yearly_states'],
+            'summary': summary,
+            # Enough to generate skipped summary sections later
+            'parameters': {
+                'target_sdgs': request.target_sdgs,
+                'engine_mode': request.engine_mode,
+                'propagation_epsilon': request.propagation_epsilon,
+                'seed': request.seed,
+                'infrastructure_factor': result['infrastructure_factor']
+            }
         },
         affected_population=twin.population,
         confidence_score=summary['confidence_score'],
-        explanation=summary['narrative'],
-        policy_insight='\n'.join(summary['recommendations']),
-        risk_warning='\n'.join(summary['risks'])
+        explanation=summary.get('narrative'),
+        policy_insight='\n'.join(summary['recommendations']) if 'recommendations' in summary else None,
+        risk_warning='\n'.join(summary['risks']) if 'risks' in summary else None
+    )
+    simulation.checkpoint = SimulationCheckpoint(
+        checkpoint_key=result['checkpoint_key'],
+        timeline_years=request.timeline_years,
+        state=result['checkpoint']
     )
     
     db.add(simulation)
     db.commit()
     db.refresh(simulation)
+    return simulation
+
+
+def _store_simulation(request: SimulationRequest, twin: DigitalTwin, result: Dict) -> Simulation:
+    """_save_simulation with a session of its own, for callers outliving their request's session"""
+    db = SessionLocal()
+    try:
+        return _save_simulation(request, twin, result, db)
+    finally:
+        db.close()
+
+
+@router.post("/run", response_model=SimulationResponse)
+async def run_advanced_simulation(
+    request: SimulationRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Run an advanced SDG Digital Twin simulation
+    
+    This endpoint uses the sophisticated simulation engine that includes:
+    - SDG indicator interdependencies
+    - Time-delayed effects
+    - Diminishing returns
+    - Constraints and trade-offs
+    - Feedback loops
+    - Scenario-based outcomes
+    
+    A stored run with the same parameters and a shorter horizon is resumed
+    instead of recomputed (`resumed_from_year`), but only within the same
+    timeline bracket (under 3, 3 to 7, over 7 years): the horizon sets the
+    effectiveness of every year. So in a 5 -> 10 -> 15 year workflow the
+    10-year run starts from year 0 and only the 15-year run resumes (from
+    year 10); `resume_note` says when a stored run was skipped for this reason.
+    """
+    
+    twin = await run_blocking(_validate_simulation_request, request, db)
+    fields = _validate_fields(request.fields)
+    engine_options = _engine_options(request)
+    
+    # Resume from a shorter run with the same parameters if possible
+    checkpoint = await run_blocking(_find_checkpoint, request, engine_options, db)
+    resume_note = None if checkpoint else await run_blocking(_resume_note, request, engine_options, db)
+    
+    # Run the simulation and generate explanations in a worker process
+    result = await _offload(
+        simulate_task, request.engine_mode, request.target_sdgs, request.scenario_type,
+        request.funding_percentage, request.timeline_years, request.delay_months,
+        request.seed, engine_options, checkpoint, fields
+    )
+    summary = result['summary']
+    simulation = await run_blocking(_save_simulation, request, twin, result, db)
     
     # Build response
     return SimulationResponse(
@@ -159,22 +566,658 @@ async def run_advanced_simulation(
         target_sdgs=request.target_sdgs,
         scenario_type=request.scenario_type,
         timeline_years=request.timeline_years,
-        yearly_states=[
-            YearlyState(year=state.year, indicators=state.indicators)
-            for state in states
-        ],
+        yearly_states=[YearlyState(**state) for state in result['yearly_states']],
         net_sdg_progress=summary['net_sdg_progress'],
         confidence_score=summary['confidence_score'],
-        narrative=summary['narrative'],
+        narrative=summary.get('narrative'),
         top_changes=summary['top_changes'],
-        bottlenecks=summary['bottlenecks'],
-        risk_factors=summary['risks'],
-        recommendations=summary['recommendations'],
+        bottlenecks=summary.get('bottlenecks'),
+        risk_factors=summary.get('risks'),
+        recommendations=summary.get('recommendations'),
+        created_at=simulation.created_at,
+        effectiveness=summary['effectiveness'],
+        resumed_from_year=result['resumed_from_year'],
+        resume_note=resume_note
+    )
+
+
+@router.post("/run/stream")
+async def stream_advanced_simulation(
+    request: SimulationRequest,
+    format: str = 'ndjson',
+    db: Session = Depends(get_db)
+):
+    """
+    Run an advanced simulation like /run, streaming each year's state as
+    soon as it is computed
+    
+    `format` is 'ndjson' or 'sse'. Events: `start` with the parameters, a
+    `year` per year (restored checkpoint years first, resumed as in /run),
+    then `summary` with the stored simulation_id, `resume_note` and the
+    summary sections.
+    """
+    _stream_media_type(format)
+    twin = await run_blocking(_validate_simulation_request, request, db)
+    fields = _validate_fields(request.fields)
+    engine_options = _engine_options(request)
+    checkpoint = await run_blocking(_find_checkpoint, request, engine_options, db)
+    resume_note = None if checkpoint else await run_blocking(_resume_note, request, engine_options, db)
+    
+    try:
+        items = stream_cpu(
+            simulate_stream, request.engine_mode, request.target_sdgs, request.scenario_type,
+            request.funding_percentage, request.timeline_years, request.delay_months,
+            request.seed, engine_options, checkpoint, fields
+        )
+    except QueueFull as e:
+        raise _queue_full(e)
+    
+    yearly_states = []
+    
+    async def finish(result: Dict) -> Dict:
+        # The request's session is closed once the response starts
+        simulation = await run_blocking(
+            _store_simulation, request, twin, {'yearly_states': yearly_states, **result}
+        )
+        return {
+            'simulation_id': simulation.id,
+            'created_at': simulation.created_at,
+            'resumed_from_year': result['resumed_from_year'],
+            'resume_note': resume_note,
+            **result['summary']
+        }
+    
+    async def collect():
+        async for item in items:
+            if 'year' in item:
+                yearly_states.append(item)
+            yield item
+    
+    header = {
+        'digital_twin_id': twin.id,
+        'digital_twin_name': twin.name,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        'timeline_years': request.timeline_years,
+        'engine_mode': request.engine_mode
+    }
+    return _stream_response(format, header, collect(), finish)
+
+
+@router.websocket("/session/{digital_twin_id}")
+async def what_if_session(websocket: WebSocket, digital_twin_id: int):
+    """
+    Interactive what-if session over one digital twin
+    
+    The client sends JSON messages:
+    - {"type": "update", "parameters": {...}} changes any SimulationRequest
+      fields (the first update needs target_sdgs and scenario_type). A run
+      still in progress is abandoned at its next year and the new parameters
+      are simulated, answered by {"type": "result", "revision": n, ...}
+      with the yearly states and summary, as from /run
+    - {"type": "save"} stores the result of the current parameters like /run
+      and answers {"type": "saved", "simulation_id": ...}, or an error if
+      their run failed
+    
+    Nothing is written before a save. The twin, the latest result and recent
+    end-of-run checkpoints stay in memory: an unchanged request is answered
+    without a run, and a longer timeline only simulates the added years.
+    Problems are answered by {"type": "error", "detail": ...}; the session
+    stays open.
+    """
+    twin = await run_blocking(_load_twin, digital_twin_id)
+    if twin is None:
+        await websocket.close(code=1008, reason="Digital twin not found")
+        return
+    await websocket.accept()
+    
+    parameters = {}
+    latest = None  # Request, result and stored simulation of the last finished run
+    checkpoints = {}  # checkpoint_key -> longest checkpoint, oldest first
+    running = None
+    revision = 0
+    
+    async def send(kind: str, **data):
+        await websocket.send_json(jsonable_encoder({'type': kind, **data}))
+    
+    async def send_result(revision: int):
+        result = latest[1]
+        await send(
+            'result',
+            revision=revision,
+            yearly_states=result['yearly_states'],
+            resumed_from_year=result['resumed_from_year'],
+            **result['summary']
+        )
+    
+    def find_checkpoint(request: SimulationRequest, engine_options: Dict) -> Optional[Dict]:
+        # Same rules as _find_checkpoint, over this session's runs
+        checkpoint = checkpoints.get(_checkpoint_key(request, engine_options))
+        if checkpoint is None or checkpoint['timeline_years'] > request.timeline_years:
+            return None
+        if request.seed is None and checkpoint['timeline_years'] == request.timeline_years:
+            return None
+        return checkpoint
+    
+    def keep_checkpoint(result: Dict):
+        key = result['checkpoint_key']
+        checkpoint = checkpoints.pop(key, None)
+        if checkpoint is None or checkpoint['timeline_years'] <= result['checkpoint']['timeline_years']:
+            checkpoint = result['checkpoint']
+        checkpoints[key] = checkpoint
+        if len(checkpoints) > SESSION_CHECKPOINTS:
+            del checkpoints[next(iter(checkpoints))]
+    
+    async def simulate(request: SimulationRequest, engine_options: Dict, fields: Optional[List[str]], revision: int):
+        nonlocal latest
+        yearly_states = []
+        try:
+            # Cancelling this task closes the stream, which stops the run
+            items = stream_cpu(
+                simulate_stream, request.engine_mode, request.target_sdgs, request.scenario_type,
+                request.funding_percentage, request.timeline_years, request.delay_months,
+                request.seed, engine_options, find_checkpoint(request, engine_options), fields
+            )
+            async for item in items:
+                if 'year' in item:
+                    yearly_states.append(item)
+                else:
+                    result = {'yearly_states': yearly_states, **item}
+        except QueueFull as e:
+            await send('error', revision=revision, detail=f"{e}, retry later", retry_after=RETRY_AFTER_SECONDS)
+            return
+        except Exception as e:
+            await send('error', revision=revision, detail=str(e))
+            return
+        
+        latest = (request, result, None)
+        keep_checkpoint(result)
+        await send_result(revision)
+    
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                if not isinstance(message, dict):
+                    raise ValueError
+            except ValueError:
+                await send('error', detail="Messages must be JSON objects")
+                continue
+            
+            if message.get('type') == 'update':
+                # 1. Validate the changed parameters
+                changes = message.get('parameters', {})
+                try:
+                    if not isinstance(changes, dict):
+                        raise HTTPException(status_code=400, detail="parameters must be an object")
+                    request = SimulationRequest(**{**parameters, **changes, 'digital_twin_id': twin.id})
+                    _validate_simulation_parameters(request)
+                    fields = _validate_fields(request.fields)
+                    engine_options = _engine_options(request)
+                except ValidationError as e:
+                    await send('error', detail=jsonable_encoder(e.errors(include_url=False)))
+                    continue
+                except HTTPException as e:
+                    await send('error', detail=e.detail)
+                    continue
+                parameters = request.dict()
+                revision += 1
+                
+                # 2. Supersede the run in progress
+                if running is not None:
+                    running.cancel()
+                    running = None
+                
+                # 3. Answer from memory if nothing changed, else simulate. The
+                # previous result is dropped first, so a save while the run
+                # fails or is superseded cannot store it for these parameters
+                if latest is not None and latest[0] != request:
+                    latest = None
+                if latest is not None:
+                    await send_result(revision)
+                else:
+                    running = asyncio.create_task(simulate(request, engine_options, fields, revision))
+            
+            elif message.get('type') == 'save':
+                # Store the result of the latest parameters, once
+                if running is not None:
+                    await asyncio.wait([running])
+                    running = None
+                if latest is None:
+                    await send('error', detail="No result for the current parameters")
+                    continue
+                request, result, simulation = latest
+                if simulation is None:
+                    simulation = await run_blocking(_store_simulation, request, twin, result)
+                    latest = (request, result, simulation)
+                await send('saved', simulation_id=simulation.id, created_at=simulation.created_at)
+            
+            else:
+                await send('error', detail="Message type must be 'update' or 'save'")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if running is not None:
+            running.cancel()
+
+
+def _load_twin(digital_twin_id: int) -> Optional[DigitalTwin]:
+    db = SessionLocal()
+    try:
+        return db.query(DigitalTwin).filter(DigitalTwin.id == digital_twin_id).first()
+    finally:
+        db.close()
+
+
+@router.get("/results/{simulation_id}", response_model=SimulationResponse)
+async def get_advanced_simulation(
+    simulation_id: int,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a stored advanced simulation
+    
+    `fields` is a comma-separated list of summary sections (default all);
+    sections skipped when the simulation ran are generated and saved now.
+    """
+    return await run_blocking(_load_simulation, simulation_id, fields, db)
+
+
+def _load_simulation(simulation_id: int, fields: Optional[str], db: Session) -> SimulationResponse:
+    simulation = db.query(Simulation).filter(Simulation.id == simulation_id).first()
+    if not simulation:
+        raise HTTPException(status_code=404, detail="Simulation not found")
+    
+    outcomes = simulation.predicted_outcomes or {}
+    if 'yearly_states' not in outcomes:
+        raise HTTPException(status_code=400, detail="Not an advanced simulation")
+    
+    sections = _validate_fields(fields.split(',') if fields else None) or list(SUMMARY_SECTIONS)
+    summary = _stored_summary(simulation, sections, db)
+    shown = {field: summary.get(field) for field in sections}
+    parameters = outcomes.get('parameters', {})
+    
+    return SimulationResponse(
+        simulation_id=simulation.id,
+        digital_twin_id=simulation.digital_twin_id,
+        digital_twin_name=simulation.digital_twin.name,
+        target_sdgs=parameters.get('target_sdgs', []),
+        scenario_type=simulation.scenario_type,
+        timeline_years=simulation.timeline_years,
+        yearly_states=[YearlyState(**state) for state in outcomes['yearly_states']],
+        net_sdg_progress=summary['net_sdg_progress'],
+        confidence_score=summary['confidence_score'],
+        narrative=shown.get('narrative'),
+        top_changes=summary['top_changes'],
+        bottlenecks=shown.get('bottlenecks'),
+        risk_factors=shown.get('risks'),
+        recommendations=shown.get('recommendations'),
         created_at=simulation.created_at,
         effectiveness=summary['effectiveness']
     )
 
 
+def _validate_ensemble_request(request: EnsembleRequest, db: Session) -> DigitalTwin:
+    twin = _validate_simulation_request(request, db)
+    
+    if request.n_runs < 1 or request.n_runs > MAX_ENSEMBLE_RUNS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"n_runs must be between 1 and {MAX_ENSEMBLE_RUNS}"
+        )
+    
+    n_values = request.n_runs * (request.timeline_years + 1) * len(get_compiled_graph())
+    if n_values > MAX_ENSEMBLE_VALUES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ensemble would hold {n_values} trajectory values, maximum is "
+                   f"{MAX_ENSEMBLE_VALUES}; reduce n_runs or timeline_years"
+        )
+    return twin
+
+
+@router.post("/ensemble")
+async def run_ensemble_simulation(
+    request: EnsembleRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Run a Monte Carlo ensemble of the advanced simulation
+    
+    All realizations are computed together as one (runs x indicators) array
+    computation. Returns per-year p5/p50/p95 bands for every indicator and the
+    distribution of net SDG progress across runs.
+    """
+    twin = await run_blocking(_validate_ensemble_request, request, db)
+    
+    ensemble = await _offload(
+        ensemble_task, request.target_sdgs, request.scenario_type, request.funding_percentage,
+        request.timeline_years, request.delay_months, request.seed, request.n_runs
+    )
+    
+    return {
+        'digital_twin_id': twin.id,
+        'digital_twin_name': twin.name,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        'timeline_years': request.timeline_years,
+        **ensemble
+    }
+
+
+def _sweep_grid(request: SweepRequest) -> Tuple[List[float], List[int], List[int]]:
+    """Validated funding, delay and timeline values of a sweep request"""
+    for name, axis in [('funding_percentage', request.funding_percentage),
+                       ('delay_months', request.delay_months),
+                       ('timeline_years', request.timeline_years)]:
+        if axis.steps < 1:
+            raise HTTPException(status_code=400, detail=f"{name}.steps must be at least 1")
+    
+    funding_values = request.funding_percentage.values()
+    delay_values = request.delay_months.values(integer=True)
+    timeline_values = request.timeline_years.values(integer=True)
+    
+    if min(delay_values) < 0:
+        raise HTTPException(status_code=400, detail="delay_months must not be negative")
+    if min(timeline_values) < 1 or max(timeline_values) > MAX_TIMELINE_YEARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"timeline_years must be between 1 and {MAX_TIMELINE_YEARS}"
+        )
+    
+    n_points = len(funding_values) * len(delay_values) * len(timeline_values)
+    if n_points > MAX_SWEEP_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep grid has {n_points} points, maximum is {MAX_SWEEP_POINTS}"
+        )
+    return funding_values, delay_values, timeline_values
+
+
+@router.post("/ensemble/stream")
+async def stream_ensemble_simulation(
+    request: EnsembleRequest,
+    format: str = 'ndjson',
+    db: Session = Depends(get_db)
+):
+    """
+    Run a Monte Carlo ensemble like /ensemble, streaming each year's
+    percentile bands as soon as the year is computed
+    
+    `format` is 'ndjson' or 'sse'. Events: `start`, a `year` of bands per
+    year, then `summary` with the net SDG progress distribution.
+    """
+    _stream_media_type(format)
+    twin = await run_blocking(_validate_ensemble_request, request, db)
+    
+    try:
+        items = stream_cpu(
+            ensemble_stream, request.target_sdgs, request.scenario_type, request.funding_percentage,
+            request.timeline_years, request.delay_months, request.seed, request.n_runs
+        )
+    except QueueFull as e:
+        raise _queue_full(e)
+    
+    header = {
+        'digital_twin_id': twin.id,
+        'digital_twin_name': twin.name,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        'timeline_years': request.timeline_years
+    }
+    return _stream_response(format, header, items)
+
+
+@router.post("/sweep")
+async def run_parameter_sweep(
+    request: SweepRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Evaluate net SDG progress over a funding x delay x timeline grid
+    
+    The grid is computed in batched form (large grids across a process pool)
+    with shared random draws, and stored as a single sweep record.
+    Result matrices are indexed [timeline][funding][delay].
+    """
+    twin = await run_blocking(_validate_simulation_request, request, db)
+    funding_values, delay_values, timeline_values = _sweep_grid(request)
+    n_points = len(funding_values) * len(delay_values) * len(timeline_values)
+    
+    sweep = ParameterSweep(
+        target_sdgs=request.target_sdgs,
+        scenario_type=request.scenario_type,
+        funding_values=funding_values,
+        delay_values=delay_values,
+        timeline_values=timeline_values,
+        seed=request.seed
+    )
+    
+    # Large grids fan out to the process pool, so the sweep is driven from an engine thread
+    results = await _offload_engine(sweep.run)
+    record = await run_blocking(
+        save_sweep, db, twin.id, request.scenario_type, request.target_sdgs, request.seed, results
+    )
+    
+    return {
+        'sweep_id': record.id,
+        'digital_twin_id': twin.id,
+        'digital_twin_name': twin.name,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        'n_points': n_points,
+        **results,
+        'created_at': record.created_at
+    }
+
+
+@router.get("/sweep/{sweep_id}")
+async def get_parameter_sweep(sweep_id: int, db: Session = Depends(get_db)):
+    """Get a stored parameter sweep"""
+    return await run_blocking(_load_sweep, sweep_id, db)
+
+
+def _load_sweep(sweep_id: int, db: Session) -> Dict:
+    record = db.query(SimulationSweep).filter(SimulationSweep.id == sweep_id).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Sweep not found")
+    
+    return {
+        'sweep_id': record.id,
+        'digital_twin_id': record.digital_twin_id,
+        'target_sdgs': record.target_sdgs,
+        'scenario_type': record.scenario_type,
+        'seed': record.seed,
+        **record.parameters,
+        **record.results,
+        'created_at': record.created_at
+    }
+
+
+@router.post("/goal-seek")
+async def run_goal_seek(
+    request: GoalSeekRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Find the least funding (or the most delay) that still reaches a target
+    
+    The target is a % change of net SDG progress or of a single indicator.
+    Each search iteration is one batched engine pass over a grid of candidate
+    values with shared random draws; the solution is re-checked with the
+    time-step engine.
+    """
+    twin = await run_blocking(_validate_simulation_request, request, db)
+    
+    try:
+        solution = await _offload(
+            goal_seek_task,
+            target_sdgs=request.target_sdgs,
+            scenario_type=request.scenario_type,
+            parameter=request.parameter,
+            target_value=request.target_value,
+            metric=request.metric,
+            funding_percentage=request.funding_percentage,
+            timeline_years=request.timeline_years,
+            delay_months=request.delay_months,
+            lower=request.lower,
+            upper=request.upper,
+            seed=request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        'digital_twin_id': twin.id,
+        'digital_twin_name': twin.name,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        **solution
+    }
+
+
+@router.post("/sensitivity")
+async def run_sensitivity_analysis(
+    request: SensitivityRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Rank which inputs drive each indicator's outcome
+    
+    Sobol returns first-order (S1) and total (ST) variance shares per input;
+    Morris returns mean absolute elementary effects (mu_star) and their spread
+    (sigma). Inputs are funding, delay, timeline, infrastructure readiness and
+    a multiplier on every influence weight; the design is evaluated in batched
+    engine passes.
+    """
+    twin = await run_blocking(_validate_simulation_request, request, db)
+    
+    for name, bounds in [('funding_percentage', request.funding_percentage),
+                         ('delay_months', request.delay_months),
+                         ('timeline_years', request.timeline_years)]:
+        if len(bounds) != 2 or bounds[0] > bounds[1]:
+            raise HTTPException(status_code=400, detail=f"{name} must be [lower, upper]")
+    
+    if request.delay_months[0] < 0:
+        raise HTTPException(status_code=400, detail="delay_months must not be negative")
+    if request.timeline_years[0] < 1 or request.timeline_years[1] > MAX_TIMELINE_YEARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"timeline_years must be between 1 and {MAX_TIMELINE_YEARS}"
+        )
+    if not 0 <= request.weight_uncertainty < 1:
+        raise HTTPException(status_code=400, detail="weight_uncertainty must be in [0, 1)")
+    if request.method not in SensitivityAnalysis.METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid method. Must be one of: {', '.join(SensitivityAnalysis.METHODS)}"
+        )
+    
+    analysis = SensitivityAnalysis(
+        target_sdgs=request.target_sdgs,
+        scenario_type=request.scenario_type,
+        funding_range=tuple(request.funding_percentage),
+        delay_range=tuple(request.delay_months),
+        timeline_range=tuple(request.timeline_years),
+        weight_uncertainty=request.weight_uncertainty,
+        include_weights=request.include_weights,
+        seed=request.seed
+    )
+    
+    n_evaluations = analysis.n_evaluations(request.method, request.n_samples)
+    if request.n_samples < 2 or n_evaluations > MAX_SENSITIVITY_EVALUATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Design needs {n_evaluations} evaluations; n_samples must be at least 2 "
+                   f"and the total at most {MAX_SENSITIVITY_EVALUATIONS}"
+        )
+    
+    # Large designs fan out to the process pool, so the analysis is driven from an engine thread
+    indices = await _offload_engine(analysis.run, request.method, request.n_samples)
+    
+    return {
+        'digital_twin_id': twin.id,
+        'digital_twin_name': twin.name,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        'seed': request.seed,
+        **indices
+    }
+
+
+@router.post("/preview")
+async def run_preview(
+    request: PreviewRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Approximate trajectory for interactive use (well under 10 ms)
+    
+    Uses a linear propagation operator precomputed per graph, with saturation
+    applied once at the end. `estimated_error` is the calibrated largest
+    indicator error against the exact engine; with `verify` the exact
+    TimeStepSimulationEngine result is computed and the actual error reported.
+    `verify` needs a `seed`, so both runs use the same draws and the error is
+    the approximation's alone.
+    """
+    twin = await run_blocking(_validate_simulation_request, request, db)
+    
+    if request.timeline_years < 1 or request.timeline_years > PREVIEW_MAX_YEARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"timeline_years must be between 1 and {PREVIEW_MAX_YEARS} for previews"
+        )
+    
+    if request.verify and request.seed is None:
+        raise HTTPException(status_code=400, detail="verify requires a seed")
+    
+    # Cheap once the operator is built, but the first call per graph builds it
+    result, values = await _offload_engine(_preview, request, twin)
+    
+    if request.verify:
+        # The exact run is the scalar engine, so it goes to a worker process
+        exact = await _offload(
+            exact_trajectory_task, request.target_sdgs, request.scenario_type,
+            request.funding_percentage, request.timeline_years, request.delay_months, request.seed
+        )
+        result['exact'] = {
+            'net_sdg_progress': float(net_progress(get_compiled_graph(), request.target_sdgs, exact[:, None, :])[0]),
+            'max_error': float(np.abs(values - exact).max())
+        }
+    
+    return result
+
+
+def _preview(request: PreviewRequest, twin: DigitalTwin) -> Tuple[Dict, np.ndarray]:
+    """Preview result and its trajectory values"""
+    graph = get_compiled_graph()
+    try:
+        preview = get_preview_model(graph).preview(
+            request.target_sdgs, request.scenario_type, request.funding_percentage,
+            request.timeline_years, request.delay_months, request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    values = preview['values']
+    
+    result = {
+        'digital_twin_id': twin.id,
+        'digital_twin_name': twin.name,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        'timeline_years': request.timeline_years,
+        'yearly_states': [
+            {'year': year, 'indicators': graph.to_dict(row)}
+            for year, row in enumerate(values)
+        ],
+        'net_sdg_progress': float(net_progress(graph, request.target_sdgs, values[:, None, :])[0]),
+        'effectiveness': preview['effectiveness'],
+        'estimated_error': preview['estimated_error']
+    }
+    return result, values
+
+
 @router.get("/history/{digital_twin_id}")
 async def get_simulation_history(
     digital_twin_id: int,
@@ -182,7 +1225,10 @@ async def get_simulation_history(
     db: Session = Depends(get_db)
 ):
     """Get simulation history for a digital twin"""
-    
+    return await run_blocking(_simulation_history, digital_twin_id, limit, db)
+
+
+def _simulation_history(digital_twin_id: int, limit: int, db: Session) -> Dict:
     twin = db.query(DigitalTwin).filter(DigitalTwin.id == digital_twin_id).first()
     if not twin:
         raise HTTPException(status_code=404, detail="Digital twin not found")
@@ -198,10 +1244,10 @@ async def get_simulation_history(
             {
                 'simulation_id': sim.id,
                 'scenario_type': sim.scenario_type,
-                'target_sdgs': sim.target_sdgs,
+                'target_sdgs': (sim.predicted_outcomes or {}).get('parameters', {}).get('target_sdgs'),
                 'confidence_score': sim.confidence_score,
                 'created_at': sim.created_at,
-                'net_progress': sim.results.get('summary', {}).get('net_sdg_progress', 0)
+                'net_progress': (sim.predicted_outcomes or {}).get('summary', {}).get('net_sdg_progress', 0)
             }
             for sim in simulations
         ]
@@ -215,7 +1261,10 @@ async def compare_simulations(
     db: Session = Depends(get_db)
 ):
     """Compare two simulations side by side"""
-    
+    return await run_blocking(_compare_simulations, simulation_id_1, simulation_id_2, db)
+
+
+def _compare_simulations(simulation_id_1: int, simulation_id_2: int, db: Session) -> Dict:
     sim1 = db.query(Simulation).filter(Simulation.id == simulation_id_1).first()
     sim2 = db.query(Simulation).filter(Simulation.id == simulation_id_2).first()
     
@@ -228,30 +1277,34 @@ async def compare_simulations(
             detail="Can only compare simulations from the same digital twin"
         )
     
+    # Narratives skipped at run time are generated on this first read
+    summary1 = _stored_summary(sim1, ['narrative'], db)
+    summary2 = _stored_summary(sim2, ['narrative'], db)
+    
     return {
         'digital_twin_id': sim1.digital_twin_id,
         'simulation_1': {
             'id': sim1.id,
             'scenario': sim1.scenario_type,
-            'net_progress': sim1.results.get('summary', {}).get('net_sdg_progress', 0),
+            'net_progress': summary1.get('net_sdg_progress', 0),
             'confidence': sim1.confidence_score,
-            'narrative': sim1.results.get('summary', {}).get('narrative', '')
+            'narrative': summary1.get('narrative', '')
         },
         'simulation_2': {
             'id': sim2.id,
             'scenario': sim2.scenario_type,
-            'net_progress': sim2.results.get('summary', {}).get('net_sdg_progress', 0),
+            'net_progress': summary2.get('net_sdg_progress', 0),
             'confidence': sim2.confidence_score,
-            'narrative': sim2.results.get('summary', {}).get('narrative', '')
+            'narrative': summary2.get('narrative', '')
         },
         'comparison': {
             'progress_difference': (
-                sim1.results.get('summary', {}).get('net_sdg_progress', 0) -
-                sim2.results.get('summary', {}).get('net_sdg_progress', 0)
+                summary1.get('net_sdg_progress', 0) -
+                summary2.get('net_sdg_progress', 0)
             ),
             'better_scenario': sim1.scenario_type if 
-                sim1.results.get('summary', {}).get('net_sdg_progress', 0) > 
-                sim2.results.get('summary', {}).get('net_sdg_progress', 0)
+                summary1.get('net_sdg_progress', 0) > 
+                summary2.get('net_sdg_progress', 0)
                 else sim2.scenario_type
         }
     }
@@ -260,54 +1313,44 @@ async def compare_simulations(
 @router.post("/batch-scenarios/{digital_twin_id}")
 async def run_all_scenarios(
     digital_twin_id: int,
-    target_sdgs: List[int],
+    request: Union[List[int], BatchScenariosRequest] = Body(...),
     timeline_years: int = 5,
+    seed: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """
     Run simulations for all scenario types to compare outcomes
     Useful for policy decision making
+    
+    The body is either the list of target SDGs, comparing every scenario
+    type, or {"target_sdgs": [...], "scenarios": [...]} with custom variants
+    overriding funding and delay per scenario. All variants are evaluated
+    together in one batched run with shared random draws.
     """
     
-    twin = db.query(DigitalTwin).filter(DigitalTwin.id == digital_twin_id).first()
+    twin = await run_blocking(
+        lambda: db.query(DigitalTwin).filter(DigitalTwin.id == digital_twin_id).first()
+    )
     if not twin:
         raise HTTPException(status_code=404, detail="Digital twin not found")
     
-    scenarios = ['success', 'partial_success', 'delay', 'failure', 'underfunded']
-    results = []
+    if not 0 <= timeline_years <= MAX_TIMELINE_YEARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"timeline_years must be between 0 and {MAX_TIMELINE_YEARS}"
+        )
     
-    graph = SDGIndicatorGraph()
+    if seed is not None and seed < 0:
+        raise HTTPException(status_code=400, detail="seed must be a non-negative integer")
     
-    for scenario in scenarios:
-        # Run simulation
-        engine = TimeStepSimulationEngine(
-            graph=graph,
-            target_sdgs=target_sdgs,
-            scenario_type=scenario,
-            funding_percentage=100.0 if scenario != 'underfunded' else 50.0,
-            timeline_years=timeline_years,
-            delay_months=0 if scenario != 'delay' else 12
-        )
-        
-        states = engine.run_simulation()
-        
-        # Generate summary
-        explainer = SimulationExplainer(
-            graph=graph,
-            states=states,
-            constraint_engine=engine.constraint_engine,
-            target_sdgs=target_sdgs
-        )
-        
-        summary = explainer.generate_summary()
-        
-        results.append({
-            'scenario': scenario,
-            'net_progress': summary['net_sdg_progress'],
-            'confidence': summary['confidence_score'],
-            'narrative': summary['narrative'],
-            'final_state': states[-1].indicators
-        })
+    if isinstance(request, BatchScenariosRequest):
+        target_sdgs, variants = request.target_sdgs, _scenario_variants(request.scenarios)
+    else:
+        target_sdgs, variants = request, None
+    _validate_target_sdgs(target_sdgs)
+    
+    # All scenarios run as one job in a worker process
+    results = await _offload(scenarios_task, target_sdgs, timeline_years, seed, variants)
     
     # Sort by net progress
     results.sort(key=lambda x: x['net_progress'], reverse=True)
@@ -321,3 +1364,96 @@ async def run_all_scenarios(
         'best_scenario': results[0]['scenario'],
         'worst_scenario': results[-1]['scenario']
     }
+
+
+def _scenario_variants(scenarios: List[ScenarioVariant]) -> List[Dict]:
+    """Validated custom scenario variants, with the scenario defaults filled in"""
+    if not scenarios or len(scenarios) > MAX_SCENARIO_VARIANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"scenarios must hold between 1 and {MAX_SCENARIO_VARIANTS} variants"
+        )
+    
+    variants = []
+    for scenario in scenarios:
+        if scenario.scenario_type not in SCENARIOS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid scenario type. Must be one of: {', '.join(SCENARIOS)}"
+            )
+        if scenario.delay_months is not None and scenario.delay_months < 0:
+            raise HTTPException(status_code=400, detail="delay_months must not be negative")
+        
+        variant = default_variant(scenario.scenario_type)
+        variant.update({key: value for key, value in scenario.dict().items() if value is not None})
+        variants.append(variant)
+    return variants
+
+
+@router.post("/jobs/ensemble", status_code=202)
+async def submit_ensemble_job(
+    request: EnsembleRequest,
+    db: Session = Depends(get_db)
+):
+    """Queue a Monte Carlo ensemble as a background job; poll /jobs/{job_id}"""
+    await run_blocking(_validate_ensemble_request, request, db)
+    job = await run_blocking(submit_job, db, 'ensemble', request.dict())
+    return job_status(job)
+
+
+@router.post("/jobs/sweep", status_code=202)
+async def submit_sweep_job(
+    request: SweepRequest,
+    db: Session = Depends(get_db)
+):
+    """Queue a parameter sweep as a background job; the finished sweep is also stored as a sweep record"""
+    await run_blocking(_validate_simulation_request, request, db)
+    funding_values, delay_values, timeline_values = _sweep_grid(request)
+    
+    parameters = {
+        'digital_twin_id': request.digital_twin_id,
+        'target_sdgs': request.target_sdgs,
+        'scenario_type': request.scenario_type,
+        'funding_percentage': funding_values,
+        'delay_months': delay_values,
+        'timeline_years': timeline_values,
+        'seed': request.seed
+    }
+    job = await run_blocking(submit_job, db, 'sweep', parameters)
+    return job_status(job)
+
+
+def _get_job(job_id: int, db: Session) -> SimulationJob:
+    job = db.query(SimulationJob).filter(SimulationJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: int, db: Session = Depends(get_db)):
+    """Status and progress (0-1) of a background job"""
+    job = await run_blocking(_get_job, job_id, db)
+    return job_status(job)
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: int, db: Session = Depends(get_db)):
+    """Result of a finished job (409 while it is queued or running, or if it failed)"""
+    job = await run_blocking(_get_job, job_id, db)
+    if job.status != 'done':
+        detail = f"Job failed: {job.error}" if job.status == 'failed' else f"Job is {job.status}"
+        raise HTTPException(status_code=409, detail=detail)
+    
+    return {'job_id': job.id, 'kind': job.kind, 'parameters': job.parameters, **job.result}
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Hit/miss counters of the seeded simulation result cache
+    Every process has its own cache: the counters add up the API process
+    (small sweeps, sensitivity, previews) and the pool workers running the
+    other engine work. Limits are per process.
+    """
+    return combine_stats([simulation_cache.stats()] + await pool_cache_stats())
@@ -0,0 +1,73 @@
+"""
+Benchmark: per-year simulation cost on large synthetic indicator graphs
+Grows the edge count at a fixed indicator count, then the indicator count
+at a fixed edge count. The vectorized engine's per-year time follows the
+array sizes, runs x (indicators + edges), with no Python work per indicator
+or edge; the scalar engine walks IndicatorInfluence objects and is shown
+for contrast.
+
+Usage (from backend/): python benchmarks/bench_graph_scaling.py [n_runs]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdg_graph import synthetic_graph, load_graph
+from simulation_core import TimeStepSimulationEngine
+from simulation_vectorized import VectorizedSimulationEngine
+
+
+TIMELINE_YEARS = 10
+TARGET_SDGS = [1, 6, 9]
+
+# (indicators, edges)
+EDGE_SERIES = [(2000, 5000), (2000, 20000), (2000, 80000)]
+NODE_SERIES = [(500, 20000), (2000, 20000), (8000, 20000)]
+
+
+def time_per_year(run) -> float:
+    run()  # Warm up
+    start = time.perf_counter()
+    run()
+    return (time.perf_counter() - start) / TIMELINE_YEARS
+
+
+def measure(n_indicators: int, n_edges: int, n_runs: int, directory: str):
+    graph = synthetic_graph(n_indicators, n_edges, seed=0)
+    path = os.path.join(directory, f'graph_{n_indicators}_{n_edges}.json')
+    graph.to_json(path)
+    
+    start = time.perf_counter()
+    compiled = load_graph(path).compile()
+    load_seconds = time.perf_counter() - start
+    
+    # Unseeded, so repeated runs are not served from the result cache
+    engine = VectorizedSimulationEngine(compiled, TARGET_SDGS, 'success', 100.0, TIMELINE_YEARS, 0)
+    single = time_per_year(lambda: engine.run_batch(1))
+    batch = time_per_year(lambda: engine.run_batch(n_runs))
+    scalar = time_per_year(lambda: TimeStepSimulationEngine(
+        compiled, TARGET_SDGS, 'success', 100.0, TIMELINE_YEARS, 0
+    ).run_simulation())
+    
+    elements = n_runs * (n_indicators + n_edges)
+    print(f'{n_indicators:>7} {n_edges:>7} {len(compiled.cycles):>6} {load_seconds:>8.2f} '
+          f'{single * 1000:>10.2f} {batch * 1000:>10.2f} {batch / elements * 1e9:>10.2f} '
+          f'{scalar * 1000:>10.2f}')
+
+
+def main(n_runs: int = 100):
+    print(f'per-year times over {TIMELINE_YEARS} years; batch = {n_runs} runs')
+    print(f'{"nodes":>7} {"edges":>7} {"loops":>6} {"load s":>8} {"1 run ms":>10} '
+          f'{"batch ms":>10} {"ns/elem":>10} {"scalar ms":>10}')
+    with tempfile.TemporaryDirectory() as directory:
+        for series in (EDGE_SERIES, NODE_SERIES):
+            for n_indicators, n_edges in series:
+                measure(n_indicators, n_edges, n_runs, directory)
+            print()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
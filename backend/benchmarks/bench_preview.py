@@ -0,0 +1,60 @@
+"""
+Benchmark: linearized preview vs the exact time-step engine
+Times both on the same random scenarios and reports the preview's error
+
+Usage (from backend/): python benchmarks/bench_preview.py [n_scenarios]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdg_graph import get_compiled_graph
+from simulation_core import TimeStepSimulationEngine
+from simulation_preview import get_preview_model
+
+
+SCENARIOS = ['success', 'partial_success', 'delay', 'failure', 'underfunded']
+
+
+def main(n_scenarios: int = 200):
+    graph = get_compiled_graph()
+    rng = np.random.default_rng(0)
+    
+    start = time.perf_counter()
+    model = get_preview_model(graph)
+    build_seconds = time.perf_counter() - start
+    
+    preview_seconds, exact_seconds, errors, estimates = 0.0, 0.0, [], []
+    for seed in range(n_scenarios):
+        target_sdgs = sorted(rng.choice(np.arange(1, 18), size=rng.integers(1, 5), replace=False).tolist())
+        scenario = SCENARIOS[seed % len(SCENARIOS)]
+        funding = float(rng.uniform(30, 100))
+        timeline = int(rng.integers(3, 16))
+        delay = int(rng.integers(0, 24))
+        
+        start = time.perf_counter()
+        preview = model.preview(target_sdgs, scenario, funding, timeline, delay, seed=seed)
+        preview_seconds += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        engine = TimeStepSimulationEngine(graph, target_sdgs, scenario, funding, timeline, delay, seed=seed)
+        engine.run_simulation()
+        exact_seconds += time.perf_counter() - start
+        
+        errors.append(np.abs(preview['values'] - engine.trajectory.values).max())
+        estimates.append(preview['estimated_error'])
+    
+    errors, estimates = np.array(errors), np.array(estimates)
+    print(f'operator build + calibration: {build_seconds * 1000:.1f} ms (once per graph)')
+    print(f'preview: {preview_seconds / n_scenarios * 1000:.3f} ms per scenario')
+    print(f'exact:   {exact_seconds / n_scenarios * 1000:.3f} ms per scenario')
+    print(f'speedup: {exact_seconds / preview_seconds:.1f}x')
+    print(f'max indicator error: mean {errors.mean():.3f}, p95 {np.percentile(errors, 95):.3f}, max {errors.max():.3f}')
+    print(f'estimated error covers actual in {np.mean(estimates >= errors) * 100:.0f}% of scenarios')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,50 @@
+"""
+Benchmark: dense vs worklist (sparse) propagation on a large graph
+Times one propagation step for a growing number of changed indicators;
+the sparse step follows the edges leaving them, the dense one the graph
+
+Usage (from backend/): python benchmarks/bench_worklist.py [n_indicators] [n_edges]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdg_graph import synthetic_graph
+
+
+N_RUNS = 20
+REPEATS = 20
+ACTIVE_COUNTS = [10, 100, 1000, 10000]
+
+
+def per_call(function) -> float:
+    function()  # Warm up
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        function()
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main(n_indicators: int = 50000, n_edges: int = 200000):
+    graph = synthetic_graph(n_indicators, n_edges, seed=0).compile()
+    rng = np.random.default_rng(0)
+    print(f'{n_indicators} indicators, {n_edges} edges, {N_RUNS} runs')
+    print(f'{"changed":>8} {"edges":>8} {"dense ms":>9} {"sparse ms":>10}')
+    
+    for n_active in ACTIVE_COUNTS:
+        positions = np.sort(rng.choice(n_indicators, size=n_active, replace=False))
+        change = rng.normal(0.0, 1.0, size=(N_RUNS, n_active))
+        dense_change = np.zeros((N_RUNS, n_indicators))
+        dense_change[:, positions] = change
+        active_edges = int((graph.indptr[positions + 1] - graph.indptr[positions]).sum())
+        
+        dense = per_call(lambda: graph.propagate(dense_change))
+        sparse = per_call(lambda: graph.propagate_sparse(positions, change))
+        print(f'{n_active:>8} {active_edges:>8} {dense * 1000:>9.2f} {sparse * 1000:>10.3f}')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
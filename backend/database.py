@@ -156,6 +156,64 @@ class Simulation(Base):
     
     digital_twin = relationship("DigitalTwin", back_populates="simulations")
     project = relationship("Project", back_populates="simulations")
+    checkpoint = relationship("SimulationCheckpoint", back_populates="simulation",
+                              uselist=False, cascade="all, delete-orphan")
+
+
+class SimulationCheckpoint(Base):
+    """End-of-run engine state, so a longer horizon can resume instead of restarting"""
+    __tablename__ = "simulation_checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    simulation_id = Column(Integer, ForeignKey("simulations.id"), nullable=False, unique=True)
+    checkpoint_key = Column(String(64), nullable=False, index=True)  # All parameters except the horizon
+    timeline_years = Column(Integer, nullable=False)
+    state = Column(JSON)  # Trajectory, delayed effects, random draws and RNG state
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    simulation = relationship("Simulation", back_populates="checkpoint")
+
+
+class SimulationSweep(Base):
+    """Parameter sweep over a funding x delay x timeline grid, stored as one record"""
+    __tablename__ = "simulation_sweeps"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    digital_twin_id = Column(Integer, ForeignKey("digital_twins.id"), nullable=False)
+    scenario_type = Column(String(50), nullable=False)
+    target_sdgs = Column(JSON)  # List of SDG numbers
+    seed = Column(Integer)
+    
+    # Grid axes and the dense result matrices (timeline x funding x delay)
+    parameters = Column(JSON)
+    results = Column(JSON)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    digital_twin = relationship("DigitalTwin")
+
+
+class SimulationJob(Base):
+    """Queued background simulation, claimed and run by a job worker process"""
+    __tablename__ = "simulation_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # ensemble, sweep, multi_twin
+    parameters = Column(JSON)  # Validated request body
+    status = Column(String(20), default="queued", nullable=False, index=True)  # queued, running, done, failed
+    progress = Column(Float, default=0.0)  # Fraction of the work done
+    result = Column(JSON)
+    error = Column(Text)
+    
+    # Claiming: every claim increments attempts, and a claim only succeeds if
+    # attempts is unchanged since the job was read
+    worker = Column(String(100))
+    attempts = Column(Integer, default=0, nullable=False)
+    heartbeat_at = Column(DateTime)  # Last sign of life of the running worker
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
 
 
 class Partnership(Base):
@@ -195,6 +253,19 @@ def init_db():
     Base.metadata.create_all(bind=engine)
 
 
+def twin_baseline_rows(db, digital_twin_ids=None):
+    """(id, name, region, population, sdg_number, baseline_value) of every twin indicator, in one query"""
+    query = db.query(
+        DigitalTwin.id, DigitalTwin.name, DigitalTwin.region, DigitalTwin.population,
+        SDGIndicator.sdg_number, SDGIndicator.baseline_value
+    ).join(SDGIndicator, SDGIndicator.digital_twin_id == DigitalTwin.id).filter(
+        SDGIndicator.sdg_number.between(1, 17)  # The column itself is unconstrained
+    )
+    if digital_twin_ids is not None:
+        query = query.filter(DigitalTwin.id.in_(digital_twin_ids))
+    return query.all()
+
+
 def get_db():
     """Dependency for FastAPI routes"""
     db = SessionLocal()
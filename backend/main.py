@@ -4,19 +4,22 @@ Core Innovation: Future Impact Simulation Engine
 """
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
+import json
 
 from database import (
     init_db, get_db, Organization, DigitalTwin, SDGIndicator, 
-    Project, Simulation, Partnership, User
+    Project, Simulation, Partnership, User, twin_baseline_rows
 )
 from sdg_data import SDG_GOALS, SDG_INDICATORS, get_baseline_for_region
 from simulation_engine import SimulationEngine, AIExplainer
 from auth_routes import router as auth_router
 from advanced_simulation_api import router as advanced_simulation_router
+from simulation_jobs import submit_job, job_status
 
 app = FastAPI(title="SDG Digital Twin Platform API", version="1.0.0")
 
@@ -122,6 +125,21 @@ class SimulationRequest(BaseModel):
     timeline_years: int = 5
     delay_months: int = 0
     scale_factor: float = 1.0
+    seed: Optional[int] = None  # Set for reproducible (and cacheable) runs
+
+class MultiTwinSimulationRequest(BaseModel):
+    target_sdgs: List[int]
+    scenario_type: str
+    digital_twin_ids: Optional[List[int]] = None  # Default: every twin
+    funding_percentage: float = 100.0
+    timeline_years: int = 5
+    delay_months: int = 0
+    scale_factor: float = 1.0
+    rank_by: str = "mean_improvement"  # or "affected_population"
+    seed: Optional[int] = None
+
+# Ranked tables with more rows than this are serialized in chunks
+MULTI_TWIN_STREAM_ROWS = 500
 
 class SimulationResponse(BaseModel):
     id: int
@@ -265,6 +283,7 @@ def run_simulation(request: SimulationRequest, db: Session = Depends(get_db)):
     Run Future Impact Simulation - CORE INNOVATION
     Predicts what will happen to SDG indicators over time
     """
+    _validate_seed(request.seed)
     
     # Get digital twin and its indicators
     twin = db.query(DigitalTwin).filter(DigitalTwin.id == request.digital_twin_id).first()
@@ -286,7 +305,8 @@ def run_simulation(request: SimulationRequest, db: Session = Depends(get_db)):
         timeline_years=request.timeline_years,
         delay_months=request.delay_months,
         scale_factor=request.scale_factor,
-        population=twin.population
+        population=twin.population,
+        seed=request.seed
     )
     
     # Generate AI explanation
@@ -344,9 +364,11 @@ def compare_scenarios(
     scenarios: List[str],
     funding_percentage: float = 100.0,
     timeline_years: int = 5,
+    seed: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """Compare multiple scenarios side-by-side"""
+    _validate_seed(seed)
     
     twin = db.query(DigitalTwin).filter(DigitalTwin.id == digital_twin_id).first()
     if not twin:
@@ -364,11 +386,71 @@ def compare_scenarios(
         scenarios=scenarios,
         funding_percentage=funding_percentage,
         timeline_years=timeline_years,
-        population=twin.population
+        population=twin.population,
+        seed=seed
     )
     
     return results
 
+def _stream_json(header: dict, key: str, rows: List[dict], chunk_size: int = 200):
+    """Yield a JSON object whose `key` holds rows, a chunk of rows at a time"""
+    yield json.dumps(header)[:-1] + f', "{key}": ['
+    for start in range(0, len(rows), chunk_size):
+        prefix = ", " if start else ""
+        yield prefix + ", ".join(json.dumps(row) for row in rows[start:start + chunk_size])
+    yield "]}"
+
+def _validate_seed(seed: Optional[int]):
+    if seed is not None and seed < 0:
+        raise HTTPException(status_code=400, detail="seed must be a non-negative integer")
+
+def _validate_multi_twin(request: MultiTwinSimulationRequest):
+    if request.rank_by not in ("mean_improvement", "affected_population"):
+        raise HTTPException(status_code=400, detail="rank_by must be mean_improvement or affected_population")
+    if not request.target_sdgs or any(sdg < 1 or sdg > 17 for sdg in request.target_sdgs):
+        raise HTTPException(status_code=400, detail="target_sdgs must be SDG numbers 1-17")
+    _validate_seed(request.seed)
+
+@app.post("/simulations/multi-twin")
+def simulate_across_twins(request: MultiTwinSimulationRequest, db: Session = Depends(get_db)):
+    """
+    Simulate one project for every (or each selected) digital twin and rank them
+    
+    All baselines are loaded in a single query and simulated as one
+    (twins x SDGs) array computation. The ranking is computed in memory;
+    large tables are only serialized in chunks, so their JSON is never held
+    whole.
+    """
+    _validate_multi_twin(request)
+    
+    # One query for every twin's baselines
+    rows = twin_baseline_rows(db, request.digital_twin_ids)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No digital twins with indicators found")
+    
+    ranking = simulation_engine.rank_twins(
+        rows=rows,
+        target_sdgs=request.target_sdgs,
+        scenario_type=request.scenario_type,
+        funding_percentage=request.funding_percentage,
+        timeline_years=request.timeline_years,
+        delay_months=request.delay_months,
+        scale_factor=request.scale_factor,
+        rank_by=request.rank_by,
+        seed=request.seed
+    )
+    
+    table = ranking.pop("twins")
+    if len(table) > MULTI_TWIN_STREAM_ROWS:
+        return StreamingResponse(_stream_json(ranking, "twins", table), media_type="application/json")
+    return {**ranking, "twins": table}
+
+@app.post("/simulations/multi-twin/jobs", status_code=202)
+def submit_multi_twin_job(request: MultiTwinSimulationRequest, db: Session = Depends(get_db)):
+    """Queue a multi-twin ranking as a background job; poll /api/simulation/jobs/{job_id}"""
+    _validate_multi_twin(request)
+    return job_status(submit_job(db, "multi_twin", request.dict()))
+
 
 # ==================== Projects ====================
 
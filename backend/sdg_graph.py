@@ -2,12 +2,38 @@
 SDG Indicator Graph System
 Models interdependencies, delays, and influence weights between SDG indicators
 """
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+import csv
+import hashlib
+import json
+import os
 import numpy as np
 
 
-@dataclass
+# Longest influence cycle (in edges) that is compiled as a feedback loop
+MAX_CYCLE_LENGTH = 8
+
+# Cycles weaker than this (product of weights) are not feedback loops, and
+# at most MAX_FEEDBACK_LOOPS are kept; both bound the search on large graphs
+MIN_LOOP_STRENGTH = 0.001
+MAX_FEEDBACK_LOOPS = 1000
+
+# Pruned subgraphs (target SDGs x horizon) each compiled graph keeps
+PRUNED_CACHE_SIZE = 64
+
+# Optional graph data file (.json) or directory (indicators.csv + influences.csv)
+# replacing the built-in graph
+GRAPH_FILE = os.getenv("SDG_GRAPH_FILE")
+
+INDICATOR_FIELDS = ('key', 'name', 'baseline', 'min', 'max', 'unit', 'sdg')
+INFLUENCE_FIELDS = ('source', 'target', 'weight', 'delay_years', 'description')
+
+
+@dataclass(frozen=True)
 class IndicatorInfluence:
     """Represents how one indicator influences another"""
     target: str
@@ -20,11 +46,99 @@ class SDGIndicatorGraph:
     """
     Models SDG indicators as a directed weighted graph
     Each indicator can influence others with time delays
+    
+    The built-in graph is used unless indicators and influences are given,
+    e.g. by from_json / from_csv
     """
     
-    def __init__(self):
-        self.indicators = self._initialize_indicators()
-        self.influences = self._initialize_influences()
+    def __init__(self, indicators: Dict[str, Dict] = None,
+                 influences: Dict[str, List[IndicatorInfluence]] = None):
+        if indicators is None:
+            indicators, influences = self._initialize_indicators(), self._initialize_influences()
+        self.indicators = indicators
+        self.influences = influences or {}
+    
+    @classmethod
+    def from_records(cls, indicators: List[Dict], influences: List[Dict]) -> 'SDGIndicatorGraph':
+        """
+        Build a graph from flat records
+        
+        Args:
+            indicators: Dicts with INDICATOR_FIELDS (unit and sdg optional)
+            influences: Dicts with INFLUENCE_FIELDS (description optional)
+        """
+        nodes: Dict[str, Dict] = {}
+        for record in indicators:
+            key = str(record['key'])
+            if key in nodes:
+                raise ValueError(f'Duplicate indicator: {key}')
+            nodes[key] = {
+                'name': record.get('name') or key,
+                'baseline': float(record['baseline']),
+                'min': float(record['min']),
+                'max': float(record['max']),
+                'unit': record.get('unit') or 'index',
+                'sdg': int(record.get('sdg') or 0)
+            }
+            if not nodes[key]['min'] <= nodes[key]['baseline'] <= nodes[key]['max']:
+                raise ValueError(f'Baseline of {key} is outside [min, max]')
+        
+        edges: Dict[str, List[IndicatorInfluence]] = {}
+        for record in influences:
+            source, target = str(record['source']), str(record['target'])
+            for key in (source, target):
+                if key not in nodes:
+                    raise ValueError(f'Influence references unknown indicator: {key}')
+            edges.setdefault(source, []).append(IndicatorInfluence(
+                target, float(record['weight']), int(record['delay_years']),
+                record.get('description') or ''
+            ))
+        
+        return cls(nodes, edges)
+    
+    @classmethod
+    def from_json(cls, path: str) -> 'SDGIndicatorGraph':
+        """Load a graph saved by to_json: {"indicators": [...], "influences": [...]}"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls.from_records(data['indicators'], data['influences'])
+    
+    @classmethod
+    def from_csv(cls, indicators_path: str, influences_path: str) -> 'SDGIndicatorGraph':
+        """Load a graph from two CSV files with INDICATOR_FIELDS and INFLUENCE_FIELDS headers"""
+        with open(indicators_path, newline='', encoding='utf-8') as f:
+            indicators = list(csv.DictReader(f))
+        with open(influences_path, newline='', encoding='utf-8') as f:
+            influences = list(csv.DictReader(f))
+        return cls.from_records(indicators, influences)
+    
+    def to_records(self) -> Tuple[List[Dict], List[Dict]]:
+        """Flat indicator and influence records, see from_records"""
+        indicators = [{'key': key, **info} for key, info in self.indicators.items()]
+        influences = [
+            {
+                'source': source, 'target': influence.target, 'weight': influence.weight,
+                'delay_years': influence.delay_years, 'description': influence.description
+            }
+            for source, source_influences in self.influences.items()
+            for influence in source_influences
+        ]
+        return indicators, influences
+    
+    def to_json(self, path: str):
+        """Save the graph in the from_json format"""
+        indicators, influences = self.to_records()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'indicators': indicators, 'influences': influences}, f)
+    
+    def to_csv(self, indicators_path: str, influences_path: str):
+        """Save the graph in the from_csv format"""
+        for path, fields, records in zip((indicators_path, influences_path),
+                                         (INDICATOR_FIELDS, INFLUENCE_FIELDS), self.to_records()):
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(records)
         
     def _initialize_indicators(self) -> Dict[str, Dict]:
         """Initialize baseline SDG indicators with their properties"""
@@ -294,3 +408,447 @@ class SDGIndicatorGraph:
             key for key, info in self.indicators.items()
             if info.get('sdg') == sdg_number
         ]
+    
+    def compile(self) -> 'CompiledSDGGraph':
+        """Build the immutable, array-backed form of this graph"""
+        return CompiledSDGGraph(self)
+
+
+def synthetic_graph(n_indicators: int, n_edges: int, max_delay: int = 3,
+                    seed: Optional[int] = None) -> SDGIndicatorGraph:
+    """
+    Random graph for scaling tests
+    Indicators are spread over the 17 SDGs; edges are distinct, without
+    self-loops, mostly positive, with weights of magnitude 0.05-0.6
+    """
+    if n_edges > n_indicators * (n_indicators - 1):
+        raise ValueError('Too many edges for the number of indicators')
+    rng = np.random.default_rng(seed)
+    
+    keys = [f'indicator_{i:06d}' for i in range(n_indicators)]
+    baselines = rng.uniform(20.0, 80.0, size=n_indicators)
+    indicators = {
+        key: {
+            'name': f'Indicator {i}',
+            'baseline': float(baselines[i]),
+            'min': 0.0,
+            'max': 100.0,
+            'unit': 'index',
+            'sdg': i % 17 + 1
+        }
+        for i, key in enumerate(keys)
+    }
+    
+    # Sample distinct (source, target) pairs, skipping the diagonal
+    pairs = rng.choice(n_indicators * (n_indicators - 1), size=n_edges, replace=False)
+    sources, offsets = np.divmod(pairs, n_indicators - 1)
+    targets = offsets + (offsets >= sources)
+    weights = rng.uniform(0.05, 0.6, size=n_edges) * np.where(rng.random(n_edges) < 0.75, 1.0, -1.0)
+    delays = rng.integers(0, max_delay + 1, size=n_edges)
+    
+    influences: Dict[str, List[IndicatorInfluence]] = {}
+    for source, target, weight, delay in zip(sources.tolist(), targets.tolist(),
+                                             weights.tolist(), delays.tolist()):
+        influences.setdefault(keys[source], []).append(
+            IndicatorInfluence(keys[target], weight, delay, 'Synthetic influence')
+        )
+    
+    return SDGIndicatorGraph(indicators, influences)
+
+
+def load_graph(path: str) -> SDGIndicatorGraph:
+    """Load a .json graph file, or a directory holding indicators.csv and influences.csv"""
+    if os.path.isdir(path):
+        return SDGIndicatorGraph.from_csv(
+            os.path.join(path, 'indicators.csv'), os.path.join(path, 'influences.csv')
+        )
+    return SDGIndicatorGraph.from_json(path)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+class CompiledSDGGraph:
+    """
+    Immutable, array-backed form of an SDGIndicatorGraph
+    Indicators get integer indices in insertion order and influences are
+    stored as CSR adjacency (source index -> target indices, weights, delays).
+    Offers the same query methods as SDGIndicatorGraph, so it can be shared by
+    the engines, the explainer and every request.
+    """
+    
+    def __init__(self, graph: SDGIndicatorGraph, cycles: Tuple[Tuple[int, ...], ...] = None):
+        keys = tuple(graph.indicators.keys())
+        position = {key: i for i, key in enumerate(keys)}
+        
+        self.keys = keys
+        self.position = MappingProxyType(position)
+        self.indicators = MappingProxyType({
+            key: MappingProxyType(dict(info)) for key, info in graph.indicators.items()
+        })
+        
+        # Per-indicator arrays
+        self.baseline = _read_only(np.array([graph.indicators[k]['baseline'] for k in keys], dtype=float))
+        self.min = _read_only(np.array([graph.indicators[k]['min'] for k in keys], dtype=float))
+        self.max = _read_only(np.array([graph.indicators[k]['max'] for k in keys], dtype=float))
+        self.sdg = _read_only(np.array([graph.indicators[k].get('sdg', 0) for k in keys], dtype=np.int64))
+        
+        # Per-SDG indicator index
+        sdg_indicators: Dict[int, List[str]] = {}
+        for key in keys:
+            sdg_indicators.setdefault(graph.indicators[key].get('sdg'), []).append(key)
+        self.sdg_indicators = MappingProxyType({
+            sdg: tuple(members) for sdg, members in sdg_indicators.items()
+        })
+        self.sdg_positions = MappingProxyType({
+            sdg: _read_only(np.array([position[k] for k in members], dtype=np.int64))
+            for sdg, members in sdg_indicators.items()
+        })
+        
+        # CSR adjacency: edges of source i are indptr[i]:indptr[i + 1]
+        self.influences = MappingProxyType({
+            source: tuple(influences) for source, influences in graph.influences.items()
+        })
+        counts = np.zeros(len(keys), dtype=np.int64)
+        targets, weights, delays = [], [], []
+        for i, key in enumerate(keys):
+            for influence in self.influences.get(key, ()):
+                targets.append(position[influence.target])
+                weights.append(influence.weight)
+                delays.append(influence.delay_years)
+            counts[i] = len(self.influences.get(key, ()))
+        
+        self.indptr = _read_only(np.concatenate([[0], np.cumsum(counts)]).astype(np.int64))
+        self.indices = _read_only(np.array(targets, dtype=np.int64))
+        self.weights = _read_only(np.array(weights, dtype=float))
+        self.delays = _read_only(np.array(delays, dtype=np.int64))
+        self.sources = _read_only(np.repeat(np.arange(len(keys), dtype=np.int64), counts))
+        self.max_delay = int(self.delays.max()) if len(delays) else 0
+        
+        # Propagation plan: edges sorted by (delay, target) so each delay
+        # bucket can be summed per target with reduceat
+        order = np.lexsort((self.indices, self.delays))
+        self._edge_order = _read_only(order)
+        self._edge_source = _read_only(self.sources[order])
+        self._edge_weight = _read_only(self.weights[order])
+        edge_target = self.indices[order]
+        edge_delay = self.delays[order]
+        
+        delay_groups = []
+        for delay in np.unique(edge_delay):
+            start, stop = np.searchsorted(edge_delay, [delay, delay + 1])
+            group_targets = edge_target[start:stop]
+            offsets = np.flatnonzero(np.r_[True, group_targets[1:] != group_targets[:-1]])
+            delay_groups.append((int(delay), int(start), int(stop),
+                                 _read_only(group_targets[offsets]), _read_only(offsets)))
+        self._delay_groups = tuple(delay_groups)
+        
+        # Feedback loops: the elementary cycles of influence edges
+        if cycles is None:
+            cycles = self._find_cycles(MAX_CYCLE_LENGTH, MIN_LOOP_STRENGTH, MAX_FEEDBACK_LOOPS)
+        self.cycles = cycles
+        
+        # Content hash, used to key cached results
+        digest = hashlib.sha256('\n'.join(keys).encode('utf-8'))
+        for array in (self.baseline, self.min, self.max, self.indptr,
+                      self.indices, self.weights, self.delays):
+            digest.update(array.tobytes())
+        self.fingerprint = digest.hexdigest()
+        
+        # Memo of pruned(), most recently used last; per graph, so it goes with it
+        self._pruned = OrderedDict()
+        
+        self._frozen = True
+    
+    def _find_cycles(self, max_length: int, min_strength: float,
+                     max_cycles: int) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Enumerate elementary cycles as tuples of edge indices (in `weights` order)
+        Each cycle is reported once, starting at its lowest-indexed indicator,
+        in lexicographic order. Paths that can no longer close a cycle of
+        min_strength are not extended, and the search stops at max_cycles.
+        """
+        cycles = []
+        strengths = np.abs(self.weights)
+        
+        # Out-edges of every node, strongest first, so a path stops extending
+        # at the first edge that cannot reach min_strength; edges closing a
+        # cycle are looked up by (source, target) instead
+        out_edges = []
+        for node in range(len(self.keys)):
+            edges = np.arange(self.indptr[node], self.indptr[node + 1])
+            edges = edges[np.argsort(-strengths[edges], kind='stable')]
+            out_edges.append(list(zip(edges.tolist(), self.indices[edges].tolist(),
+                                      strengths[edges].tolist())))
+        closing_edges: Dict[Tuple[int, int], List[int]] = {}
+        for edge, (source, target) in enumerate(zip(self.sources.tolist(), self.indices.tolist())):
+            closing_edges.setdefault((source, target), []).append(edge)
+        
+        # Largest factor the further edges of a path can contribute (cycles
+        # may close early, so at least 1), and the strongest edge into each node
+        growth = max(1.0, float(strengths.max(initial=1.0)))
+        strongest_in = np.zeros(len(self.keys))
+        np.maximum.at(strongest_in, self.indices, strengths)
+        strongest_in = strongest_in.tolist()
+        
+        def extend(start: int, node: int, path: List[int], visited: set, strength: float):
+            for edge in closing_edges.get((node, start), ()):
+                if len(cycles) < max_cycles and strength * strengths[edge] >= min_strength:
+                    cycles.append(tuple(path + [edge]))
+            if len(path) + 1 >= max_length:
+                return
+            
+            # Best cycle through a path continued by an edge of strength 1
+            reach = strength * growth ** (max_length - len(path) - 2) * strongest_in[start]
+            for edge, target, edge_strength in out_edges[node]:
+                if len(cycles) >= max_cycles or edge_strength * reach < min_strength:
+                    return
+                if target > start and target not in visited:
+                    visited.add(target)
+                    extend(start, target, path + [edge], visited, strength * edge_strength)
+                    visited.remove(target)
+        
+        for start in range(len(self.keys)):
+            extend(start, start, [], {start}, 1.0)
+        
+        return tuple(sorted(cycles))
+    
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError('CompiledSDGGraph is immutable')
+        super().__setattr__(name, value)
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def to_vector(self, values: Dict[str, float]) -> np.ndarray:
+        """Convert an indicator dict into a state vector (missing keys use baseline)"""
+        vector = self.baseline.copy()
+        for key, value in values.items():
+            if key in self.position:
+                vector[self.position[key]] = value
+        return vector
+    
+    def to_dict(self, vector: np.ndarray) -> Dict[str, float]:
+        """Convert a state vector back into an indicator dict"""
+        return dict(zip(self.keys, vector.tolist()))
+    
+    def target_positions(self, target_sdgs: List[int]) -> np.ndarray:
+        """Indices of the indicators of the given SDGs, in SDG order"""
+        empty = np.zeros(0, dtype=np.int64)
+        return np.concatenate(
+            [empty] + [self.sdg_positions.get(sdg, empty) for sdg in target_sdgs]
+        )
+    
+    def propagate(self, source_change: np.ndarray, edge_scale: np.ndarray = None) -> np.ndarray:
+        """
+        Push changes along every influence edge at once
+        
+        Args:
+            source_change: Array of shape (..., indicators)
+            edge_scale: Optional multiplier per edge (in `weights` order),
+                shape (..., edges), e.g. to perturb weights per run
+        
+        Returns:
+            Array of shape (max_delay + 1, ..., indicators); row d holds the
+            effects that arrive after d years
+        """
+        effects = source_change[..., self._edge_source] * self._edge_weight
+        if edge_scale is not None:
+            effects *= edge_scale[..., self._edge_order]
+        arrivals = np.zeros((self.max_delay + 1,) + source_change.shape)
+        
+        for delay, start, stop, targets, offsets in self._delay_groups:
+            arrivals[delay][..., targets] = np.add.reduceat(
+                effects[..., start:stop], offsets, axis=-1
+            )
+        
+        return arrivals
+    
+    def propagate_sparse(self, positions: np.ndarray, source_change: np.ndarray,
+                         edge_scale: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Push the changes of a few indicators along their influence edges only
+        Costs O(edges leaving `positions`), independent of the graph size
+        
+        Args:
+            positions: Indicators that changed
+            source_change: Their changes, shape (..., len(positions))
+            edge_scale: Optional multiplier per edge, as in propagate
+        
+        Returns:
+            (delays, targets, effects): one entry per distinct (delay, target)
+            pair, sorted by delay then target; effects has shape (..., entries)
+        """
+        starts = self.indptr[positions]
+        counts = self.indptr[positions + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(source_change.shape[:-1] + (0,))
+        
+        # Edge ids of every position's CSR range, concatenated
+        edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        columns = np.repeat(np.arange(len(positions)), counts)
+        
+        # Group by (delay, target), keeping edge order within a group as propagate does
+        group_key = self.delays[edges] * len(self.keys) + self.indices[edges]
+        order = np.argsort(group_key, kind='stable')
+        edges, columns, group_key = edges[order], columns[order], group_key[order]
+        offsets = np.flatnonzero(np.r_[True, group_key[1:] != group_key[:-1]])
+        
+        effects = source_change[..., columns] * self.weights[edges]
+        if edge_scale is not None:
+            effects *= edge_scale[..., edges]
+        
+        delays, targets = np.divmod(group_key[offsets], len(self.keys))
+        return delays, targets, np.add.reduceat(effects, offsets, axis=-1)
+    
+    def reachable(self, target_sdgs: List[int], max_total_delay: int) -> np.ndarray:
+        """
+        Indicators a change at the target SDGs can reach within max_total_delay
+        years, as sorted positions
+        
+        Distances are the shortest sums of edge delays. A feedback loop acts on
+        all its members once one of them has changed and enough history exists
+        (from year 2, and not before the loop's own delay), so reaching one
+        member at distance d reaches the others at max(d, 1, loop delay - 1).
+        """
+        n = len(self.keys)
+        
+        # Feedback loops as links between every pair of members, with no delay
+        # but a lowest distance instead
+        sources, targets, delays = [self.sources], [self.indices], [self.delays]
+        floors = [np.zeros(len(self.weights), dtype=np.int64)]
+        for cycle in self.cycles:
+            members = self.sources[list(cycle)]
+            sources.append(np.repeat(members, len(members)))
+            targets.append(np.tile(members, len(members)))
+            delays.append(np.zeros(len(members) ** 2, dtype=np.int64))
+            floors.append(np.full(len(members) ** 2, max(1, int(self.delays[list(cycle)].sum()) - 1)))
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+        delays, floors = np.concatenate(delays), np.concatenate(floors)
+        
+        distance = np.full(n, max_total_delay + 1, dtype=np.int64)
+        distance[self.target_positions(target_sdgs)] = 0
+        
+        # Settle one distance at a time; zero-delay chains need repeated passes
+        for level in range(max_total_delay + 1):
+            while True:
+                edges = np.flatnonzero(distance[sources] == level)
+                candidate = np.maximum(level + delays[edges], floors[edges])
+                closer = candidate < distance[targets[edges]]
+                if not closer.any():
+                    break
+                np.minimum.at(distance, targets[edges][closer], candidate[closer])
+        
+        return np.flatnonzero(distance <= max_total_delay)
+    
+    def subgraph(self, positions: np.ndarray,
+                 sources: np.ndarray = None) -> Tuple['CompiledSDGGraph', np.ndarray]:
+        """
+        Compiled graph over the given indicators
+        
+        Args:
+            positions: Sorted indicator positions to keep
+            sources: Positions whose influences are kept (all kept indicators
+                by default); influences into indicators outside `positions`
+                are dropped
+        
+        Returns:
+            The subgraph, and the position in `weights` of each of its edges.
+            Feedback loops are the parent's loops that lie entirely on kept edges.
+        """
+        kept = np.zeros(len(self.keys), dtype=bool)
+        kept[positions] = True
+        emitting = kept.copy() if sources is None else np.isin(np.arange(len(self.keys)), sources)
+        edges = np.flatnonzero(emitting[self.sources] & kept[self.indices])
+        
+        keys = [self.keys[i] for i in positions.tolist()]
+        edge_set = set(edges.tolist())
+        influences = {
+            key: [
+                influence
+                for offset, influence in enumerate(self.influences.get(key, ()))
+                if self.indptr[self.position[key]] + offset in edge_set
+            ]
+            for key in keys
+        }
+        graph = SDGIndicatorGraph(
+            {key: dict(self.indicators[key]) for key in keys},
+            {key: source_influences for key, source_influences in influences.items() if source_influences}
+        )
+        
+        # Edge positions are renumbered in the same order, so loops keep their order
+        renumber = np.full(len(self.weights), -1, dtype=np.int64)
+        renumber[edges] = np.arange(len(edges))
+        cycles = tuple(
+            tuple(renumber[list(cycle)].tolist())
+            for cycle in self.cycles
+            if (renumber[list(cycle)] >= 0).all()
+        )
+        
+        return CompiledSDGGraph(graph, cycles), edges
+    
+    def pruned(self, target_sdgs: Tuple[int, ...],
+               timeline_years: int) -> Optional[Tuple['CompiledSDGGraph', np.ndarray, np.ndarray]]:
+        """
+        Subgraph a simulation of the target SDGs over timeline_years needs
+        
+        Direct impacts land in year 1, so an indicator can change within the
+        horizon if it is reachable within timeline_years - 1 years. The
+        subgraph also keeps their influences into indicators further away,
+        which only hold delayed effects pending after the horizon.
+        
+        Returns:
+            (subgraph, positions of its indicators, positions of its edges),
+            or None when every indicator is needed
+        """
+        key = (tuple(target_sdgs), timeline_years)
+        try:
+            result = self._pruned.pop(key)
+        except KeyError:
+            result = self._prune(target_sdgs, timeline_years)
+        self._pruned[key] = result
+        if len(self._pruned) > PRUNED_CACHE_SIZE:
+            self._pruned.popitem(last=False)
+        return result
+    
+    def _prune(self, target_sdgs: Tuple[int, ...],
+               timeline_years: int) -> Optional[Tuple['CompiledSDGGraph', np.ndarray, np.ndarray]]:
+        active = self.reachable(list(target_sdgs), timeline_years - 1)
+        emitted = np.flatnonzero(np.isin(self.sources, active))
+        positions = np.union1d(active, self.indices[emitted])
+        if len(positions) == len(self.keys):
+            return None
+        
+        subgraph, edges = self.subgraph(positions, active)
+        return subgraph, _read_only(positions), _read_only(edges)
+    
+    def get_influences_from(self, indicator: str) -> Tuple[IndicatorInfluence, ...]:
+        """Get all indicators influenced by the given indicator"""
+        return self.influences.get(indicator, ())
+    
+    def get_indicator_info(self, indicator: str) -> Dict:
+        """Get information about an indicator"""
+        return self.indicators.get(indicator, {})
+    
+    def get_all_indicators(self) -> List[str]:
+        """Get list of all indicator keys"""
+        return list(self.keys)
+    
+    def get_sdg_indicators(self, sdg_number: int) -> List[str]:
+        """Get all indicators related to a specific SDG"""
+        return list(self.sdg_indicators.get(sdg_number, ()))
+
+
+@lru_cache(maxsize=1)
+def get_compiled_graph() -> CompiledSDGGraph:
+    """
+    Process-wide compiled SDG graph, built on first use
+    Loaded from SDG_GRAPH_FILE when set, otherwise the built-in graph
+    """
+    graph = load_graph(GRAPH_FILE) if GRAPH_FILE else SDGIndicatorGraph()
+    return graph.compile()
@@ -0,0 +1,141 @@
+"""
+Simulation Result Cache
+Content-addressed LRU + TTL cache for seeded simulation runs
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+
+def _to_json(value):
+    """JSON fallback for NumPy values inside cache keys"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'Cannot hash {type(value).__name__} into a cache key')
+
+
+def _nbytes(value) -> int:
+    """
+    Memory held by a cached value
+    Arrays and trajectories report nbytes; the small result dicts are left to max_entries
+    """
+    return int(getattr(value, 'nbytes', 0))
+
+
+class SimulationCache:
+    """
+    Thread-safe LRU cache whose entries expire after a time-to-live
+    Only seeded runs are cached: an unseeded run is a fresh random draw by design
+    
+    Bounded both by entry count and by the array memory the entries hold;
+    a value larger than max_bytes on its own is not cached at all.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600.0,
+                 max_bytes: int = 128 * 2**20):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[float, Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hash the parts of a request into a stable content address"""
+        payload = json.dumps(parts, sort_keys=True, default=_to_json)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached value
+        
+        Returns:
+            Tuple of (hit, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self._bytes -= entry[2]
+                entry = None
+            
+            if entry is None:
+                self.misses += 1
+                return False, None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+    
+    def put(self, key: str, value: Any):
+        """Store a value, evicting least recently used entries while over either bound"""
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (time.monotonic(), value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[1][2]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds
+            }
+
+
+def combine_stats(stats: List[Dict]) -> Dict:
+    """Counters of several processes' caches added up (limits stay per process)"""
+    hits = sum(s['hits'] for s in stats)
+    misses = sum(s['misses'] for s in stats)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        'entries': sum(s['entries'] for s in stats),
+        'bytes': sum(s['bytes'] for s in stats),
+        'processes': len(stats),
+        'max_entries': stats[0]['max_entries'],
+        'max_bytes': stats[0]['max_bytes'],
+        'ttl_seconds': stats[0]['ttl_seconds']
+    }
+
+
+# Process-wide cache shared by both simulation engines; every pool worker
+# holds its own, so SIMULATION_CACHE_MB bounds each process
+simulation_cache = SimulationCache(
+    max_entries=int(os.getenv("SIMULATION_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("SIMULATION_CACHE_TTL", "3600")),
+    max_bytes=int(float(os.getenv("SIMULATION_CACHE_MB", "128")) * 2**20)
+)
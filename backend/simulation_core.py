@@ -2,27 +2,193 @@
 Advanced Time-Step Simulation Engine
 Simulates year-by-year progression with delayed effects, diminishing returns, and constraints
 """
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from collections.abc import MutableMapping
+import json
 import numpy as np
-from dataclasses import dataclass, field
-from copy import deepcopy
-from sdg_graph import SDGIndicatorGraph, IndicatorInfluence
+from dataclasses import dataclass
+from sdg_graph import SDGIndicatorGraph, CompiledSDGGraph, IndicatorInfluence
+from simulation_cache import SimulationCache, simulation_cache
+
+
+class DelayQueue:
+    """
+    Ring buffer of pending delayed effects
+    Holds one accumulation vector per year ahead, so scheduling and releasing
+    cost O(indicators) per year no matter how many influences are waiting
+    """
+    
+    def __init__(self, n_indicators: int = 0, max_delay: int = 1,
+                 batch_shape: Tuple[int, ...] = ()):
+        self.buffer = np.zeros((max(max_delay, 1),) + tuple(batch_shape) + (n_indicators,))
+        self.head = 0  # Slot released next year
+    
+    def _slot(self, years_ahead: int) -> int:
+        return (self.head + years_ahead - 1) % len(self.buffer)
+    
+    def schedule(self, years_ahead: int, position, effect):
+        """Add an effect landing `years_ahead` years from now (1 = next year)"""
+        self.buffer[self._slot(years_ahead)][..., position] += effect
+    
+    def schedule_arrivals(self, arrivals: np.ndarray):
+        """Add an arrivals array whose row d lands in d years (row 0 is ignored)"""
+        for years_ahead in range(1, len(arrivals)):
+            self.buffer[self._slot(years_ahead)] += arrivals[years_ahead]
+    
+    def release(self) -> np.ndarray:
+        """Pop the effects landing this year and advance one year"""
+        landing = self.buffer[self.head].copy()
+        self.buffer[self.head] = 0.0
+        self.head = (self.head + 1) % len(self.buffer)
+        return landing
+    
+    def pending(self) -> List[Tuple[int, float, int]]:
+        """Pending effects of an unbatched queue as (position, effect, years_left)"""
+        return [
+            (position, float(self.buffer[self._slot(years_ahead), position]), years_ahead)
+            for years_ahead in range(1, len(self.buffer) + 1)
+            for position in np.flatnonzero(self.buffer[self._slot(years_ahead)])
+        ]
+    
+    def copy(self) -> 'DelayQueue':
+        queue = DelayQueue.__new__(DelayQueue)
+        queue.buffer = self.buffer.copy()
+        queue.head = self.head
+        return queue
+    
+    def select(self, index) -> 'DelayQueue':
+        """Copy of the queue of one member of a batched queue, e.g. one scenario variant"""
+        queue = DelayQueue.__new__(DelayQueue)
+        queue.buffer = self.buffer[:, index].copy()
+        queue.head = self.head
+        return queue
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, used by simulation checkpoints"""
+        return {'buffer': self.buffer.tolist(), 'head': self.head}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DelayQueue':
+        queue = cls.__new__(cls)
+        queue.buffer = np.array(data['buffer'], dtype=np.float64)
+        queue.head = int(data['head'])
+        return queue
+    
+    def __len__(self):
+        return int(np.count_nonzero(self.buffer))
+
+
+class IndicatorRow(MutableMapping):
+    """Dict-like view of one row of a trajectory array, keyed by indicator"""
+    
+    __slots__ = ('row', 'position')
+    
+    def __init__(self, row: np.ndarray, position: Mapping[str, int]):
+        self.row = row
+        self.position = position
+    
+    def __getitem__(self, indicator: str) -> float:
+        return float(self.row[self.position[indicator]])
+    
+    def __setitem__(self, indicator: str, value: float):
+        self.row[self.position[indicator]] = value
+    
+    def __delitem__(self, indicator: str):
+        raise TypeError('Indicators cannot be removed from a simulation state')
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.position)
+    
+    def __len__(self) -> int:
+        return len(self.position)
+    
+    def __repr__(self):
+        return repr(dict(self))
 
 
-@dataclass
 class SimulationState:
-    """Represents the state of all indicators at a specific year"""
-    year: int
-    indicators: Dict[str, float]
-    delayed_effects: List[Tuple[str, float, int]] = field(default_factory=list)  # (indicator, effect, years_left)
+    """
+    Represents the state of all indicators at a specific year
+    States produced by the engines are views over one row of a
+    SimulationTrajectory, so creating them copies nothing
+    """
+    
+    __slots__ = ('year', 'indicators', 'delayed_effects')
+    
+    def __init__(self, year: int, indicators: Mapping[str, float],
+                 delayed_effects: DelayQueue = None):
+        self.year = year
+        self.indicators = indicators
+        self.delayed_effects = delayed_effects if delayed_effects is not None else DelayQueue()
+    
+    def __repr__(self):
+        return f'SimulationState(year={self.year}, indicators={self.indicators!r})'
     
     def clone(self):
-        """Create a deep copy of this state"""
+        """Create a detached copy of this state"""
         return SimulationState(
             year=self.year,
-            indicators=deepcopy(self.indicators),
-            delayed_effects=deepcopy(self.delayed_effects)
+            indicators=dict(self.indicators),
+            delayed_effects=self.delayed_effects.copy()
+        )
+
+
+class SimulationTrajectory:
+    """
+    Preallocated (years x indicators) array holding a whole run
+    Each simulated year writes into its own row in place; the delay queue is
+    shared by every state and always holds what is pending after the last year
+    """
+    
+    __slots__ = ('graph', 'values', 'delayed_effects')
+    
+    def __init__(self, graph: CompiledSDGGraph, values: np.ndarray, delayed_effects: DelayQueue):
+        self.graph = graph
+        self.values = values
+        self.delayed_effects = delayed_effects
+    
+    @classmethod
+    def allocate(cls, graph: CompiledSDGGraph, timeline_years: int,
+                 baseline: np.ndarray) -> 'SimulationTrajectory':
+        """Allocate rows for Year 0 to Year N, filling Year 0 with the baseline"""
+        values = np.empty((timeline_years + 1,) + baseline.shape)
+        values[0] = baseline
+        return cls(graph, values, DelayQueue(len(graph), graph.max_delay, baseline.shape[:-1]))
+    
+    @classmethod
+    def resume(cls, graph: CompiledSDGGraph, timeline_years: int, simulated: np.ndarray,
+               delayed_effects: DelayQueue) -> 'SimulationTrajectory':
+        """Allocate rows for Year 0 to Year N, prefilled with the years already simulated"""
+        if len(simulated) > timeline_years + 1:
+            raise ValueError('Cannot resume a trajectory that is longer than the new horizon')
+        
+        values = np.empty((timeline_years + 1,) + simulated.shape[1:])
+        values[:len(simulated)] = simulated
+        return cls(graph, values, delayed_effects)
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def state(self, year: int) -> SimulationState:
+        """View of the state at the given year"""
+        return SimulationState(
+            year, IndicatorRow(self.values[year], self.graph.position), self.delayed_effects
         )
+    
+    def advance(self, year: int) -> SimulationState:
+        """Carry the previous year's values into this year's row and return its view"""
+        self.values[year] = self.values[year - 1]
+        return self.state(year)
+    
+    def states(self) -> List[SimulationState]:
+        return [self.state(year) for year in range(len(self.values))]
+    
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.delayed_effects.buffer.nbytes
+    
+    def copy(self) -> 'SimulationTrajectory':
+        return SimulationTrajectory(self.graph, self.values.copy(), self.delayed_effects.copy())
 
 
 @dataclass
@@ -55,43 +221,58 @@ class SaturationFunction:
         Returns:
             Actual change after saturation
         """
-        if potential_change == 0:
-            return 0
-        
-        # For positive changes (improvements)
-        if potential_change > 0:
-            # Distance to ceiling
-            distance_to_max = max_value - current_value
-            if distance_to_max <= 0:
-                return 0
-            
-            # Saturation factor: easier to improve when far from max
-            # Uses sigmoid-like curve
-            normalized_distance = distance_to_max / max_value
-            saturation_factor = 1 / (1 + np.exp(-10 * (normalized_distance - 0.5)))
-            
-            # Apply diminishing returns
-            actual_change = potential_change * saturation_factor
-            
-            # Ensure we don't exceed max
-            return min(actual_change, distance_to_max)
+        return float(SaturationFunction.apply_array(
+            np.float64(current_value), np.float64(potential_change),
+            np.float64(max_value), np.float64(min_value)
+        ))
+    
+    @staticmethod
+    def apply_array(current_values: np.ndarray, potential_changes: np.ndarray,
+                    max_values: np.ndarray, min_values: np.ndarray) -> np.ndarray:
+        """
+        Apply saturation to whole indicator vectors in one pass
         
-        # For negative changes (degradation)
-        else:
-            # Distance to floor
-            distance_to_min = current_value - min_value
-            if distance_to_min <= 0:
-                return 0
-            
-            # Negative changes are less saturated (degradation can be rapid)
-            return max(potential_change, -distance_to_min)
+        All arguments broadcast against each other, so a (runs x indicators)
+        matrix of values works with per-indicator min/max vectors.
+        
+        Args:
+            current_values: Current indicator values
+            potential_changes: Proposed changes (can be positive or negative)
+            max_values: Maximum possible values
+            min_values: Minimum possible values
+        
+        Returns:
+            Array of actual changes after saturation
+        """
+        # Improvements: easier when far from max (sigmoid), never beyond the ceiling
+        distance_to_max = max_values - current_values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized_distance = distance_to_max / max_values
+        saturation_factor = 1 / (1 + np.exp(-10 * (normalized_distance - 0.5)))
+        improvement = np.minimum(potential_changes * saturation_factor, distance_to_max)
+        improvement = np.where(distance_to_max > 0, improvement, 0.0)
+        
+        # Degradation: less saturated (can be rapid), only capped at the floor
+        distance_to_min = current_values - min_values
+        degradation = np.maximum(potential_changes, -distance_to_min)
+        degradation = np.where(distance_to_min > 0, degradation, 0.0)
+        
+        return np.where(
+            potential_changes > 0, improvement,
+            np.where(potential_changes < 0, degradation, 0.0)
+        )
 
 
 class ConstraintEngine:
     """Manages and applies constraints to simulation"""
     
+    # Bounds of the random infrastructure readiness factor
+    INFRASTRUCTURE_RANGE = (0.8, 1.0)
+    
     def __init__(self, scenario_type: str, funding_percentage: float, 
-                 timeline_years: int, delay_months: int):
+                 timeline_years: int, delay_months: int,
+                 rng: np.random.Generator = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.constraints = self._build_constraints(
             scenario_type, funding_percentage, timeline_years, delay_months
         )
@@ -110,12 +291,7 @@ class ConstraintEngine:
         ))
         
         # Timeline constraint (rushed projects are less effective)
-        if timeline_years < 3:
-            timeline_factor = 0.7  # Rushed
-        elif timeline_years > 7:
-            timeline_factor = 0.9  # Well-paced
-        else:
-            timeline_factor = 1.0  # Optimal
+        timeline_factor = self.timeline_factor(timeline_years)
         
         constraints.append(Constraint(
             name='Timeline Pressure',
@@ -170,7 +346,7 @@ class ConstraintEngine:
             ))
         
         # Infrastructure readiness constraint (random but bounded)
-        infrastructure_factor = np.random.uniform(0.8, 1.0)
+        infrastructure_factor = self.rng.uniform(*self.INFRASTRUCTURE_RANGE)
         constraints.append(Constraint(
             name='Infrastructure Readiness',
             factor=infrastructure_factor,
@@ -179,6 +355,31 @@ class ConstraintEngine:
         
         return constraints
     
+    @staticmethod
+    def timeline_factor(timeline_years: int) -> float:
+        """Effectiveness multiplier for the length of the project timeline"""
+        if timeline_years < 3:
+            return 0.7  # Rushed
+        elif timeline_years > 7:
+            return 0.9  # Well-paced
+        return 1.0  # Optimal
+    
+    def get_infrastructure_factor(self) -> float:
+        """The randomly drawn infrastructure readiness factor"""
+        for constraint in self.constraints:
+            if constraint.name == 'Infrastructure Readiness':
+                return constraint.factor
+        return 1.0
+    
+    def set_infrastructure_factor(self, infrastructure_factor: float):
+        """Replace the drawn infrastructure readiness factor (e.g. from a checkpoint)"""
+        for constraint in self.constraints:
+            if constraint.name == 'Infrastructure Readiness':
+                constraint.factor = infrastructure_factor
+                constraint.description = (
+                    f'Infrastructure readiness affects implementation ({infrastructure_factor:.1%})'
+                )
+    
     def apply_constraints(self, base_impact: float) -> Tuple[float, List[str]]:
         """
         Apply all constraints to a base impact value
@@ -202,97 +403,134 @@ class ConstraintEngine:
         for constraint in self.constraints:
             total *= constraint.factor
         return total
+    
+    def get_fixed_effectiveness(self) -> float:
+        """Get the combined effectiveness of the non-random constraints"""
+        total = 1.0
+        for constraint in self.constraints:
+            if constraint.name != 'Infrastructure Readiness':
+                total *= constraint.factor
+        return total
+    
+    def sample_effectiveness(self, n_runs: int) -> np.ndarray:
+        """
+        Draw the total effectiveness for a batch of independent realizations
+        
+        Returns:
+            Array of shape (n_runs,) with a fresh infrastructure factor per run
+        """
+        infrastructure = self.rng.uniform(*self.INFRASTRUCTURE_RANGE, size=n_runs)
+        return self.get_fixed_effectiveness() * infrastructure
 
 
 class FeedbackLoopEngine:
     """
     Implements positive and negative feedback loops
     Feedback effects accumulate over time and influence future states
+    
+    Loops are the cycles of the influence graph found when it is compiled: a
+    loop's strength is the product of its edge weights and its delay the sum
+    of its edge delays. They are stored as padded index arrays grouped by
+    delay, so every loop is evaluated for every run in one array operation.
     """
     
-    def __init__(self, graph: SDGIndicatorGraph):
+    def __init__(self, graph: Union[SDGIndicatorGraph, CompiledSDGGraph]):
+        if not isinstance(graph, CompiledSDGGraph):
+            graph = graph.compile()
         self.graph = graph
         self.feedback_loops = self._define_feedback_loops()
+        self._compile_feedback_loops()
     
     def _define_feedback_loops(self) -> List[Dict]:
-        """Define key feedback loops in the system"""
-        return [
-            {
-                'name': 'Education-Employment-Revenue Loop',
-                'chain': ['education_index', 'employment_rate', 'governance_index', 'education_index'],
-                'type': 'positive',
-                'strength': 0.15,
-                'delay': 2,
-                'description': 'Better education → more employment → higher tax revenue → more education funding'
-            },
-            {
-                'name': 'Industrial-Emissions-Health Loop',
-                'chain': ['innovation_index', 'emissions_reduction', 'health_index', 'employment_rate'],
-                'type': 'mixed',
-                'strength': -0.10,
-                'delay': 3,
-                'description': 'Industrial growth can increase emissions, reducing health and productivity'
-            },
-            {
-                'name': 'Poverty-Health-Employment Trap',
-                'chain': ['poverty_rate', 'health_index', 'employment_rate', 'poverty_rate'],
-                'type': 'negative',
-                'strength': -0.12,
-                'delay': 1,
-                'description': 'Poverty reduces health access, limiting employment, perpetuating poverty'
-            },
-            {
-                'name': 'Clean Energy Innovation Loop',
-                'chain': ['clean_energy', 'innovation_index', 'employment_rate', 'clean_energy'],
-                'type': 'positive',
-                'strength': 0.18,
-                'delay': 2,
-                'description': 'Clean energy drives innovation, creating jobs, enabling more clean energy investment'
-            },
-        ]
+        """Describe every influence cycle of the graph as a feedback loop"""
+        loops = []
+        
+        for cycle in self.graph.cycles:
+            edges = list(cycle)
+            chain = [self.graph.keys[source] for source in self.graph.sources[edges]]
+            influences = [
+                self.graph.influences[self.graph.keys[source]][edge - self.graph.indptr[source]]
+                for source, edge in zip(self.graph.sources[edges], edges)
+            ]
+            strength = float(np.prod(self.graph.weights[edges]))
+            
+            loops.append({
+                'name': ' → '.join(self.graph.indicators[k]['name'] for k in chain + chain[:1]),
+                'chain': chain + chain[:1],
+                'type': 'positive' if strength > 0 else 'negative',
+                'strength': strength,
+                'delay': max(1, int(self.graph.delays[edges].sum())),
+                'description': '; '.join(influence.description for influence in influences)
+            })
+        
+        return loops
     
-    def calculate_feedback_effects(self, state: SimulationState, 
-                                   previous_states: List[SimulationState]) -> Dict[str, float]:
+    def _compile_feedback_loops(self):
         """
-        Calculate feedback effects based on historical states
-        
-        Returns:
-            Dictionary of indicator -> feedback effect value
+        Translate loop chains into padded (loops x chain length) index arrays
+        A cycle has no distinguished end, so each loop's effect is shared
+        equally by its members; the (loop, member) pairs are sorted by member
+        so the shares can be summed per indicator with reduceat
         """
-        feedback_effects = {}
-        
-        if len(previous_states) < 2:
-            return feedback_effects  # Need history for feedback
-        
+        groups: Dict[int, List[Dict]] = {}
         for loop in self.feedback_loops:
-            delay = loop['delay']
+            groups.setdefault(loop['delay'], []).append(loop)
+        
+        self._delay_groups = []
+        for delay in sorted(groups):
+            loops = groups[delay]
+            length = max(len(loop['chain']) - 1 for loop in loops)
             
-            # Check if we have enough history
-            if len(previous_states) < delay:
-                continue
+            members = np.zeros((len(loops), length), dtype=np.int64)
+            padding = np.ones((len(loops), length), dtype=bool)
+            for i, loop in enumerate(loops):
+                chain = [self.graph.position[k] for k in loop['chain'][:-1]]
+                members[i, :len(chain)] = chain
+                padding[i, :len(chain)] = False
             
-            # Get the state from 'delay' years ago
-            historical_state = previous_states[-delay] if delay <= len(previous_states) else previous_states[0]
+            pair_loops, pair_slots = np.nonzero(~padding)
+            order = np.argsort(members[pair_loops, pair_slots], kind='stable')
+            pair_loops = pair_loops[order]
+            pair_members = members[pair_loops, pair_slots[order]]
+            offsets = np.flatnonzero(np.r_[True, pair_members[1:] != pair_members[:-1]])
             
-            # Calculate the change in the feedback chain
-            chain_strength = 1.0
-            for i in range(len(loop['chain']) - 1):
-                indicator = loop['chain'][i]
-                
-                current_val = state.indicators.get(indicator, 0)
-                historical_val = historical_state.indicators.get(indicator, 0)
-                
-                # Normalized change
-                change = (current_val - historical_val) / 100.0
-                chain_strength *= (1.0 + change * loop['strength'])
+            strengths = np.array([loop['strength'] for loop in loops])
+            share = (pair_loops, 1.0 / (~padding).sum(axis=1)[pair_loops], pair_members[offsets], offsets)
+            self._delay_groups.append((delay, members, padding, strengths, share))
+    
+    def calculate_feedback_effects(self, values: np.ndarray, history: np.ndarray) -> np.ndarray:
+        """
+        Calculate feedback effects against the stored history
+        
+        Args:
+            values: Current state, shape (..., indicators)
+            history: Previous states, shape (years, ..., indicators)
+        
+        Returns:
+            Feedback effect per indicator, shaped like values
+        """
+        feedback = np.zeros_like(values)
+        
+        if len(history) < 2:
+            return feedback  # Need history for feedback
+        
+        for delay, members, padding, strengths, share in self._delay_groups:
+            # Groups are sorted by delay, so later ones lack history too
+            if len(history) < delay:
+                break
             
-            # Apply feedback to the last indicator in the chain
-            target_indicator = loop['chain'][-1]
-            feedback_effect = (chain_strength - 1.0) * 100.0 * loop['strength']
+            # Normalized change of every chain member since 'delay' years ago
+            change = (values[..., members] - history[-delay][..., members]) / 100.0
+            factors = np.where(padding, 1.0, 1.0 + change * strengths[:, None])
+            chain_strength = np.prod(factors, axis=-1)
             
-            feedback_effects[target_indicator] = feedback_effects.get(target_indicator, 0) + feedback_effect
+            effects = (chain_strength - 1.0) * 100.0 * strengths
+            pair_loops, pair_share, targets, offsets = share
+            feedback[..., targets] += np.add.reduceat(
+                effects[..., pair_loops] * pair_share, offsets, axis=-1
+            )
         
-        return feedback_effects
+        return feedback
 
 
 class TimeStepSimulationEngine:
@@ -300,22 +538,34 @@ class TimeStepSimulationEngine:
     Core simulation engine that runs year-by-year simulations
     """
     
-    def __init__(self, graph: SDGIndicatorGraph, target_sdgs: List[int],
+    def __init__(self, graph: Union[SDGIndicatorGraph, CompiledSDGGraph], target_sdgs: List[int],
                  scenario_type: str, funding_percentage: float,
-                 timeline_years: int, delay_months: int):
+                 timeline_years: int, delay_months: int, seed: Optional[int] = None):
+        if not isinstance(graph, CompiledSDGGraph):
+            graph = graph.compile()
         self.graph = graph
         self.target_sdgs = target_sdgs
+        self.scenario_type = scenario_type
+        self.funding_percentage = funding_percentage
         self.timeline_years = timeline_years
+        self.delay_months = delay_months
+        
+        # All randomness of a run comes from this generator
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
         
         # Initialize engines
         self.constraint_engine = ConstraintEngine(
-            scenario_type, funding_percentage, timeline_years, delay_months
+            scenario_type, funding_percentage, timeline_years, delay_months, self.rng
         )
         self.feedback_engine = FeedbackLoopEngine(graph)
         self.saturation = SaturationFunction()
         
         # Simulation history
+        self.trajectory: SimulationTrajectory = None
         self.states: List[SimulationState] = []
+        self.direct_impacts: Dict[str, float] = {}
+        self.resumed_from_year = 0
     
     def initialize_baseline(self, digital_twin_data: Dict = None) -> SimulationState:
         """Initialize Year 0 baseline state"""
@@ -328,7 +578,11 @@ class TimeStepSimulationEngine:
             else:
                 indicators[indicator_key] = indicator_info['baseline']
         
-        return SimulationState(year=0, indicators=indicators, delayed_effects=[])
+        return SimulationState(year=0, indicators=indicators, delayed_effects=self.new_delay_queue())
+    
+    def new_delay_queue(self) -> DelayQueue:
+        """Empty delay queue sized for this graph"""
+        return DelayQueue(len(self.graph), self.graph.max_delay)
     
     def calculate_direct_impact(self, target_sdgs: List[int]) -> Dict[str, float]:
         """
@@ -342,134 +596,179 @@ class TimeStepSimulationEngine:
             
             for indicator in sdg_indicators:
                 # Base improvement from targeting this SDG
-                base_improvement = np.random.uniform(8.0, 15.0)  # 8-15% improvement potential
+                base_improvement = self.rng.uniform(8.0, 15.0)  # 8-15% improvement potential
                 direct_impacts[indicator] = direct_impacts.get(indicator, 0) + base_improvement
         
         return direct_impacts
     
     def simulate_year(self, current_state: SimulationState, year: int,
                      direct_impacts: Dict[str, float]) -> SimulationState:
-        """Simulate a single year, returning the new state"""
-        new_state = current_state.clone()
-        new_state.year = year
-        
-        changes_made = {}  # Track what changed and why
+        """Simulate a single year in place, returning the new state"""
+        new_state = self.trajectory.advance(year)
+        values = new_state.indicators.row  # Written in place
         
         # 1. Apply direct project impacts (with constraints and saturation)
         effectiveness = self.constraint_engine.get_total_effectiveness()
         
+        direct = np.zeros(len(self.graph))
         for indicator, base_impact in direct_impacts.items():
-            # Apply constraints
-            constrained_impact = base_impact * effectiveness
-            
-            # Apply saturation
-            current_val = new_state.indicators[indicator]
-            indicator_info = self.graph.get_indicator_info(indicator)
-            
-            actual_change = self.saturation.apply(
-                current_val, constrained_impact,
-                indicator_info['max'], indicator_info['min']
-            )
-            
-            new_state.indicators[indicator] += actual_change
-            changes_made[indicator] = changes_made.get(indicator, 0) + actual_change
-        
-        # 2. Apply delayed effects from previous years
-        remaining_delays = []
-        for indicator, effect, years_left in new_state.delayed_effects:
-            if years_left <= 1:
-                # Effect kicks in this year
-                current_val = new_state.indicators[indicator]
-                indicator_info = self.graph.get_indicator_info(indicator)
-                
-                actual_change = self.saturation.apply(
-                    current_val, effect,
-                    indicator_info['max'], indicator_info['min']
-                )
-                
-                new_state.indicators[indicator] += actual_change
-                changes_made[indicator] = changes_made.get(indicator, 0) + actual_change
-            else:
-                # Still waiting
-                remaining_delays.append((indicator, effect, years_left - 1))
+            direct[self.graph.position[indicator]] += base_impact
+        
+        changes_made = self._saturate(values, direct * effectiveness)  # Track what changed
+        values += changes_made
         
-        new_state.delayed_effects = remaining_delays
+        # 2. Apply delayed effects landing this year (saturated as they land)
+        landing = new_state.delayed_effects.release()
+        actual_change = self._saturate(values, landing)
+        values += actual_change
+        changes_made += actual_change
         
         # 3. Calculate and apply indirect effects via SDG graph
-        for indicator, change in list(changes_made.items()):
-            if abs(change) < 0.1:  # Skip tiny changes
-                continue
-            
-            influences = self.graph.get_influences_from(indicator)
+        immediate = np.zeros(len(self.graph))
+        for position in np.flatnonzero(np.abs(changes_made) >= 0.1):  # Skip tiny changes
+            change = changes_made[position]
+            influences = self.graph.get_influences_from(self.graph.keys[position])
             
             for influence in influences:
                 # Calculate indirect effect
                 indirect_effect = change * influence.weight
+                target = self.graph.position[influence.target]
                 
                 if influence.delay_years > 0:
                     # Add to delayed effects
-                    new_state.delayed_effects.append((
-                        influence.target, indirect_effect, influence.delay_years
-                    ))
+                    new_state.delayed_effects.schedule(influence.delay_years, target, indirect_effect)
                 else:
                     # Apply immediately
-                    current_val = new_state.indicators[influence.target]
-                    target_info = self.graph.get_indicator_info(influence.target)
-                    
-                    actual_change = self.saturation.apply(
-                        current_val, indirect_effect,
-                        target_info['max'], target_info['min']
-                    )
-                    
-                    new_state.indicators[influence.target] += actual_change
-                    changes_made[influence.target] = changes_made.get(influence.target, 0) + actual_change
+                    immediate[target] += indirect_effect
+        
+        values += self._saturate(values, immediate)
         
         # 4. Apply feedback loop effects
         if len(self.states) > 0:
-            feedback_effects = self.feedback_engine.calculate_feedback_effects(
-                new_state, self.states
+            feedback = self.feedback_engine.calculate_feedback_effects(
+                values, self.trajectory.values[:year]
             )
-            
-            for indicator, feedback in feedback_effects.items():
-                current_val = new_state.indicators[indicator]
-                indicator_info = self.graph.get_indicator_info(indicator)
-                
-                actual_change = self.saturation.apply(
-                    current_val, feedback,
-                    indicator_info['max'], indicator_info['min']
-                )
-                
-                new_state.indicators[indicator] += actual_change
+            values += self._saturate(values, feedback)
         
         # 5. Ensure all values stay within bounds
-        for indicator, value in new_state.indicators.items():
-            indicator_info = self.graph.get_indicator_info(indicator)
-            new_state.indicators[indicator] = np.clip(
-                value, indicator_info['min'], indicator_info['max']
-            )
+        np.clip(values, self.graph.min, self.graph.max, out=values)
         
         return new_state
     
-    def run_simulation(self, baseline_state: SimulationState = None) -> List[SimulationState]:
+    def _saturate(self, values: np.ndarray, change: np.ndarray) -> np.ndarray:
+        return self.saturation.apply_array(values, change, self.graph.max, self.graph.min)
+    
+    def cache_key(self, baseline: np.ndarray) -> str:
+        """Content address of this run: graph, twin baseline, parameters and seed"""
+        return SimulationCache.make_key(
+            type(self).__name__, self.graph.fingerprint, baseline, self.target_sdgs,
+            self.scenario_type, self.funding_percentage, self.timeline_years,
+            self.delay_months, self.seed
+        )
+    
+    def checkpoint_key(self, baseline: np.ndarray = None) -> str:
+        """
+        Address of the checkpoints this run can resume from
+        Same as the cache key except for the horizon: only its effectiveness
+        bracket matters, since the timeline factor scales every year
+        """
+        if baseline is None:
+            baseline = self.graph.baseline
+        return SimulationCache.make_key(
+            type(self).__name__, 'checkpoint', self.graph.fingerprint, baseline,
+            self.target_sdgs, self.scenario_type, self.funding_percentage,
+            ConstraintEngine.timeline_factor(self.timeline_years), self.delay_months, self.seed
+        )
+    
+    def export_checkpoint(self) -> Dict:
+        """
+        JSON-serializable end-of-run state: every simulated year (which includes
+        the feedback history window), pending delayed effects, the random draws
+        and the generator state
+        """
+        return {
+            'key': self.checkpoint_key(self.trajectory.values[0]),
+            'timeline_years': self.timeline_years,
+            'values': self.trajectory.values.tolist(),
+            'delayed_effects': self.trajectory.delayed_effects.to_dict(),
+            'direct_impacts': {k: float(v) for k, v in self.direct_impacts.items()},
+            'infrastructure_factor': self.constraint_engine.get_infrastructure_factor(),
+            'rng_state': json.dumps(self.rng.bit_generator.state)
+        }
+    
+    def _resume_trajectory(self, checkpoint: Dict, baseline: np.ndarray) -> int:
+        """Restore a checkpoint into a longer trajectory, returning the first year left to simulate"""
+        if checkpoint['key'] != self.checkpoint_key(baseline):
+            raise ValueError('Checkpoint was produced by a different simulation')
+        
+        self.trajectory = SimulationTrajectory.resume(
+            self.graph, self.timeline_years, np.array(checkpoint['values'], dtype=np.float64),
+            DelayQueue.from_dict(checkpoint['delayed_effects'])
+        )
+        self.constraint_engine.set_infrastructure_factor(checkpoint['infrastructure_factor'])
+        self.rng.bit_generator.state = json.loads(checkpoint['rng_state'])
+        
+        self.resumed_from_year = checkpoint['timeline_years']
+        return self.resumed_from_year + 1
+    
+    def run_simulation(self, baseline_state: SimulationState = None,
+                       checkpoint: Dict = None) -> List[SimulationState]:
         """
         Run the complete multi-year simulation
         
+        Args:
+            baseline_state: Year 0 state (graph defaults if omitted)
+            checkpoint: Output of export_checkpoint() for a shorter horizon of
+                this simulation; only the missing years are then computed
+        
         Returns:
             List of states for each year (Year 0 to Year N)
         """
+        for _ in self.iter_simulation(baseline_state, checkpoint):
+            pass
+        return self.states
+    
+    def iter_simulation(self, baseline_state: SimulationState = None,
+                        checkpoint: Dict = None) -> Iterator[SimulationState]:
+        """
+        Run the simulation like run_simulation, yielding each year's state
+        as soon as it is final (restored or cached years at once)
+        """
         # Initialize
         if baseline_state is None:
             baseline_state = self.initialize_baseline()
+        baseline = self.graph.to_vector(baseline_state.indicators)
+        self.resumed_from_year = 0
         
-        self.states = [baseline_state]
-        
-        # Calculate direct impacts once (these are the project's intended effects)
-        direct_impacts = self.calculate_direct_impact(self.target_sdgs)
-        
-        # Simulate each year
-        for year in range(1, self.timeline_years + 1):
+        if checkpoint is not None:
+            start_year = self._resume_trajectory(checkpoint, baseline)
+            self.direct_impacts = dict(checkpoint['direct_impacts'])
+        else:
+            # Calculate direct impacts once (these are the project's intended effects)
+            start_year = 1
+            self.direct_impacts = self.calculate_direct_impact(self.target_sdgs)
+        
+        # Seeded runs are reproducible, so they can be served from the cache
+        cache_key = self.cache_key(baseline) if self.seed is not None else None
+        if cache_key is not None:
+            hit, cached = simulation_cache.get(cache_key)
+            if hit:
+                self.trajectory = cached.copy()
+                self.states = self.trajectory.states()
+                yield from self.states
+                return
+        
+        if checkpoint is None:
+            self.trajectory = SimulationTrajectory.allocate(self.graph, self.timeline_years, baseline)
+        self.states = self.trajectory.states()[:start_year]
+        yield from self.states
+        
+        # Simulate each remaining year
+        for year in range(start_year, self.timeline_years + 1):
             current_state = self.states[-1]
-            next_state = self.simulate_year(current_state, year, direct_impacts)
+            next_state = self.simulate_year(current_state, year, self.direct_impacts)
             self.states.append(next_state)
+            yield next_state
         
-        return self.states
+        if cache_key is not None:
+            simulation_cache.put(cache_key, self.trajectory.copy())
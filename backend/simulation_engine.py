@@ -2,9 +2,11 @@
 SDG Future Impact Simulation Engine
 Core innovation: Predict future SDG outcomes based on project scenarios
 """
-import random
-from typing import Dict, List, Tuple
+import copy
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from sdg_data import SDG_INDICATORS, SDG_GOALS
+from simulation_cache import SimulationCache, simulation_cache
 
 
 class SimulationEngine:
@@ -43,6 +45,15 @@ class SimulationEngine:
         17: [1, 8, 9, 16]
     }
     
+    def _cache_key(self, baseline_indicators: Dict[int, float], target_sdgs: List[int],
+                   scenario_type: str, funding_percentage: float, timeline_years: int,
+                   delay_months: int, scale_factor: float, population: int, seed: int) -> str:
+        return SimulationCache.make_key(
+            type(self).__name__, sorted(baseline_indicators.items()), target_sdgs,
+            scenario_type, funding_percentage, timeline_years, delay_months,
+            scale_factor, population, seed
+        )
+    
     def simulate_future_impact(
         self,
         baseline_indicators: Dict[int, float],
@@ -52,10 +63,12 @@ class SimulationEngine:
         timeline_years: int,
         delay_months: int = 0,
         scale_factor: float = 1.0,
-        population: int = 100000
+        population: int = 100000,
+        seed: Optional[int] = None
     ) -> Tuple[Dict[int, Dict], int, float]:
         """
         Simulate future SDG indicators based on project parameters
+        Seeded calls are reproducible and served from the result cache
         
         Returns:
             - predicted_outcomes: Dict of SDG changes over time
@@ -63,101 +76,154 @@ class SimulationEngine:
             - confidence_score: Simulation confidence (0-1)
         """
         
-        # Initialize results
-        predicted_outcomes = {}
+        cache_key = None
+        if seed is not None:
+            cache_key = self._cache_key(
+                baseline_indicators, target_sdgs, scenario_type, funding_percentage,
+                timeline_years, delay_months, scale_factor, population, seed
+            )
+            hit, cached = simulation_cache.get(cache_key)
+            if hit:
+                return copy.deepcopy(cached)
+        
+        result = self._simulate_scenarios(
+            baseline_indicators, target_sdgs, [scenario_type], funding_percentage,
+            timeline_years, delay_months, scale_factor, population, np.random.default_rng(seed)
+        )[scenario_type]
+        
+        if cache_key is not None:
+            simulation_cache.put(cache_key, copy.deepcopy(result))
         
+        return result
+    
+    def _impact_factors(self, scenarios: List[str], funding_percentage: float,
+                        delay_months: int, scale_factor: float) -> np.ndarray:
+        """Combined impact factor per scenario"""
         # Base multiplier from scenario type
-        base_multiplier = self.SCENARIO_MULTIPLIERS.get(scenario_type, 0.5)
+        base_multiplier = np.array([self.SCENARIO_MULTIPLIERS.get(s, 0.5) for s in scenarios])
         
         # Adjust for funding and delays
         funding_factor = funding_percentage / 100.0
         delay_factor = max(0.2, 1.0 - (delay_months / 24.0))  # Max 2 years delay impact
         
-        # Combined impact factor
-        impact_factor = base_multiplier * funding_factor * delay_factor * scale_factor
-        
-        # Simulate each target SDG
-        for sdg in target_sdgs:
-            if sdg not in baseline_indicators:
-                continue
-                
-            baseline = baseline_indicators[sdg]
-            indicator_info = SDG_INDICATORS.get(sdg, {})
-            lower_is_better = indicator_info.get("lower_is_better", False)
-            
-            # Calculate yearly progression
-            yearly_changes = []
-            current_value = baseline
-            
-            for year in range(timeline_years + 1):
-                if year == 0:
-                    yearly_changes.append({"year": year, "value": current_value})
-                    continue
-                
-                # Calculate change (with diminishing returns over time)
-                year_factor = 1.0 - (year * 0.1)  # Diminishing returns
-                
-                if lower_is_better:
-                    # For negative indicators (poverty, emissions), reduce them
-                    annual_change = -baseline * 0.08 * impact_factor * year_factor
-                else:
-                    # For positive indicators (education, water access), increase them
-                    annual_change = baseline * 0.06 * impact_factor * year_factor
-                
-                # Add some realistic noise
-                noise = random.gauss(0, abs(annual_change) * 0.1)
-                current_value += annual_change + noise
-                
-                # Keep within realistic bounds
-                if indicator_info.get("unit") == "%":
-                    current_value = max(0, min(100, current_value))
-                elif lower_is_better:
-                    current_value = max(0, current_value)
-                
-                yearly_changes.append({
-                    "year": year,
-                    "value": round(current_value, 2),
-                    "change": round(current_value - baseline, 2)
-                })
-            
-            predicted_outcomes[sdg] = {
-                "sdg_name": SDG_GOALS[sdg],
-                "baseline": round(baseline, 2),
-                "final": round(current_value, 2),
-                "change": round(current_value - baseline, 2),
-                "unit": indicator_info.get("unit", ""),
-                "timeline": yearly_changes
-            }
+        return base_multiplier * funding_factor * delay_factor * scale_factor
+    
+    def _project_values(self, sdgs: List[int], baseline: np.ndarray, impact_factor: np.ndarray,
+                        timeline_years: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Yearly values of the given SDGs for every impact factor
+        
+        Args:
+            baseline: Baseline values, shape (..., SDGs), e.g. one row per twin
+            impact_factor: Shape (factors,)
         
-        # Simulate secondary impacts (cross-SDG effects)
-        secondary_impacts = self._calculate_secondary_impacts(
-            target_sdgs, 
-            baseline_indicators, 
+        Returns:
+            Array of shape (factors, ..., SDGs, years + 1); all rows share the
+            noise draws (one standard normal per SDG and year)
+        """
+        info = [SDG_INDICATORS.get(sdg, {}) for sdg in sdgs]
+        lower_is_better = np.array([i.get("lower_is_better", False) for i in info], dtype=bool)
+        is_percent = np.array([i.get("unit") == "%" for i in info], dtype=bool)
+        
+        # Annual change with diminishing returns over time: negative indicators
+        # (poverty, emissions) are reduced, positive ones increased
+        year_factor = 1.0 - np.arange(1, timeline_years + 1) * 0.1
+        rate = np.where(lower_is_better, -0.08, 0.06)
+        factor = np.asarray(impact_factor).reshape((-1,) + (1,) * (baseline.ndim + 1))
+        annual_change = factor * (baseline * rate)[..., None] * year_factor
+        
+        # Add some realistic noise
+        noise = np.abs(annual_change) * 0.1 * rng.standard_normal((len(sdgs), timeline_years))
+        steps = annual_change + noise
+        
+        # Accumulate year by year, keeping within realistic bounds
+        values = np.empty(steps.shape[:-1] + (timeline_years + 1,))
+        values[..., 0] = baseline
+        current = np.broadcast_to(baseline, steps.shape[:-1])
+        for year in range(timeline_years):
+            current = current + steps[..., year]
+            current = np.where(is_percent, np.clip(current, 0, 100),
+                               np.where(lower_is_better, np.maximum(current, 0), current))
+            values[..., year + 1] = current
+        
+        return values
+    
+    def _simulate_scenarios(
+        self,
+        baseline_indicators: Dict[int, float],
+        target_sdgs: List[int],
+        scenarios: List[str],
+        funding_percentage: float,
+        timeline_years: int,
+        delay_months: int,
+        scale_factor: float,
+        population: int,
+        rng: np.random.Generator
+    ) -> Dict[str, Tuple[Dict[int, Dict], int, float]]:
+        """
+        Simulate several scenarios as one (scenarios x SDGs x years) computation
+        
+        Scenarios share the noise draws, so each matches a single-scenario run
+        with the same seed.
+        """
+        impact_factor = self._impact_factors(scenarios, funding_percentage, delay_months, scale_factor)
+        
+        # Yearly values of the simulated target SDGs (scenarios x SDGs x years)
+        sdgs = [sdg for sdg in target_sdgs if sdg in baseline_indicators]
+        info = [SDG_INDICATORS.get(sdg, {}) for sdg in sdgs]
+        baseline = np.array([baseline_indicators[sdg] for sdg in sdgs], dtype=float)
+        values = self._project_values(sdgs, baseline, impact_factor, timeline_years, rng)
+        
+        secondary = self._calculate_secondary_impacts(
+            target_sdgs,
+            baseline_indicators,
             impact_factor * 0.3  # Secondary effects are weaker
         )
-        predicted_outcomes.update(secondary_impacts)
         
-        # Calculate affected population
         # More SDGs + higher impact = more people affected
-        impact_magnitude = abs(impact_factor)
         sdg_coverage = len(target_sdgs) / 17.0
-        affected_population = int(population * sdg_coverage * impact_magnitude)
         
-        # Confidence score based on funding, timeline, and scenario
-        confidence = self._calculate_confidence(
-            scenario_type, funding_percentage, timeline_years, delay_months
-        )
+        results = {}
+        for i, scenario_type in enumerate(scenarios):
+            predicted_outcomes = {}
+            for k, sdg in enumerate(sdgs):
+                timeline = values[i, k].tolist()
+                yearly_changes = [{"year": 0, "value": timeline[0]}] + [
+                    {
+                        "year": year,
+                        "value": round(value, 2),
+                        "change": round(value - timeline[0], 2)
+                    }
+                    for year, value in enumerate(timeline[1:], start=1)
+                ]
+                predicted_outcomes[sdg] = {
+                    "sdg_name": SDG_GOALS[sdg],
+                    "baseline": round(timeline[0], 2),
+                    "final": round(timeline[-1], 2),
+                    "change": round(timeline[-1] - timeline[0], 2),
+                    "unit": info[k].get("unit", ""),
+                    "timeline": yearly_changes
+                }
+            predicted_outcomes.update(secondary[i])
+            
+            affected_population = int(population * sdg_coverage * abs(float(impact_factor[i])))
+            
+            # Confidence score based on funding, timeline, and scenario
+            confidence = self._calculate_confidence(
+                scenario_type, funding_percentage, timeline_years, delay_months
+            )
+            
+            results[scenario_type] = (predicted_outcomes, affected_population, confidence)
         
-        return predicted_outcomes, affected_population, confidence
+        return results
     
     def _calculate_secondary_impacts(
         self, 
         primary_sdgs: List[int], 
         baseline_indicators: Dict[int, float],
-        impact_factor: float
-    ) -> Dict[int, Dict]:
-        """Calculate ripple effects on related SDGs"""
-        secondary = {}
+        impact_factor: np.ndarray
+    ) -> List[Dict[int, Dict]]:
+        """Calculate ripple effects on related SDGs, one dict per impact factor"""
         affected_secondary_sdgs = set()
         
         # Find all SDGs influenced by primary targets
@@ -167,37 +233,31 @@ class SimulationEngine:
         
         # Remove primary SDGs from secondary set
         affected_secondary_sdgs -= set(primary_sdgs)
-        
-        # Calculate secondary impacts
-        for sdg in affected_secondary_sdgs:
-            if sdg not in baseline_indicators:
-                continue
-                
-            baseline = baseline_indicators[sdg]
-            indicator_info = SDG_INDICATORS.get(sdg, {})
-            lower_is_better = indicator_info.get("lower_is_better", False)
-            
-            # Secondary impact is smaller
-            if lower_is_better:
-                change = -baseline * 0.03 * impact_factor
-            else:
-                change = baseline * 0.02 * impact_factor
-            
-            final_value = baseline + change
-            
-            if indicator_info.get("unit") == "%":
-                final_value = max(0, min(100, final_value))
-            
-            secondary[sdg] = {
-                "sdg_name": SDG_GOALS[sdg],
-                "baseline": round(baseline, 2),
-                "final": round(final_value, 2),
-                "change": round(change, 2),
-                "unit": indicator_info.get("unit", ""),
-                "is_secondary": True
+        sdgs = [sdg for sdg in affected_secondary_sdgs if sdg in baseline_indicators]
+        info = [SDG_INDICATORS.get(sdg, {}) for sdg in sdgs]
+        
+        baseline = np.array([baseline_indicators[sdg] for sdg in sdgs], dtype=float)
+        lower_is_better = np.array([i.get("lower_is_better", False) for i in info], dtype=bool)
+        is_percent = np.array([i.get("unit") == "%" for i in info], dtype=bool)
+        
+        # Secondary impact is smaller (impact factors x SDGs)
+        change = np.asarray(impact_factor)[:, None] * baseline * np.where(lower_is_better, -0.03, 0.02)
+        final_value = np.where(is_percent, np.clip(baseline + change, 0, 100), baseline + change)
+        
+        return [
+            {
+                sdg: {
+                    "sdg_name": SDG_GOALS[sdg],
+                    "baseline": round(float(baseline[k]), 2),
+                    "final": round(float(final_value[i, k]), 2),
+                    "change": round(float(change[i, k]), 2),
+                    "unit": info[k].get("unit", ""),
+                    "is_secondary": True
+                }
+                for k, sdg in enumerate(sdgs)
             }
-        
-        return secondary
+            for i in range(len(change))
+        ]
     
     def _calculate_confidence(
         self,
@@ -231,6 +291,161 @@ class SimulationEngine:
         confidence = base - timeline_penalty - delay_penalty + funding_bonus
         return round(max(0.3, min(0.95, confidence)), 2)
     
+    def simulate_twins(
+        self,
+        baseline_matrix: np.ndarray,
+        sdg_numbers: List[int],
+        populations: np.ndarray,
+        target_sdgs: List[int],
+        scenario_type: str,
+        funding_percentage: float,
+        timeline_years: int,
+        delay_months: int = 0,
+        scale_factor: float = 1.0,
+        seed: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulate one project for many digital twins in one pass
+        
+        Args:
+            baseline_matrix: (twins x SDGs) baselines, NaN where a twin has no value
+            sdg_numbers: SDG number of each column
+            populations: Population per twin
+        
+        Returns:
+            Dict of arrays: `values` (twins x target SDGs x years + 1),
+            `improvement` (% change in the better direction per target SDG),
+            `mean_improvement` and `affected_population` per twin, and the
+            scenario's `confidence`. All twins share the noise draws, so
+            differences between them come from their baselines.
+        """
+        sdgs = [sdg for sdg in dict.fromkeys(target_sdgs) if sdg in sdg_numbers]
+        columns = [sdg_numbers.index(sdg) for sdg in sdgs]
+        baseline = baseline_matrix[:, columns]
+        
+        impact_factor = self._impact_factors([scenario_type], funding_percentage, delay_months, scale_factor)
+        values = self._project_values(sdgs, baseline, impact_factor, timeline_years,
+                                      np.random.default_rng(seed))[0]
+        
+        direction = np.array([
+            -1.0 if SDG_INDICATORS.get(sdg, {}).get("lower_is_better", False) else 1.0 for sdg in sdgs
+        ])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            improvement = np.where(
+                baseline != 0, (values[..., -1] - baseline) / np.abs(baseline) * 100 * direction, 0.0
+            )
+        improvement = np.where(np.isnan(baseline), np.nan, improvement)
+        
+        # Mean over the SDGs each twin has values for
+        counts = np.sum(~np.isnan(improvement), axis=1)
+        mean_improvement = np.where(
+            counts > 0, np.nansum(improvement, axis=1) / np.maximum(counts, 1), np.nan
+        )
+        
+        sdg_coverage = len(target_sdgs) / 17.0
+        affected_population = (
+            np.asarray(populations, dtype=float) * sdg_coverage * abs(float(impact_factor[0]))
+        ).astype(np.int64)
+        
+        return {
+            'sdgs': sdgs,
+            'values': values,
+            'improvement': improvement,
+            'mean_improvement': mean_improvement,
+            'affected_population': affected_population,
+            'confidence': self._calculate_confidence(
+                scenario_type, funding_percentage, timeline_years, delay_months
+            )
+        }
+    
+    def rank_twins(
+        self,
+        rows: List[Tuple],
+        target_sdgs: List[int],
+        scenario_type: str,
+        funding_percentage: float,
+        timeline_years: int,
+        delay_months: int = 0,
+        scale_factor: float = 1.0,
+        rank_by: str = "mean_improvement",
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Simulate one project for many digital twins and rank them
+        
+        Args:
+            rows: (twin id, name, region, population, SDG number, baseline)
+                per twin indicator, as returned by database.twin_baseline_rows
+            rank_by: 'mean_improvement' or 'affected_population'
+        
+        Returns:
+            The ranking header and the ranked `twins` table
+        """
+        # Stack into a (twins x SDGs) matrix
+        twin_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        unique_ids, twin_index = np.unique(twin_ids, return_inverse=True)
+        sdg_numbers = list(range(1, 18))
+        baseline_matrix = np.full((len(unique_ids), len(sdg_numbers)), np.nan)
+        baseline_matrix[twin_index, [sdg_numbers.index(row[4]) for row in rows]] = [
+            np.nan if row[5] is None else row[5] for row in rows
+        ]
+        
+        twins = {}
+        for row in rows:
+            twins.setdefault(row[0], {"name": row[1], "region": row[2], "population": row[3] or 0})
+        populations = np.array([twins[twin_id]["population"] for twin_id in unique_ids.tolist()])
+        
+        result = self.simulate_twins(
+            baseline_matrix=baseline_matrix,
+            sdg_numbers=sdg_numbers,
+            populations=populations,
+            target_sdgs=target_sdgs,
+            scenario_type=scenario_type,
+            funding_percentage=funding_percentage,
+            timeline_years=timeline_years,
+            delay_months=delay_months,
+            scale_factor=scale_factor,
+            seed=seed
+        )
+        
+        # Rank (twins without any target SDG value go last)
+        score = np.nan_to_num(result[rank_by].astype(float), nan=-np.inf)
+        order = np.lexsort((unique_ids, -score))
+        
+        def value(x):
+            return None if np.isnan(x) else round(float(x), 2)
+        
+        table = []
+        for rank, i in enumerate(order.tolist(), start=1):
+            twin_id = int(unique_ids[i])
+            table.append({
+                "rank": rank,
+                "digital_twin_id": twin_id,
+                "name": twins[twin_id]["name"],
+                "region": twins[twin_id]["region"],
+                "population": twins[twin_id]["population"],
+                "affected_population": int(result["affected_population"][i]),
+                "mean_improvement": value(result["mean_improvement"][i]),
+                "sdgs": {
+                    sdg: {
+                        "baseline": value(result["values"][i, k, 0]),
+                        "final": value(result["values"][i, k, -1]),
+                        "improvement": value(result["improvement"][i, k])
+                    }
+                    for k, sdg in enumerate(result["sdgs"])
+                }
+            })
+        
+        return {
+            "target_sdgs": target_sdgs,
+            "scenario_type": scenario_type,
+            "timeline_years": timeline_years,
+            "rank_by": rank_by,
+            "confidence": result["confidence"],
+            "n_twins": len(table),
+            "twins": table
+        }
+    
     def compare_scenarios(
         self,
         baseline_indicators: Dict[int, float],
@@ -238,23 +453,42 @@ class SimulationEngine:
         scenarios: List[str],
         funding_percentage: float,
         timeline_years: int,
-        population: int
+        population: int,
+        seed: Optional[int] = None
     ) -> Dict[str, Dict]:
-        """Run multiple scenarios and compare results"""
+        """
+        Run multiple scenarios and compare results
+        All scenarios not already cached are simulated together in one pass
+        """
+        
+        outcomes = {}
+        cache_keys = {}
+        if seed is not None:
+            for scenario in scenarios:
+                cache_keys[scenario] = self._cache_key(
+                    baseline_indicators, target_sdgs, scenario, funding_percentage,
+                    timeline_years, 0, 1.0, population, seed
+                )
+                hit, cached = simulation_cache.get(cache_keys[scenario])
+                if hit:
+                    outcomes[scenario] = copy.deepcopy(cached)
+        
+        missing = list(dict.fromkeys(s for s in scenarios if s not in outcomes))
+        if missing:
+            simulated = self._simulate_scenarios(
+                baseline_indicators, target_sdgs, missing, funding_percentage,
+                timeline_years, 0, 1.0, population, np.random.default_rng(seed)
+            )
+            for scenario, result in simulated.items():
+                if scenario in cache_keys:
+                    simulation_cache.put(cache_keys[scenario], copy.deepcopy(result))
+            outcomes.update(simulated)
         
         results = {}
         for scenario in scenarios:
-            outcomes, affected_pop, confidence = self.simulate_future_impact(
-                baseline_indicators=baseline_indicators,
-                target_sdgs=target_sdgs,
-                scenario_type=scenario,
-                funding_percentage=funding_percentage,
-                timeline_years=timeline_years,
-                population=population
-            )
-            
+            predicted_outcomes, affected_pop, confidence = outcomes[scenario]
             results[scenario] = {
-                "outcomes": outcomes,
+                "outcomes": predicted_outcomes,
                 "affected_population": affected_pop,
                 "confidence": confidence
             }
@@ -0,0 +1,112 @@
+"""
+Monte Carlo Ensemble Simulation
+Runs many stochastic realizations as one batched array computation and
+summarizes their spread as percentile bands
+"""
+from typing import Dict, Iterator, List
+import numpy as np
+from sdg_graph import CompiledSDGGraph
+from simulation_core import SimulationState
+from simulation_vectorized import VectorizedSimulationEngine
+
+
+def net_progress(graph: CompiledSDGGraph, target_sdgs: List[int],
+                 trajectory: np.ndarray) -> np.ndarray:
+    """
+    Net SDG progress per run: mean % change of the targeted indicators
+    
+    Args:
+        trajectory: Array of shape (years + 1, runs, indicators)
+    
+    Returns:
+        Array of shape (runs,)
+    """
+    positions = np.unique(graph.target_positions(target_sdgs))
+    if len(positions) == 0:
+        return np.zeros(trajectory.shape[1])
+    
+    baseline = trajectory[0][:, positions]
+    final = trajectory[-1][:, positions]
+    
+    safe_baseline = np.where(baseline > 0, baseline, 1.0)
+    pct_change = np.where(baseline > 0, (final - baseline) / safe_baseline * 100, 0.0)
+    
+    return pct_change.mean(axis=1)
+
+
+class MonteCarloEnsemble:
+    """
+    Batched ensemble over the randomness of a simulation
+    (infrastructure readiness and direct impact draws)
+    """
+    
+    PERCENTILES = (5, 50, 95)
+    
+    def __init__(self, engine: VectorizedSimulationEngine, n_runs: int):
+        self.engine = engine
+        self.n_runs = n_runs
+    
+    def net_progress(self, trajectory: np.ndarray) -> np.ndarray:
+        """Net SDG progress per run, shape (n_runs,)"""
+        return net_progress(self.engine.graph, self.engine.target_sdgs, trajectory)
+    
+    def year_bands(self, year: int, values: np.ndarray) -> Dict:
+        """Percentile bands for every indicator from one year's (runs x indicators) values"""
+        bands = np.percentile(values, self.PERCENTILES, axis=0)  # (percentiles, indicators)
+        
+        return {
+            'year': year,
+            'indicators': {
+                key: {
+                    f'p{p}': float(bands[i, pos])
+                    for i, p in enumerate(self.PERCENTILES)
+                }
+                for pos, key in enumerate(self.engine.graph.keys)
+            }
+        }
+    
+    def yearly_bands(self, trajectory: np.ndarray) -> List[Dict]:
+        """Per-year percentile bands for every indicator"""
+        return [self.year_bands(year, trajectory[year]) for year in range(trajectory.shape[0])]
+    
+    def progress_distribution(self, net_progress: np.ndarray, bins: int = 20) -> Dict:
+        """Summary statistics and histogram of net SDG progress"""
+        counts, edges = np.histogram(net_progress, bins=bins)
+        percentiles = np.percentile(net_progress, self.PERCENTILES)
+        
+        distribution = {
+            'mean': float(net_progress.mean()),
+            'std': float(net_progress.std()),
+            'histogram': {
+                'counts': counts.tolist(),
+                'bin_edges': edges.tolist()
+            }
+        }
+        distribution.update({
+            f'p{p}': float(value) for p, value in zip(self.PERCENTILES, percentiles)
+        })
+        return distribution
+    
+    def run(self, baseline_state: SimulationState = None) -> Dict:
+        """Run the ensemble and summarize it"""
+        trajectory = self.engine.run_batch(self.n_runs, baseline_state)
+        net_progress = self.net_progress(trajectory)
+        
+        return {
+            'n_runs': self.n_runs,
+            'yearly_bands': self.yearly_bands(trajectory),
+            'net_sdg_progress': self.progress_distribution(net_progress)
+        }
+    
+    def stream(self, baseline_state: SimulationState = None) -> Iterator[Dict]:
+        """
+        Run the ensemble, yielding each year's bands as soon as the year is
+        simulated and the net progress distribution last
+        """
+        for year, values in self.engine.iter_batch(self.n_runs, baseline_state):
+            if year == 0:
+                baseline = values
+            yield self.year_bands(year, values)
+        
+        net_progress = self.net_progress(np.stack([baseline, values]))
+        yield {'n_runs': self.n_runs, 'net_sdg_progress': self.progress_distribution(net_progress)}
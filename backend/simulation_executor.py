@@ -0,0 +1,340 @@
+"""
+Off-Loop Execution
+Keeps the async routes' event loop free: CPU-bound engine work, streamed
+or not, runs in the bounded process pool, blocking database work in a thread
+pool, and engine work that drives the process pool itself in threads of its own
+"""
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from multiprocessing.managers import SyncManager
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import multiprocessing
+import os
+import threading
+from sdg_graph import get_compiled_graph
+from simulation_core import TimeStepSimulationEngine
+from simulation_vectorized import VectorizedSimulationEngine
+from simulation_worklist import WorklistSimulationEngine
+from simulation_ensemble import MonteCarloEnsemble
+from simulation_goal_seek import GoalSeekSolver
+from simulation_explainer import SimulationExplainer
+from simulation_scenarios import ScenarioComparison
+from simulation_cache import simulation_cache
+from simulation_sweep import POOL_WORKERS, get_process_pool
+
+
+# Threads for blocking database work (DB_THREADS)
+DB_THREADS = int(os.getenv("DB_THREADS", "8"))
+
+# Engine jobs queued or running before new ones are refused
+# (SIMULATION_QUEUE_DEPTH, default four per worker process)
+QUEUE_DEPTH = int(os.getenv("SIMULATION_QUEUE_DEPTH", "0")) or 4 * POOL_WORKERS
+
+# Seconds pool workers wait for each other when reporting cache counters
+CACHE_STATS_TIMEOUT = 2.0
+
+# Engine implementations selectable per request
+ENGINE_MODES = {
+    'standard': TimeStepSimulationEngine,
+    'vectorized': VectorizedSimulationEngine,
+    'worklist': WorklistSimulationEngine,
+}
+
+
+class QueueFull(Exception):
+    """Raised when QUEUE_DEPTH engine jobs are already queued or running"""
+
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_engine_pool: Optional[ThreadPoolExecutor] = None
+_stream_pool: Optional[ThreadPoolExecutor] = None
+_manager: Optional[SyncManager] = None
+_queued_jobs = 0  # Only touched from the event loop thread
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Process-wide thread pool for blocking I/O, started on first use"""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix='db')
+    return _thread_pool
+
+
+async def run_blocking(function, *args, **kwargs):
+    """Run a blocking call (e.g. SQLAlchemy queries) in the thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_thread_pool(), partial(function, *args, **kwargs))
+
+
+def get_stream_pool() -> ThreadPoolExecutor:
+    """Threads waiting on streamed runs' items, one per queue slot (they only wait)"""
+    global _stream_pool
+    if _stream_pool is None:
+        _stream_pool = ThreadPoolExecutor(max_workers=QUEUE_DEPTH, thread_name_prefix='stream')
+    return _stream_pool
+
+
+def get_manager() -> SyncManager:
+    """Manager process whose queues carry streamed items back from the pool, started on first use"""
+    global _manager
+    if _manager is None:
+        _manager = multiprocessing.Manager()
+    return _manager
+
+
+def _reserve():
+    global _queued_jobs
+    if _queued_jobs >= QUEUE_DEPTH:
+        raise QueueFull(f'{_queued_jobs} simulations are already queued')
+    _queued_jobs += 1
+
+
+def _release():
+    global _queued_jobs
+    _queued_jobs -= 1
+
+
+def get_engine_pool() -> ThreadPoolExecutor:
+    """Threads driving sweeps and sensitivity analyses, one per worker process of the CPU pool"""
+    global _engine_pool
+    if _engine_pool is None:
+        _engine_pool = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix='engine')
+    return _engine_pool
+
+
+def _submit(pool: Executor, function, *args, **kwargs) -> Future:
+    """
+    Submit a call to a pool, holding a queue slot until the call itself is
+    done, not just until its awaiting request goes away
+    """
+    _reserve()
+    try:
+        future = pool.submit(function, *args, **kwargs)
+    except BaseException:
+        _release()
+        raise
+    _release_when_done(future)
+    return future
+
+
+def _release_when_done(future: Future):
+    loop = asyncio.get_running_loop()
+    
+    def finished(future):
+        if not loop.is_closed():  # An abandoned run may outlive the loop at shutdown
+            loop.call_soon_threadsafe(_release)
+    
+    future.add_done_callback(finished)
+
+
+async def run_engine(function, *args, **kwargs):
+    """
+    Run engine work that fans out to the process pool itself in an engine
+    thread, away from the database threads
+    
+    Sweeps and sensitivity designs below POOL_THRESHOLD are computed in that
+    thread. Either way the call holds a queue slot: raises QueueFull instead
+    of queueing beyond QUEUE_DEPTH jobs.
+    """
+    return await asyncio.wrap_future(_submit(get_engine_pool(), function, *args, **kwargs))
+
+
+async def run_cpu(function, *args, **kwargs):
+    """
+    Run a CPU-bound, picklable call in the process pool
+    Raises QueueFull instead of queueing beyond QUEUE_DEPTH jobs
+    """
+    return await asyncio.wrap_future(_submit(get_process_pool(), function, *args, **kwargs))
+
+
+def _produce(function, items, stop, args, kwargs):
+    """Run a generator in a worker process, passing its items back through a manager queue"""
+    try:
+        for item in function(*args, **kwargs):
+            items.put((True, item))
+            if stop.is_set():
+                break
+        items.put((False, None))
+    except Exception as e:
+        items.put((False, e))
+
+
+def stream_cpu(function, *args, **kwargs) -> AsyncIterator:
+    """
+    Start a picklable generator in the process pool and return an async
+    iterator over its items as they are produced
+    
+    Raises QueueFull right away (before any response is sent) instead of
+    queueing beyond QUEUE_DEPTH jobs. The generator is abandoned at its next
+    item once the returned iterator is closed, e.g. when the client disconnects.
+    """
+    manager = get_manager()
+    items, stop = manager.Queue(), manager.Event()
+    future = _submit(get_process_pool(), _produce, function, items, stop, args, kwargs)
+    
+    def failed(future):
+        if future.exception() is not None:
+            # The worker died before reporting, so wake the consumer here
+            items.put((False, future.exception()))
+    
+    future.add_done_callback(failed)
+    loop = asyncio.get_running_loop()
+    
+    async def consume():
+        try:
+            while True:
+                more, item = await loop.run_in_executor(get_stream_pool(), items.get)
+                if not more:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            stop.set()  # One quick call to the manager, so not worth a thread
+    
+    return consume()
+
+
+async def pool_cache_stats() -> List[Dict]:
+    """
+    Cache counters of every pool worker, one entry per process
+    
+    One task per worker, held at a barrier so no worker takes two; workers
+    still busy with simulations after CACHE_STATS_TIMEOUT are left out.
+    """
+    barrier = get_manager().Barrier(POOL_WORKERS, timeout=CACHE_STATS_TIMEOUT)
+    pool = get_process_pool()
+    reports = await asyncio.gather(*[
+        asyncio.wrap_future(pool.submit(cache_stats_task, barrier)) for _ in range(POOL_WORKERS)
+    ])
+    return list(dict(reports).values())
+
+
+# ==================== Worker tasks ====================
+# Module-level functions with plain arguments and results, so they pickle
+
+def cache_stats_task(barrier) -> Tuple[int, Dict]:
+    """This worker's process id and cache counters"""
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass  # Timed out; a worker reporting twice is deduplicated by process id
+    return os.getpid(), simulation_cache.stats()
+
+
+def simulate_task(engine_mode: str, target_sdgs: List[int], scenario_type: str,
+                  funding_percentage: float, timeline_years: int, delay_months: int,
+                  seed: Optional[int], engine_options: Dict, checkpoint: Optional[Dict],
+                  fields: Optional[List[str]]) -> Dict:
+    """One advanced simulation with its summary and end-of-run checkpoint"""
+    *yearly_states, result = simulate_stream(
+        engine_mode, target_sdgs, scenario_type, funding_percentage, timeline_years,
+        delay_months, seed, engine_options, checkpoint, fields
+    )
+    return {'yearly_states': yearly_states, **result}
+
+
+def simulate_stream(engine_mode: str, target_sdgs: List[int], scenario_type: str,
+                    funding_percentage: float, timeline_years: int, delay_months: int,
+                    seed: Optional[int], engine_options: Dict, checkpoint: Optional[Dict],
+                    fields: Optional[List[str]]) -> Iterator[Dict]:
+    """
+    simulate_task, yielding each year's state as soon as it is simulated and
+    then the summary and checkpoint
+    """
+    graph = get_compiled_graph()
+    engine = ENGINE_MODES[engine_mode](
+        graph=graph,
+        target_sdgs=target_sdgs,
+        scenario_type=scenario_type,
+        funding_percentage=funding_percentage,
+        timeline_years=timeline_years,
+        delay_months=delay_months,
+        seed=seed,
+        **engine_options
+    )
+    for state in engine.iter_simulation(checkpoint=checkpoint):
+        yield {'year': state.year, 'indicators': dict(state.indicators)}
+    
+    explainer = SimulationExplainer(
+        graph=graph,
+        states=engine.states,
+        constraint_engine=engine.constraint_engine,
+        target_sdgs=target_sdgs
+    )
+    
+    yield {
+        'summary': explainer.generate_summary(fields),
+        'infrastructure_factor': engine.constraint_engine.get_infrastructure_factor(),
+        'checkpoint_key': engine.checkpoint_key(),
+        'checkpoint': engine.export_checkpoint(),
+        'resumed_from_year': engine.resumed_from_year
+    }
+
+
+def scenarios_task(target_sdgs: List[int], timeline_years: int, seed: Optional[int],
+                   variants: Optional[List[Dict]] = None) -> List[Dict]:
+    """Scenario variants of one project (every scenario type by default), with narratives"""
+    return ScenarioComparison(target_sdgs, timeline_years, variants, seed).run()
+
+
+def ensemble_task(target_sdgs: List[int], scenario_type: str, funding_percentage: float,
+                  timeline_years: int, delay_months: int, seed: Optional[int], n_runs: int) -> Dict:
+    """Monte Carlo ensemble bands and the fixed effectiveness"""
+    ensemble = _ensemble(target_sdgs, scenario_type, funding_percentage, timeline_years,
+                         delay_months, seed, n_runs)
+    return {
+        'effectiveness_fixed': ensemble.engine.constraint_engine.get_fixed_effectiveness(),
+        **ensemble.run()
+    }
+
+
+def ensemble_stream(target_sdgs: List[int], scenario_type: str, funding_percentage: float,
+                    timeline_years: int, delay_months: int, seed: Optional[int], n_runs: int) -> Iterator[Dict]:
+    """
+    ensemble_task, yielding each year's bands as soon as the year is
+    simulated and then the net progress distribution
+    """
+    ensemble = _ensemble(target_sdgs, scenario_type, funding_percentage, timeline_years,
+                         delay_months, seed, n_runs)
+    for item in ensemble.stream():
+        if 'year' in item:
+            yield item
+        else:
+            yield {'effectiveness_fixed': ensemble.engine.constraint_engine.get_fixed_effectiveness(), **item}
+
+
+def _ensemble(target_sdgs: List[int], scenario_type: str, funding_percentage: float,
+              timeline_years: int, delay_months: int, seed: Optional[int], n_runs: int) -> MonteCarloEnsemble:
+    engine = VectorizedSimulationEngine(
+        graph=get_compiled_graph(),
+        target_sdgs=target_sdgs,
+        scenario_type=scenario_type,
+        funding_percentage=funding_percentage,
+        timeline_years=timeline_years,
+        delay_months=delay_months,
+        seed=seed
+    )
+    return MonteCarloEnsemble(engine, n_runs)
+
+
+def exact_trajectory_task(target_sdgs: List[int], scenario_type: str, funding_percentage: float,
+                          timeline_years: int, delay_months: int, seed: Optional[int]):
+    """Trajectory values of the exact scalar engine, shape (years + 1, indicators)"""
+    engine = TimeStepSimulationEngine(
+        graph=get_compiled_graph(),
+        target_sdgs=target_sdgs,
+        scenario_type=scenario_type,
+        funding_percentage=funding_percentage,
+        timeline_years=timeline_years,
+        delay_months=delay_months,
+        seed=seed
+    )
+    engine.run_simulation()
+    return engine.trajectory.values
+
+
+def goal_seek_task(**parameters) -> Dict:
+    """Solve a goal-seek problem (raises ValueError for invalid parameters)"""
+    return GoalSeekSolver(**parameters).solve()
@@ -2,23 +2,85 @@
 Explainability Layer for SDG Simulations
 Generates human-readable explanations for simulation results
 """
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 import numpy as np
 from simulation_core import SimulationState, TimeStepSimulationEngine, ConstraintEngine
-from sdg_graph import SDGIndicatorGraph
+from sdg_graph import SDGIndicatorGraph, CompiledSDGGraph
+
+
+# Trend codes of the analysis table, in increasing order
+TRENDS = ('significant_decrease', 'moderate_decrease', 'stable',
+          'moderate_increase', 'significant_increase')
+STABLE = TRENDS.index('stable')
+
+# Optional summary sections, generated only when asked for
+SUMMARY_SECTIONS = ('narrative', 'bottlenecks', 'risks', 'recommendations')
+
+
+class AnalysisTable:
+    """
+    Per-indicator change analysis as parallel arrays in graph order
+    Computed once per explainer from the first and last state vectors
+    """
+    
+    def __init__(self, baseline: np.ndarray, final: np.ndarray):
+        self.baseline = baseline
+        self.final = final
+        self.change = final - baseline
+        
+        safe_baseline = np.where(baseline > 0, baseline, 1.0)
+        self.pct_change = np.where(baseline > 0, self.change / safe_baseline * 100, 0.0)
+        
+        # Trend code: index into TRENDS (thresholds at -5, -1, +1 and +5 %)
+        pct = self.pct_change
+        self.trend = (
+            (pct >= -5).astype(np.int8) + (pct >= -1) + (pct > 1) + (pct > 5)
+        )
+    
+    def declining(self) -> np.ndarray:
+        """Positions of indicators with a decreasing trend"""
+        return np.flatnonzero(self.trend < STABLE)
 
 
 class SimulationExplainer:
     """
     Analyzes simulation results and generates natural language explanations
+    The analysis table and the derived sections are computed once and reused
     """
     
-    def __init__(self, graph: SDGIndicatorGraph, states: List[SimulationState],
+    def __init__(self, graph: Union[SDGIndicatorGraph, CompiledSDGGraph],
+                 states: List[SimulationState],
                  constraint_engine: ConstraintEngine, target_sdgs: List[int]):
+        if not isinstance(graph, CompiledSDGGraph):
+            graph = graph.compile()
         self.graph = graph
         self.states = states
         self.constraint_engine = constraint_engine
         self.target_sdgs = target_sdgs
+        self._targets = graph.target_positions(target_sdgs)
+        
+        # Memoized analysis
+        self._table: AnalysisTable = None
+        self._analysis: Dict[int, Dict] = {}
+        self._bottlenecks: List[Tuple[str, str]] = None
+    
+    def _state_vector(self, state: SimulationState) -> np.ndarray:
+        row = getattr(state.indicators, 'row', None)  # Trajectory-backed states
+        if row is not None:
+            return row
+        return self.graph.to_vector(state.indicators)
+    
+    def analysis_table(self) -> AnalysisTable:
+        """Vectorized analysis of the whole simulation period (computed once)"""
+        if self._table is None:
+            self._table = AnalysisTable(
+                self._state_vector(self.states[0]), self._state_vector(self.states[-1])
+            )
+        return self._table
+    
+    def target_positions(self) -> np.ndarray:
+        """Positions of the targeted indicators, in SDG order"""
+        return self._targets
     
     def analyze_changes(self) -> Dict[str, Dict]:
         """
@@ -27,80 +89,50 @@ class SimulationExplainer:
         Returns:
             Dict of indicator -> {change, pct_change, trend}
         """
-        baseline = self.states[0]
-        final = self.states[-1]
-        
-        analysis = {}
-        
-        for indicator in baseline.indicators.keys():
-            baseline_val = baseline.indicators[indicator]
-            final_val = final.indicators[indicator]
-            
-            change = final_val - baseline_val
-            pct_change = (change / baseline_val * 100) if baseline_val > 0 else 0
-            
-            # Determine trend
-            if pct_change > 5:
-                trend = 'significant_increase'
-            elif pct_change > 1:
-                trend = 'moderate_increase'
-            elif pct_change < -5:
-                trend = 'significant_decrease'
-            elif pct_change < -1:
-                trend = 'moderate_decrease'
-            else:
-                trend = 'stable'
-            
-            analysis[indicator] = {
-                'baseline': baseline_val,
-                'final': final_val,
-                'change': change,
-                'pct_change': pct_change,
-                'trend': trend,
-                'indicator_info': self.graph.get_indicator_info(indicator)
+        return {indicator: self._entry(pos) for pos, indicator in enumerate(self.graph.keys)}
+    
+    def _entry(self, pos: int) -> Dict:
+        """Analysis dict of one indicator, built from the table on first use"""
+        entry = self._analysis.get(pos)
+        if entry is None:
+            table = self.analysis_table()
+            indicator = self.graph.keys[pos]
+            entry = self._analysis[pos] = {
+                'baseline': float(table.baseline[pos]),
+                'final': float(table.final[pos]),
+                'change': float(table.change[pos]),
+                'pct_change': float(table.pct_change[pos]),
+                'trend': TRENDS[table.trend[pos]],
+                'indicator_info': self.graph.indicators[indicator]
             }
-        
-        return analysis
+        return entry
     
     def identify_top_changes(self, n: int = 5) -> List[Tuple[str, Dict]]:
         """Identify the top N indicators with the most significant changes"""
-        analysis = self.analyze_changes()
-        
-        # Sort by absolute percent change
-        sorted_indicators = sorted(
-            analysis.items(),
-            key=lambda x: abs(x[1]['pct_change']),
-            reverse=True
-        )
+        # Sort by absolute percent change (stable, like sorted())
+        order = np.argsort(-np.abs(self.analysis_table().pct_change), kind='stable')
         
-        return sorted_indicators[:n]
+        return [(self.graph.keys[pos], self._entry(pos)) for pos in order[:n]]
     
     def identify_bottlenecks(self) -> List[Tuple[str, str]]:
         """
         Identify indicators that didn't improve much despite targeting
         These are likely bottlenecks
         """
-        analysis = self.analyze_changes()
-        bottlenecks = []
-        
-        # Check target SDG indicators
-        for sdg_num in self.target_sdgs:
-            sdg_indicators = self.graph.get_sdg_indicators(sdg_num)
+        if self._bottlenecks is None:
+            table = self.analysis_table()
             
-            for indicator in sdg_indicators:
-                if indicator in analysis:
-                    data = analysis[indicator]
-                    
-                    # If targeted but didn't improve much
-                    if data['pct_change'] < 3:  # Less than 3% improvement
-                        reason = self._diagnose_bottleneck(indicator, analysis)
-                        bottlenecks.append((indicator, reason))
-        
-        return bottlenecks
+            # Targeted indicators that didn't improve much (less than 3%)
+            self._bottlenecks = [
+                (self.graph.keys[pos], self._diagnose_bottleneck(self.graph.keys[pos]))
+                for pos in self.target_positions()
+                if table.pct_change[pos] < 3
+            ]
+        return self._bottlenecks
     
-    def _diagnose_bottleneck(self, indicator: str, analysis: Dict) -> str:
+    def _diagnose_bottleneck(self, indicator: str) -> str:
         """Diagnose why an indicator didn't improve"""
-        data = analysis[indicator]
+        data = self._entry(self.graph.position[indicator])
         
         # Check if already near maximum
         indicator_info = data['indicator_info']
@@ -111,11 +143,12 @@ class SimulationExplainer:
         influences_from = self.graph.get_influences_from(indicator)
         if influences_from:
             # Check if influencing indicators also didn't improve
-            weak_supports = []
-            for influence in influences_from:
-                if influence.target in analysis:
-                    if analysis[influence.target]['pct_change'] < 2:
-                        weak_supports.append(self.graph.get_indicator_info(influence.target)['name'])
+            pct_change = self.analysis_table().pct_change
+            weak_supports = [
+                self.graph.indicators[influence.target]['name']
+                for influence in influences_from
+                if pct_change[self.graph.position[influence.target]] < 2
+            ]
             
             if weak_supports:
                 return f"Limited by weak progress in: {', '.join(weak_supports[:2])}"
@@ -129,22 +162,21 @@ class SimulationExplainer:
     
     def identify_risk_factors(self) -> List[str]:
         """Identify risks and vulnerabilities in the simulation"""
-        analysis = self.analyze_changes()
+        table = self.analysis_table()
         risks = []
         
         # Check for negative trends
-        for indicator, data in analysis.items():
-            if data['trend'] in ['significant_decrease', 'moderate_decrease']:
-                indicator_name = data['indicator_info']['name']
-                risks.append(f"⚠️ {indicator_name} declined by {abs(data['pct_change']):.1f}% - requires intervention")
+        for pos in table.declining():
+            indicator_name = self.graph.indicators[self.graph.keys[pos]]['name']
+            risks.append(f"⚠️ {indicator_name} declined by {abs(table.pct_change[pos]):.1f}% - requires intervention")
         
         # Check for stagnation in critical areas
         critical_indicators = ['health_index', 'poverty_rate', 'water_access', 'food_security']
+        targeted = set(self.target_positions().tolist())
         for indicator in critical_indicators:
-            if indicator in analysis:
-                data = analysis[indicator]
-                if data['trend'] == 'stable' and indicator in [self.graph.get_sdg_indicators(sdg) for sdg in self.target_sdgs]:
-                    risks.append(f"⚠️ {data['indicator_info']['name']} stagnant despite targeting")
+            pos = self.graph.position.get(indicator)
+            if pos is not None and table.trend[pos] == STABLE and pos in targeted:
+                risks.append(f"⚠️ {self.graph.indicators[indicator]['name']} stagnant despite targeting")
         
         # Check for low effectiveness
         effectiveness = self.constraint_engine.get_total_effectiveness()
@@ -160,35 +192,33 @@ class SimulationExplainer:
     
     def generate_recommendations(self) -> List[str]:
         """Generate actionable recommendations based on simulation results"""
-        analysis = self.analyze_changes()
+        table = self.analysis_table()
         recommendations = []
         
         # Recommend focusing on bottlenecks
         bottlenecks = self.identify_bottlenecks()
         if bottlenecks:
-            bottleneck_names = [self.graph.get_indicator_info(b[0])['name'] for b, _ in bottlenecks[:2]]
+            bottleneck_names = [self.graph.get_indicator_info(ind)['name'] for ind, _ in bottlenecks[:2]]
             recommendations.append(
                 f"🎯 Focus additional resources on: {', '.join(bottleneck_names)}"
             )
         
         # Recommend addressing negative trends
-        declining = [ind for ind, data in analysis.items() 
-                    if data['trend'] in ['significant_decrease', 'moderate_decrease']]
-        if declining:
-            declining_names = [self.graph.get_indicator_info(d)['name'] for d in declining[:2]]
+        declining = table.declining()
+        if len(declining):
+            declining_names = [self.graph.indicators[self.graph.keys[pos]]['name'] for pos in declining[:2]]
             recommendations.append(
                 f"🚨 Urgent: Address declining trends in {', '.join(declining_names)}"
             )
         
         # Recommend leveraging strong performers
-        strong_performers = [(ind, data) for ind, data in analysis.items() 
-                            if data['pct_change'] > 10]
-        if strong_performers:
-            top_performer = strong_performers[0]
-            performer_name = top_performer[1]['indicator_info']['name']
+        strong_performers = np.flatnonzero(table.pct_change > 10)
+        if len(strong_performers):
+            top_performer = self.graph.keys[strong_performers[0]]
+            performer_name = self.graph.indicators[top_performer]['name']
             
             # Find what this influences
-            influences = self.graph.get_influences_from(top_performer[0])
+            influences = self.graph.get_influences_from(top_performer)
             if influences:
                 target_names = [self.graph.get_indicator_info(inf.target)['name'] for inf in influences[:2]]
                 recommendations.append(
@@ -225,9 +255,7 @@ class SimulationExplainer:
             confidence *= 0.85
         
         # Reduce confidence for high volatility
-        analysis = self.analyze_changes()
-        volatility_count = sum(1 for data in analysis.values() 
-                              if abs(data['pct_change']) > 20)
+        volatility_count = int(np.count_nonzero(np.abs(self.analysis_table().pct_change) > 20))
         if volatility_count > 5:
             confidence *= 0.8
         
@@ -237,32 +265,33 @@ class SimulationExplainer:
         
         return max(0.5, min(1.0, confidence))
     
-    def generate_summary(self) -> Dict:
+    def calculate_net_progress(self) -> float:
+        """Mean % change of the targeted indicators"""
+        target_changes = self.analysis_table().pct_change[self.target_positions()]
+        return float(target_changes.mean()) if len(target_changes) else 0
+    
+    def generate_summary(self, fields: Optional[Iterable[str]] = None) -> Dict:
         """
-        Generate a complete summary with human-readable explanations
+        Generate a summary with human-readable explanations
+        
+        Args:
+            fields: Optional sections to include (see SUMMARY_SECTIONS), all by
+                default. Net progress, confidence, top changes and effectiveness
+                are always included.
         """
-        analysis = self.analyze_changes()
+        sections = set(SUMMARY_SECTIONS if fields is None else fields)
         top_changes = self.identify_top_changes(5)
-        bottlenecks = self.identify_bottlenecks()
-        risks = self.identify_risk_factors()
-        recommendations = self.generate_recommendations()
-        confidence = self.calculate_confidence_score()
+        net_progress = self.calculate_net_progress()
         
-        # Calculate net SDG progress
-        target_indicators = []
-        for sdg_num in self.target_sdgs:
-            target_indicators.extend(self.graph.get_sdg_indicators(sdg_num))
-        
-        target_changes = [analysis[ind]['pct_change'] for ind in target_indicators if ind in analysis]
-        net_progress = np.mean(target_changes) if target_changes else 0
-        
-        # Generate narrative summary
-        narrative = self._generate_narrative(top_changes, bottlenecks, net_progress)
+        summary = {}
+        if 'narrative' in sections:
+            summary['narrative'] = self._generate_narrative(
+                top_changes, self.identify_bottlenecks(), net_progress
+            )
         
-        return {
-            'narrative': narrative,
+        summary.update({
             'net_sdg_progress': net_progress,
-            'confidence_score': confidence,
+            'confidence_score': self.calculate_confidence_score(),
             'top_changes': [
                 {
                     'indicator': self.graph.get_indicator_info(ind)['name'],
@@ -272,18 +301,24 @@ class SimulationExplainer:
                     'final': data['final']
                 }
                 for ind, data in top_changes
-            ],
-            'bottlenecks': [
+            ]
+        })
+        
+        if 'bottlenecks' in sections:
+            summary['bottlenecks'] = [
                 {
                     'indicator': self.graph.get_indicator_info(ind)['name'],
                     'reason': reason
                 }
-                for ind, reason in bottlenecks
-            ],
-            'risks': risks,
-            'recommendations': recommendations,
-            'effectiveness': self.constraint_engine.get_total_effectiveness()
-        }
+                for ind, reason in self.identify_bottlenecks()
+            ]
+        if 'risks' in sections:
+            summary['risks'] = self.identify_risk_factors()
+        if 'recommendations' in sections:
+            summary['recommendations'] = self.generate_recommendations()
+        
+        summary['effectiveness'] = self.constraint_engine.get_total_effectiveness()
+        return summary
     
     def _generate_narrative(self, top_changes: List, bottlenecks: List, 
                            net_progress: float) -> str:
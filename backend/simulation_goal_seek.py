@@ -0,0 +1,179 @@
+"""
+Goal-Seeking Solver
+Finds the least funding (or the most delay) that still reaches a progress target
+"""
+from typing import Dict, List, Optional
+import numpy as np
+from sdg_graph import get_compiled_graph
+from simulation_core import ConstraintEngine, TimeStepSimulationEngine
+from simulation_vectorized import VectorizedSimulationEngine
+from simulation_ensemble import net_progress
+
+
+class GoalSeekSolver:
+    """
+    Bracketing search over one simulation parameter
+    
+    Each iteration evaluates a whole grid of candidate values as one batched
+    run and narrows the search to the cell where the target is first missed.
+    Every candidate shares the same random draws (common random numbers), so
+    the metric is a deterministic function of the parameter and the search
+    converges in a few engine passes.
+    """
+    
+    # parameter -> (default lower bound, default upper bound, goal)
+    SEARCH_PARAMETERS = {
+        'funding_percentage': (0.0, 100.0, 'minimize'),
+        'delay_months': (0, 60, 'maximize'),
+    }
+    
+    def __init__(self, target_sdgs: List[int], scenario_type: str, parameter: str,
+                 target_value: float, metric: str = 'net_sdg_progress',
+                 funding_percentage: float = 100.0, timeline_years: int = 5,
+                 delay_months: int = 0, lower: Optional[float] = None,
+                 upper: Optional[float] = None, seed: Optional[int] = None,
+                 points_per_iteration: int = 16, tolerance: float = 0.1,
+                 max_iterations: int = 10):
+        if parameter not in self.SEARCH_PARAMETERS:
+            raise ValueError(f'Cannot search over {parameter}')
+        
+        self.graph = get_compiled_graph()
+        if metric != 'net_sdg_progress' and metric not in self.graph.position:
+            raise ValueError(f'Unknown metric {metric}')
+        
+        default_lower, default_upper, self.goal = self.SEARCH_PARAMETERS[parameter]
+        self.lower = default_lower if lower is None else lower
+        self.upper = default_upper if upper is None else upper
+        if self.lower >= self.upper:
+            raise ValueError('lower bound must be below the upper bound')
+        
+        self.target_sdgs = target_sdgs
+        self.scenario_type = scenario_type
+        self.parameter = parameter
+        self.target_value = target_value
+        self.metric = metric
+        self.parameters = {
+            'funding_percentage': funding_percentage,
+            'timeline_years': timeline_years,
+            'delay_months': delay_months
+        }
+        
+        # A drawn seed keeps the search reproducible when none is given
+        self.seed = seed if seed is not None else int(np.random.default_rng().integers(2**31))
+        self.points_per_iteration = points_per_iteration
+        self.tolerance = 1.0 if parameter == 'delay_months' else tolerance
+        self.max_iterations = max_iterations
+        
+        self.evaluations = 0
+        self.engine_passes = 0
+    
+    def _candidates(self, lower: float, upper: float) -> np.ndarray:
+        values = np.linspace(lower, upper, self.points_per_iteration)
+        if self.parameter == 'delay_months':
+            values = np.unique(np.round(values))
+        return values
+    
+    def _effectiveness(self, values: np.ndarray, infrastructure_factor: float) -> np.ndarray:
+        rng = np.random.default_rng(0)  # Only the fixed constraints are used
+        effectiveness = np.empty(len(values))
+        
+        for i, value in enumerate(values):
+            parameters = dict(self.parameters, **{self.parameter: value})
+            constraints = ConstraintEngine(
+                self.scenario_type, parameters['funding_percentage'],
+                parameters['timeline_years'], parameters['delay_months'], rng
+            )
+            effectiveness[i] = constraints.get_fixed_effectiveness()
+        
+        return effectiveness * infrastructure_factor
+    
+    def measure(self, trajectory: np.ndarray) -> np.ndarray:
+        """Metric per run of a (years + 1, runs, indicators) trajectory"""
+        if self.metric == 'net_sdg_progress':
+            return net_progress(self.graph, self.target_sdgs, trajectory)
+        
+        position = self.graph.position[self.metric]
+        baseline = trajectory[0][:, position]
+        final = trajectory[-1][:, position]
+        safe_baseline = np.where(baseline > 0, baseline, 1.0)
+        return np.where(baseline > 0, (final - baseline) / safe_baseline * 100, 0.0)
+    
+    def evaluate(self, values: np.ndarray) -> np.ndarray:
+        """Metric for every candidate value, computed as one batched engine pass"""
+        engine = VectorizedSimulationEngine(
+            self.graph, self.target_sdgs, self.scenario_type,
+            self.parameters['funding_percentage'], self.parameters['timeline_years'],
+            self.parameters['delay_months'], seed=self.seed
+        )
+        infrastructure_factor = engine.constraint_engine.get_infrastructure_factor()
+        direct_impacts = engine.calculate_direct_impact(self.target_sdgs)
+        
+        trajectory = engine.run_with_effectiveness(
+            self._effectiveness(values, infrastructure_factor), direct_impacts
+        )
+        self.evaluations += len(values)
+        self.engine_passes += 1
+        return self.measure(trajectory)
+    
+    def verify(self, value: float) -> float:
+        """Re-run the solution through TimeStepSimulationEngine with the same draws"""
+        parameters = dict(self.parameters, **{self.parameter: value})
+        engine = TimeStepSimulationEngine(
+            self.graph, self.target_sdgs, self.scenario_type,
+            parameters['funding_percentage'], parameters['timeline_years'],
+            parameters['delay_months'], seed=self.seed
+        )
+        engine.run_simulation()
+        self.evaluations += 1
+        return float(self.measure(engine.trajectory.values[:, None, :])[0])
+    
+    def solve(self) -> Dict:
+        """
+        Search for the parameter value
+        
+        Returns:
+            Dict with the value found, the metric it achieves and the work used
+            (when infeasible, `achieved` is the best metric within the bounds)
+        """
+        lower, upper = self.lower, self.upper
+        solution, achieved = None, None
+        iterations = 0
+        
+        while iterations < self.max_iterations:
+            iterations += 1
+            values = self._candidates(lower, upper)
+            metric = self.evaluate(values)
+            
+            # Orient the grid so the first feasible candidate is the answer
+            if self.goal == 'maximize':
+                values, metric = values[::-1], metric[::-1]
+            
+            feasible = np.flatnonzero(metric >= self.target_value)
+            if len(feasible) == 0:
+                if solution is None:
+                    achieved = float(metric[-1])  # Best the interval allows
+                break  # Target cannot be reached in this interval
+            
+            first = feasible[0]
+            solution, achieved = float(values[first]), float(metric[first])
+            if first == 0:
+                break  # The search bound itself already reaches the target
+            
+            lower, upper = sorted((float(values[first - 1]), float(values[first])))
+            if upper - lower <= self.tolerance:
+                break
+        
+        return {
+            'parameter': self.parameter,
+            'goal': self.goal,
+            'metric': self.metric,
+            'target_value': self.target_value,
+            'feasible': solution is not None,
+            'value': solution,
+            'achieved': achieved,
+            'verified': self.verify(solution) if solution is not None else None,
+            'seed': self.seed,
+            'iterations': iterations,
+            'engine_passes': self.engine_passes,
+            'evaluations': self.evaluations
+        }
@@ -0,0 +1,262 @@
+"""
+Background Simulation Jobs
+The simulation_jobs table is the queue: the API stores a job and returns its
+ID at once, local worker processes claim and run jobs and write back progress
+and results. Any process sharing the database can submit or work, so the
+serverless deployment can queue jobs for workers running elsewhere.
+
+Usage (from backend/): python simulation_jobs.py [n_workers]
+"""
+from datetime import datetime, timedelta
+from multiprocessing import Process
+from typing import Callable, Dict, List, Optional
+import os
+import socket
+import sys
+import threading
+import time
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from database import SessionLocal, SimulationJob, SimulationSweep, init_db, twin_baseline_rows
+from simulation_engine import SimulationEngine
+from simulation_executor import ensemble_task
+from simulation_sweep import ParameterSweep
+
+
+# Seconds an idle worker waits before polling the queue again (JOB_POLL_SECONDS)
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+
+# A running job whose worker has not reported for this long is claimed again
+# (JOB_STALE_SECONDS); workers report at a quarter of this interval
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "300"))
+
+# Claims per job before it is failed, so a job that kills its worker is not retried forever
+JOB_MAX_ATTEMPTS = 3
+
+# Worker processes started from the command line (JOB_WORKERS, default one per CPU)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def save_sweep(db: Session, digital_twin_id: int, scenario_type: str, target_sdgs: List[int],
+               seed: Optional[int], results: Dict) -> SimulationSweep:
+    """Store a parameter sweep result as one record"""
+    record = SimulationSweep(
+        digital_twin_id=digital_twin_id,
+        scenario_type=scenario_type,
+        target_sdgs=target_sdgs,
+        seed=seed,
+        parameters={
+            'timeline_years': results['timeline_years'],
+            'funding_percentage': results['funding_percentage'],
+            'delay_months': results['delay_months']
+        },
+        results={
+            'net_sdg_progress': results['net_sdg_progress'],
+            'effectiveness': results['effectiveness'],
+            'infrastructure_factor': results['infrastructure_factor'],
+            'best': results['best']
+        }
+    )
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+    return record
+
+
+# ==================== Job kinds ====================
+# Each runs one validated request body and returns a JSON-serializable result
+
+def _ensemble_job(parameters: Dict, db: Session, report: Callable[[float], None]) -> Dict:
+    return ensemble_task(
+        parameters['target_sdgs'], parameters['scenario_type'], parameters['funding_percentage'],
+        parameters['timeline_years'], parameters['delay_months'], parameters['seed'], parameters['n_runs']
+    )
+
+
+def _sweep_job(parameters: Dict, db: Session, report: Callable[[float], None]) -> Dict:
+    """Parameters hold the expanded grid axes"""
+    results = ParameterSweep(
+        target_sdgs=parameters['target_sdgs'],
+        scenario_type=parameters['scenario_type'],
+        funding_values=parameters['funding_percentage'],
+        delay_values=parameters['delay_months'],
+        timeline_values=parameters['timeline_years'],
+        seed=parameters['seed']
+    ).run(on_progress=report)
+    
+    record = save_sweep(db, parameters['digital_twin_id'], parameters['scenario_type'],
+                        parameters['target_sdgs'], parameters['seed'], results)
+    return {'sweep_id': record.id, **results}
+
+
+def _multi_twin_job(parameters: Dict, db: Session, report: Callable[[float], None]) -> Dict:
+    rows = twin_baseline_rows(db, parameters['digital_twin_ids'])
+    if not rows:
+        raise ValueError('No digital twins with indicators found')
+    
+    return SimulationEngine().rank_twins(
+        rows=rows,
+        target_sdgs=parameters['target_sdgs'],
+        scenario_type=parameters['scenario_type'],
+        funding_percentage=parameters['funding_percentage'],
+        timeline_years=parameters['timeline_years'],
+        delay_months=parameters['delay_months'],
+        scale_factor=parameters['scale_factor'],
+        rank_by=parameters['rank_by'],
+        seed=parameters['seed']
+    )
+
+
+JOB_KINDS = {
+    'ensemble': _ensemble_job,
+    'sweep': _sweep_job,
+    'multi_twin': _multi_twin_job,
+}
+
+
+# ==================== Queue ====================
+
+def submit_job(db: Session, kind: str, parameters: Dict) -> SimulationJob:
+    """Queue a job; parameters must already be validated"""
+    if kind not in JOB_KINDS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    
+    job = SimulationJob(kind=kind, parameters=parameters)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def job_status(job: SimulationJob) -> Dict:
+    return {
+        'job_id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+        'attempts': job.attempts,
+        'parameters': job.parameters,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at
+    }
+
+
+def _update(job_id: int, attempt: int, **values) -> bool:
+    """
+    Write to a job on behalf of the claim that made `attempt`
+    Returns False (and writes nothing) once the job has been claimed again
+    """
+    db = SessionLocal()
+    try:
+        updated = db.query(SimulationJob).filter(
+            SimulationJob.id == job_id,
+            SimulationJob.attempts == attempt
+        ).update(values, synchronize_session=False)
+        db.commit()
+        return updated == 1
+    finally:
+        db.close()
+
+
+def claim_job(db: Session, worker: str) -> Optional[SimulationJob]:
+    """
+    Claim the oldest runnable job: queued, or running with a stale heartbeat
+    
+    A claim is a compare-and-set on `attempts`, so of several workers reading
+    the same job exactly one update succeeds; no lock or broker is needed.
+    Returns None when nothing is runnable.
+    """
+    while True:
+        stale = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+        candidate = db.query(SimulationJob.id, SimulationJob.attempts).filter(or_(
+            SimulationJob.status == 'queued',
+            and_(SimulationJob.status == 'running', SimulationJob.heartbeat_at < stale)
+        )).order_by(SimulationJob.id).first()
+        if candidate is None:
+            return None
+        
+        now = datetime.utcnow()
+        if candidate.attempts >= JOB_MAX_ATTEMPTS:
+            _update(candidate.id, candidate.attempts, status='failed', finished_at=now,
+                    error=f'Worker lost {candidate.attempts} times')
+            continue
+        
+        claimed = _update(candidate.id, candidate.attempts, status='running', worker=worker,
+                          attempts=candidate.attempts + 1, started_at=now, heartbeat_at=now)
+        if claimed:
+            db.expire_all()
+            return db.get(SimulationJob, candidate.id)
+
+
+def _heartbeat(job_id: int, attempt: int, stop: threading.Event):
+    """Keep a claimed job from looking stale while it runs"""
+    while not stop.wait(JOB_STALE_SECONDS / 4):
+        if not _update(job_id, attempt, heartbeat_at=datetime.utcnow()):
+            return
+
+
+def run_job(job: SimulationJob, db: Session):
+    """Run a claimed job and store its result, or its error"""
+    attempt = job.attempts
+    
+    def report(progress: float):
+        _update(job.id, attempt, progress=progress, heartbeat_at=datetime.utcnow())
+    
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job.id, attempt, stop), daemon=True)
+    heartbeat.start()
+    try:
+        result = JOB_KINDS[job.kind](job.parameters, db, report)
+    except Exception as e:
+        db.rollback()
+        _update(job.id, attempt, status='failed', error=f'{type(e).__name__}: {e}',
+                finished_at=datetime.utcnow())
+        print(f'Job {job.id} ({job.kind}) failed: {e}', file=sys.stderr)
+    else:
+        _update(job.id, attempt, status='done', progress=1.0, result=result,
+                finished_at=datetime.utcnow())
+    finally:
+        stop.set()
+        heartbeat.join()
+
+
+def work(worker: str = None, once: bool = False):
+    """
+    Claim and run jobs until stopped
+    
+    Args:
+        worker: Name recorded on claimed jobs (default host:pid)
+        once: Return when the queue is empty instead of polling
+    """
+    worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+    while True:
+        db = SessionLocal()
+        try:
+            job = claim_job(db, worker)
+            if job is not None:
+                run_job(job, db)
+        finally:
+            db.close()
+        
+        if job is None:
+            if once:
+                return
+            time.sleep(JOB_POLL_SECONDS)
+
+
+def main(n_workers: int = JOB_WORKERS):
+    init_db()
+    print(f'Starting {n_workers} simulation job workers')
+    
+    # Not daemonic: large sweeps start their own process pool inside a worker
+    workers = [Process(target=work) for _ in range(n_workers)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else JOB_WORKERS)
@@ -0,0 +1,272 @@
+"""
+Global Sensitivity Analysis
+Sobol indices and Morris elementary effects of simulation inputs (funding,
+delay, timeline, infrastructure readiness and every influence weight),
+evaluated through the batched engine
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sdg_graph import get_compiled_graph
+from simulation_core import ConstraintEngine
+from simulation_vectorized import VectorizedSimulationEngine
+from simulation_ensemble import net_progress
+from simulation_sweep import POOL_THRESHOLD, POOL_WORKERS, get_process_pool
+
+
+# Rows per batched engine run; bounds the (runs x edges) work arrays
+CHUNK_ROWS = 8192
+
+
+def _first_primes(n: int) -> List[int]:
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def scrambled_halton(n: int, dimensions: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Quasi-random points in the unit cube, shape (n, dimensions)
+    Halton sequence with a random digit permutation per base, which breaks
+    the correlation between high-dimensional coordinates
+    """
+    index = np.arange(1, n + 1)
+    points = np.empty((n, dimensions))
+    
+    for column, base in enumerate(_first_primes(dimensions)):
+        permutation = np.concatenate([[0], rng.permutation(np.arange(1, base))])
+        remaining = index.copy()
+        scale = 1.0
+        values = np.zeros(n)
+        while np.any(remaining > 0):
+            scale /= base
+            values += scale * permutation[remaining % base]
+            remaining //= base
+        points[:, column] = values
+    
+    return points
+
+
+def _evaluate_rows(target_sdgs: List[int], scenario_type: str, inputs: np.ndarray,
+                   direct_impacts: np.ndarray) -> np.ndarray:
+    """
+    Outputs for rows of physical inputs (runs in a worker process for large designs)
+    
+    Args:
+        inputs: Columns funding, delay, timeline, infrastructure, then one
+            weight multiplier per influence edge
+    
+    Returns:
+        Array of shape (rows, indicators + 1): final % change of every
+        indicator at the row's own horizon, then net SDG progress
+    """
+    graph = get_compiled_graph()
+    rng = np.random.default_rng(0)  # Only the fixed constraints are used
+    
+    funding, delay, timeline, infrastructure = inputs[:, 0], inputs[:, 1], inputs[:, 2], inputs[:, 3]
+    timeline = timeline.astype(np.int64)
+    effectiveness = np.array([
+        ConstraintEngine(scenario_type, f, t, d, rng).get_fixed_effectiveness()
+        for f, d, t in zip(funding.tolist(), delay.tolist(), timeline.tolist())
+    ]) * infrastructure
+    edge_scale = inputs[:, 4:] if inputs.shape[1] > 4 else None
+    
+    # Run every row to the longest horizon, then read each at its own year
+    engine = VectorizedSimulationEngine(
+        graph, target_sdgs, scenario_type, 100.0, int(timeline.max()), 0
+    )
+    trajectory = engine.run_with_effectiveness(effectiveness, direct_impacts, edge_scale=edge_scale)
+    rows = np.arange(len(inputs))
+    ends = np.stack([trajectory[0], trajectory[timeline, rows]])
+    
+    baseline, final = ends[0], ends[1]
+    safe_baseline = np.where(baseline > 0, baseline, 1.0)
+    pct_change = np.where(baseline > 0, (final - baseline) / safe_baseline * 100, 0.0)
+    
+    return np.column_stack([pct_change, net_progress(graph, target_sdgs, ends)])
+
+
+class SensitivityAnalysis:
+    """
+    Variance-based (Sobol) or screening (Morris) sensitivity of every output
+    indicator to the simulation inputs
+    
+    Inputs are funding, delay, timeline, the infrastructure readiness factor
+    and, optionally, a multiplier on each IndicatorInfluence.weight. The
+    direct impact draws are fixed from the seed (common random numbers).
+    """
+    
+    METHODS = ('sobol', 'morris')
+    MORRIS_LEVELS = 4
+    
+    def __init__(self, target_sdgs: List[int], scenario_type: str,
+                 funding_range: Tuple[float, float] = (50.0, 100.0),
+                 delay_range: Tuple[float, float] = (0.0, 24.0),
+                 timeline_range: Tuple[int, int] = (3, 10),
+                 weight_uncertainty: float = 0.5, include_weights: bool = True,
+                 seed: Optional[int] = None):
+        self.graph = get_compiled_graph()
+        self.target_sdgs = target_sdgs
+        self.scenario_type = scenario_type
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        
+        # (name, lower, upper) of every input dimension
+        self.inputs = [
+            ('funding_percentage', *funding_range),
+            ('delay_months', *delay_range),
+            ('timeline_years', timeline_range[0], timeline_range[1] + 1),  # Floored to integers
+            ('infrastructure_factor', *ConstraintEngine.INFRASTRUCTURE_RANGE),
+        ]
+        if include_weights:
+            for source, target in zip(self.graph.sources, self.graph.indices):
+                self.inputs.append((
+                    f'weight:{self.graph.keys[source]}->{self.graph.keys[target]}',
+                    1.0 - weight_uncertainty, 1.0 + weight_uncertainty
+                ))
+        
+        self.outputs = list(self.graph.keys) + ['net_sdg_progress']
+        self.evaluations = 0
+    
+    @property
+    def dimensions(self) -> int:
+        return len(self.inputs)
+    
+    def n_evaluations(self, method: str, n_samples: int) -> int:
+        """Model evaluations a design of this size needs"""
+        if method == 'sobol':
+            return n_samples * (self.dimensions + 2)
+        return n_samples * (self.dimensions + 1)
+    
+    def _scale(self, unit: np.ndarray) -> np.ndarray:
+        """Map unit-cube points onto the input ranges"""
+        lower = np.array([lo for _, lo, _ in self.inputs])
+        upper = np.array([hi for _, _, hi in self.inputs])
+        physical = lower + unit * (upper - lower)
+        physical[:, 2] = np.minimum(np.floor(physical[:, 2]), upper[2] - 1)
+        return physical
+    
+    def evaluate(self, unit: np.ndarray) -> np.ndarray:
+        """Outputs for unit-cube design points, shape (points, outputs)"""
+        inputs = self._scale(unit)
+        draws = VectorizedSimulationEngine(
+            self.graph, self.target_sdgs, self.scenario_type, 100.0, 1, 0, seed=self.seed
+        )
+        direct_impacts = draws.calculate_direct_impact(self.target_sdgs)
+        chunks = [inputs[start:start + CHUNK_ROWS] for start in range(0, len(inputs), CHUNK_ROWS)]
+        
+        work = len(inputs) * int(inputs[:, 2].max())
+        if work < POOL_THRESHOLD or POOL_WORKERS == 1:
+            outputs = [
+                _evaluate_rows(self.target_sdgs, self.scenario_type, chunk, direct_impacts)
+                for chunk in chunks
+            ]
+        else:
+            pool = get_process_pool()
+            futures = [
+                pool.submit(_evaluate_rows, self.target_sdgs, self.scenario_type, chunk, direct_impacts)
+                for chunk in chunks
+            ]
+            outputs = [future.result() for future in futures]
+        
+        self.evaluations += len(inputs)
+        return np.concatenate(outputs)
+    
+    def sobol(self, n_samples: int) -> Dict:
+        """
+        First-order and total Sobol indices (Saltelli design)
+        Needs n_samples * (dimensions + 2) evaluations
+        """
+        d = self.dimensions
+        design = scrambled_halton(n_samples, 2 * d, self.rng)
+        a, b = design[:, :d], design[:, d:]
+        
+        # Rows: A, B, then A with column i taken from B for every i
+        ab = np.repeat(a[None], d, axis=0)
+        ab[np.arange(d), :, np.arange(d)] = b.T
+        y = self.evaluate(np.concatenate([a, b, ab.reshape(-1, d)]))
+        
+        y_a, y_b = y[:n_samples], y[n_samples:2 * n_samples]
+        y_ab = y[2 * n_samples:].reshape(d, n_samples, -1)
+        variance = np.var(np.concatenate([y_a, y_b]), axis=0)
+        safe_variance = np.where(variance > 0, variance, 1.0)
+        
+        # Saltelli (2010) first-order and Jansen total-effect estimators
+        first = np.mean(y_b * (y_ab - y_a), axis=1) / safe_variance
+        total = 0.5 * np.mean((y_a - y_ab) ** 2, axis=1) / safe_variance
+        first = np.where(variance > 0, first, 0.0)
+        total = np.where(variance > 0, total, 0.0)
+        
+        return self._indices({'S1': first, 'ST': total}, variance)
+    
+    def morris(self, n_trajectories: int) -> Dict:
+        """
+        Morris elementary effects: mu_star (mean |effect|) and sigma
+        Needs n_trajectories * (dimensions + 1) evaluations
+        """
+        d = self.dimensions
+        levels = self.MORRIS_LEVELS
+        delta = levels / (2 * (levels - 1))
+        
+        # Each trajectory moves one input by +/-delta per step, in random order
+        start = self.rng.integers(0, levels // 2, size=(n_trajectories, d)) / (levels - 1)
+        order = np.argsort(self.rng.random((n_trajectories, d)), axis=1)
+        sign = np.where(self.rng.random((n_trajectories, d)) < 0.5, 1.0, -1.0)
+        start = np.where(sign < 0, start + delta, start)
+        
+        points = np.repeat(start[:, None, :], d + 1, axis=1)
+        runs = np.arange(n_trajectories)
+        for step in range(d):
+            moved = order[:, step]
+            points[:, step + 1:, :][runs, :, moved] += (sign[runs, moved] * delta)[:, None]
+        
+        y = self.evaluate(points.reshape(-1, d)).reshape(n_trajectories, d + 1, -1)
+        
+        # Effect of the input moved at each step
+        effects = np.empty((d, n_trajectories, y.shape[-1]))
+        steps = (y[:, 1:] - y[:, :-1]) / (sign[runs[:, None], order] * delta)[..., None]
+        effects[order.T, runs[None, :]] = steps.transpose(1, 0, 2)
+        
+        variance = np.var(y.reshape(-1, y.shape[-1]), axis=0)
+        return self._indices({
+            'mu_star': np.abs(effects).mean(axis=1),
+            'sigma': effects.std(axis=1)
+        }, variance)
+    
+    def _indices(self, measures: Dict[str, np.ndarray], variance: np.ndarray) -> Dict:
+        """Arrange (inputs x outputs) measures per output, inputs ranked by the first measure"""
+        ranking = next(iter(measures))
+        results = {}
+        for column, output in enumerate(self.outputs):
+            order = np.argsort(-measures[ranking][:, column], kind='stable')
+            results[output] = {
+                'variance': float(variance[column]),
+                'inputs': [
+                    {
+                        'input': self.inputs[i][0],
+                        **{name: float(values[i, column]) for name, values in measures.items()}
+                    }
+                    for i in order
+                ]
+            }
+        return results
+    
+    def run(self, method: str = 'sobol', n_samples: int = 1024) -> Dict:
+        """Run the analysis; n_samples is the base sample (Sobol) or trajectory (Morris) count"""
+        if method not in self.METHODS:
+            raise ValueError(f'Unknown method {method}')
+        
+        indices = self.sobol(n_samples) if method == 'sobol' else self.morris(n_samples)
+        return {
+            'method': method,
+            'n_samples': n_samples,
+            'evaluations': self.evaluations,
+            'inputs': [
+                {'name': name, 'lower': float(lower), 'upper': float(upper)}
+                for name, lower, upper in self.inputs
+            ],
+            'outputs': indices
+        }
@@ -0,0 +1,147 @@
+"""
+Parameter Sweep
+Evaluates net SDG progress over a funding x delay x timeline grid as batched
+array computations, spread across a process pool for large grids
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+import os
+import numpy as np
+from sdg_graph import get_compiled_graph
+from simulation_core import ConstraintEngine
+from simulation_vectorized import VectorizedSimulationEngine
+from simulation_ensemble import net_progress
+
+
+# Grids smaller than this many (run x year) steps are evaluated in-process,
+# where they finish faster than the pool can dispatch them
+POOL_THRESHOLD = 200000
+
+# Worker processes for large sweeps (SIMULATION_WORKERS, default one per CPU)
+POOL_WORKERS = int(os.getenv("SIMULATION_WORKERS", "0")) or os.cpu_count() or 1
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Process-wide worker pool, started on first use"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+    return _process_pool
+
+
+def _evaluate_chunk(target_sdgs: List[int], scenario_type: str, timeline_years: int,
+                    effectiveness: np.ndarray, direct_impacts: np.ndarray) -> np.ndarray:
+    """Net progress for one block of grid points (runs in a worker process)"""
+    engine = VectorizedSimulationEngine(
+        graph=get_compiled_graph(),
+        target_sdgs=target_sdgs,
+        scenario_type=scenario_type,
+        funding_percentage=100.0,
+        timeline_years=timeline_years,
+        delay_months=0
+    )
+    trajectory = engine.run_with_effectiveness(effectiveness, direct_impacts)
+    return net_progress(engine.graph, target_sdgs, trajectory)
+
+
+class ParameterSweep:
+    """
+    Dense grid evaluation of one scenario
+    
+    Funding and delay only change the effectiveness multiplier, so every
+    (funding, delay) pair of a timeline is one row of a single batched run.
+    All grid points share one set of random draws (common random numbers),
+    so the heatmap shows the effect of the parameters rather than noise.
+    """
+    
+    def __init__(self, target_sdgs: List[int], scenario_type: str,
+                 funding_values: List[float], delay_values: List[int],
+                 timeline_values: List[int], seed: Optional[int] = None):
+        self.graph = get_compiled_graph()
+        self.target_sdgs = target_sdgs
+        self.scenario_type = scenario_type
+        self.funding_values = [float(f) for f in funding_values]
+        self.delay_values = [int(d) for d in delay_values]
+        self.timeline_values = [int(t) for t in timeline_values]
+        self.seed = seed
+    
+    @property
+    def shape(self):
+        return len(self.timeline_values), len(self.funding_values), len(self.delay_values)
+    
+    def effectiveness_grid(self, infrastructure_factor: float) -> np.ndarray:
+        """Total effectiveness of every grid point, shape (timelines, fundings, delays)"""
+        rng = np.random.default_rng(0)  # Only the fixed constraints are used
+        
+        # Constraints multiply, and the funding constraint is funding / 100,
+        # so only the (timeline, delay) factors need a ConstraintEngine each
+        at_full_funding = np.empty((len(self.timeline_values), 1, len(self.delay_values)))
+        for i, timeline in enumerate(self.timeline_values):
+            for k, delay in enumerate(self.delay_values):
+                constraints = ConstraintEngine(self.scenario_type, 100.0, timeline, delay, rng)
+                at_full_funding[i, 0, k] = constraints.get_fixed_effectiveness()
+        
+        funding = np.array(self.funding_values)[None, :, None] / 100.0
+        return at_full_funding * funding * infrastructure_factor
+    
+    def run(self, on_progress: Optional[Callable[[float], None]] = None) -> Dict:
+        """
+        Evaluate the full grid
+        
+        Args:
+            on_progress: Called with the fraction of timelines evaluated so far
+        """
+        # One engine supplies the shared random draws for every grid point
+        draws = VectorizedSimulationEngine(
+            self.graph, self.target_sdgs, self.scenario_type, 100.0,
+            self.timeline_values[0], 0, seed=self.seed
+        )
+        infrastructure_factor = draws.constraint_engine.get_infrastructure_factor()
+        direct_impacts = draws.calculate_direct_impact(self.target_sdgs)
+        
+        effectiveness = self.effectiveness_grid(infrastructure_factor)
+        rows = effectiveness.reshape(len(self.timeline_values), -1)
+        
+        # Split each timeline's rows into one chunk per worker
+        work = rows.shape[1] * sum(self.timeline_values)
+        if work < POOL_THRESHOLD:
+            progress = []
+            for timeline, row in zip(self.timeline_values, rows):
+                progress.append(_evaluate_chunk(self.target_sdgs, self.scenario_type, timeline, row, direct_impacts))
+                if on_progress is not None:
+                    on_progress(len(progress) / len(rows))
+        else:
+            pool = get_process_pool()
+            futures = [
+                [
+                    pool.submit(_evaluate_chunk, self.target_sdgs, self.scenario_type,
+                                timeline, chunk, direct_impacts)
+                    for chunk in np.array_split(row, POOL_WORKERS) if len(chunk)
+                ]
+                for timeline, row in zip(self.timeline_values, rows)
+            ]
+            progress = []
+            for timeline_futures in futures:
+                progress.append(np.concatenate([future.result() for future in timeline_futures]))
+                if on_progress is not None:
+                    on_progress(len(progress) / len(rows))
+        
+        net_sdg_progress = np.stack(progress).reshape(self.shape)
+        best = np.unravel_index(np.argmax(net_sdg_progress), self.shape)
+        
+        return {
+            'timeline_years': self.timeline_values,
+            'funding_percentage': self.funding_values,
+            'delay_months': self.delay_values,
+            'net_sdg_progress': net_sdg_progress.tolist(),
+            'effectiveness': effectiveness.tolist(),
+            'infrastructure_factor': infrastructure_factor,
+            'best': {
+                'timeline_years': self.timeline_values[best[0]],
+                'funding_percentage': self.funding_values[best[1]],
+                'delay_months': self.delay_values[best[2]],
+                'net_sdg_progress': float(net_sdg_progress[best])
+            }
+        }
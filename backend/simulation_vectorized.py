@@ -0,0 +1,405 @@
+"""
+Vectorized Time-Step Simulation Engine
+Array-backed alternative to TimeStepSimulationEngine: the indicator state is one
+NumPy vector and every effect is applied as a whole-vector operation
+"""
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from functools import lru_cache
+import copy
+import json
+import numpy as np
+from sdg_graph import SDGIndicatorGraph, CompiledSDGGraph
+from simulation_core import (
+    SimulationState, SimulationTrajectory, DelayQueue,
+    ConstraintEngine, FeedbackLoopEngine, SaturationFunction
+)
+from simulation_cache import SimulationCache, simulation_cache
+
+
+@lru_cache(maxsize=64)
+def _pruned_feedback_engine(graph: CompiledSDGGraph) -> FeedbackLoopEngine:
+    """Feedback loops of a pruned subgraph, shared by every run that uses it"""
+    return FeedbackLoopEngine(graph)
+
+
+class VectorizedSimulationEngine:
+    """
+    Drop-in alternative to TimeStepSimulationEngine
+    Holds the state as a vector and applies direct, delayed, indirect and
+    feedback effects as whole-vector operations. Every operation also works
+    on a (runs x indicators) matrix, which run_batch uses for ensembles.
+    
+    Runs from Year 0 only simulate the indicators the target SDGs can reach
+    within the horizon (CompiledSDGGraph.pruned); the others keep their
+    baseline, as they would in a full run.
+    """
+    
+    def __init__(self, graph: Union[SDGIndicatorGraph, CompiledSDGGraph], target_sdgs: List[int],
+                 scenario_type: str, funding_percentage: float,
+                 timeline_years: int, delay_months: int, seed: Optional[int] = None):
+        if not isinstance(graph, CompiledSDGGraph):
+            graph = graph.compile()
+        self.graph = graph
+        self.target_sdgs = target_sdgs
+        self.scenario_type = scenario_type
+        self.funding_percentage = funding_percentage
+        self.timeline_years = timeline_years
+        self.delay_months = delay_months
+        
+        # Same generator layout as the scalar engine, so equal seeds give equal runs
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        
+        # Same constraint and feedback definitions as the scalar engine
+        self.constraint_engine = ConstraintEngine(
+            scenario_type, funding_percentage, timeline_years, delay_months, self.rng
+        )
+        self.feedback_engine = FeedbackLoopEngine(graph)
+        self.saturation = SaturationFunction()
+        
+        # Pending delayed effects (ring buffer, one slot per year ahead)
+        self.pending: DelayQueue = None
+        
+        # Optional per-run influence weight multipliers, shape (..., edges)
+        self.edge_scale: np.ndarray = None
+        
+        # Simulate only the indicators the target SDGs can reach in time
+        self.prune = True
+        
+        # Simulation history
+        self.trajectory: SimulationTrajectory = None
+        self.states: List[SimulationState] = []
+        self.direct_impacts: np.ndarray = None
+        self.resumed_from_year = 0
+    
+    def initialize_baseline(self, digital_twin_data: Dict = None) -> np.ndarray:
+        """Initialize Year 0 baseline vector"""
+        return self.graph.to_vector(digital_twin_data or {})
+    
+    def calculate_direct_impact(self, target_sdgs: List[int]) -> np.ndarray:
+        """
+        Calculate direct project impact on target SDGs as a vector
+        Draws in the same order as the scalar engine
+        """
+        direct_impacts = np.zeros(len(self.graph))
+        
+        for position in self.graph.target_positions(target_sdgs):
+            direct_impacts[position] += self.rng.uniform(8.0, 15.0)
+        
+        return direct_impacts
+    
+    def sample_direct_impacts(self, target_sdgs: List[int], n_runs: int) -> np.ndarray:
+        """Draw direct impacts for a batch of runs, shape (n_runs, indicators)"""
+        positions = self.graph.target_positions(target_sdgs)
+        draws = self.rng.uniform(8.0, 15.0, size=(n_runs, len(positions)))
+        
+        direct_impacts = np.zeros((n_runs, len(self.graph)))
+        for column, position in enumerate(positions):
+            direct_impacts[:, position] += draws[:, column]
+        
+        return direct_impacts
+    
+    def calculate_feedback_effects(self, values: np.ndarray, history: np.ndarray) -> np.ndarray:
+        """
+        Calculate feedback effects against the stored history
+        
+        Args:
+            values: Current state, shape (..., indicators)
+            history: Previous states, shape (years, ..., indicators)
+        """
+        return self.feedback_engine.calculate_feedback_effects(values, history)
+    
+    def _saturate(self, values: np.ndarray, change: np.ndarray) -> np.ndarray:
+        return self.saturation.apply_array(values, change, self.graph.max, self.graph.min)
+    
+    def cache_key(self, baseline: np.ndarray, *extra) -> str:
+        """Content address of this run: graph, twin baseline, parameters and seed"""
+        return SimulationCache.make_key(
+            type(self).__name__, self.graph.fingerprint, baseline, self.target_sdgs,
+            self.scenario_type, self.funding_percentage, self.timeline_years,
+            self.delay_months, self.seed, *extra
+        )
+    
+    def simulate_year(self, values: np.ndarray, history: np.ndarray,
+                      direct_impacts: np.ndarray,
+                      effectiveness: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Simulate a single year, returning the new state
+        
+        Args:
+            values: State at the end of last year, shape (..., indicators)
+            history: All previous states including `values`
+            direct_impacts: Unconstrained direct impacts, broadcastable to values
+            effectiveness: Constraint multiplier, scalar or shape (..., 1)
+        """
+        values = values.copy()
+        
+        # 1. Apply direct project impacts (with constraints and saturation)
+        changes_made = self._saturate(values, direct_impacts * effectiveness)
+        values += changes_made
+        
+        # 2. Apply delayed effects landing this year
+        landing = self.pending.release()
+        
+        actual_change = self._saturate(values, landing)
+        values += actual_change
+        changes_made += actual_change
+        
+        # 3. Propagate indirect effects along the influence edges
+        values = self.propagate_changes(values, changes_made)
+        
+        # 4. Apply feedback loop effects
+        if len(history) > 0:
+            feedback = self.calculate_feedback_effects(values, history)
+            values += self._saturate(values, feedback)
+        
+        # 5. Ensure all values stay within bounds
+        return np.clip(values, self.graph.min, self.graph.max)
+    
+    def propagate_changes(self, values: np.ndarray, changes_made: np.ndarray) -> np.ndarray:
+        """
+        Schedule the delayed indirect effects of this year's changes and apply
+        the immediate ones, first order only, along every edge at once
+        """
+        source_change = np.where(np.abs(changes_made) < 0.1, 0.0, changes_made)
+        arrivals = self.graph.propagate(source_change, self.edge_scale)
+        self.pending.schedule_arrivals(arrivals)
+        
+        values += self._saturate(values, arrivals[0])
+        return values
+    
+    def checkpoint_key(self, baseline: np.ndarray = None, *extra) -> str:
+        """
+        Address of the checkpoints this run can resume from
+        Same as the cache key except for the horizon: only its effectiveness
+        bracket matters, since the timeline factor scales every year
+        """
+        if baseline is None:
+            baseline = self.graph.baseline
+        return SimulationCache.make_key(
+            type(self).__name__, 'checkpoint', self.graph.fingerprint, baseline,
+            self.target_sdgs, self.scenario_type, self.funding_percentage,
+            ConstraintEngine.timeline_factor(self.timeline_years), self.delay_months, self.seed, *extra
+        )
+    
+    def export_checkpoint(self) -> Dict:
+        """JSON-serializable end-of-run state, see TimeStepSimulationEngine.export_checkpoint"""
+        return {
+            'key': self.checkpoint_key(self.trajectory.values[0]),
+            'timeline_years': self.timeline_years,
+            'values': self.trajectory.values.tolist(),
+            'delayed_effects': self.trajectory.delayed_effects.to_dict(),
+            'direct_impacts': self.graph.to_dict(self.direct_impacts),
+            'infrastructure_factor': self.constraint_engine.get_infrastructure_factor(),
+            'rng_state': json.dumps(self.rng.bit_generator.state)
+        }
+    
+    def _resume_trajectory(self, checkpoint: Dict, baseline: np.ndarray) -> int:
+        """Restore a checkpoint into a longer trajectory, returning the first year left to simulate"""
+        if checkpoint['key'] != self.checkpoint_key(baseline):
+            raise ValueError('Checkpoint was produced by a different simulation')
+        
+        self.trajectory = SimulationTrajectory.resume(
+            self.graph, self.timeline_years, np.array(checkpoint['values'], dtype=np.float64),
+            DelayQueue.from_dict(checkpoint['delayed_effects'])
+        )
+        self.constraint_engine.set_infrastructure_factor(checkpoint['infrastructure_factor'])
+        self.rng.bit_generator.state = json.loads(checkpoint['rng_state'])
+        
+        self.resumed_from_year = checkpoint['timeline_years']
+        return self.resumed_from_year + 1
+    
+    def _run(self, direct_impacts: np.ndarray, effectiveness: Union[float, np.ndarray],
+             start_year: int = 1) -> np.ndarray:
+        """
+        Simulate the remaining years of self.trajectory
+        
+        Returns:
+            The trajectory values, shape (years + 1, ..., indicators)
+        """
+        for _ in self._iter_run(direct_impacts, effectiveness, start_year):
+            pass
+        return self.trajectory.values
+    
+    def _iter_run(self, direct_impacts: np.ndarray, effectiveness: Union[float, np.ndarray],
+                  start_year: int = 1) -> Iterator[int]:
+        """Simulate the remaining years of self.trajectory, yielding each year once its row is final"""
+        self.pending = self.trajectory.delayed_effects
+        
+        # A resumed run may hold changes anywhere, so only fresh runs are pruned
+        pruned = None
+        if self.prune and start_year == 1:
+            pruned = self.graph.pruned(tuple(self.target_sdgs), self.timeline_years)
+        if pruned is not None:
+            yield from self._iter_run_pruned(direct_impacts, effectiveness, *pruned)
+            return
+        
+        values = self.trajectory.values
+        for year in range(start_year, self.timeline_years + 1):
+            values[year] = self.simulate_year(
+                values[year - 1], values[:year], direct_impacts, effectiveness
+            )
+            yield year
+    
+    def _iter_run_pruned(self, direct_impacts: np.ndarray, effectiveness: Union[float, np.ndarray],
+                         subgraph: CompiledSDGGraph, positions: np.ndarray, edges: np.ndarray) -> Iterator[int]:
+        """Run the reachable subgraph in a copy of this engine and embed its trajectory year by year"""
+        values = self.trajectory.values
+        
+        sub_engine = copy.copy(self)
+        sub_engine.graph = subgraph
+        sub_engine.feedback_engine = _pruned_feedback_engine(subgraph)
+        sub_engine.edge_scale = self.edge_scale[..., edges] if self.edge_scale is not None else None
+        sub_engine.trajectory = SimulationTrajectory.allocate(
+            subgraph, self.timeline_years, values[0][..., positions]
+        )
+        sub_values = sub_engine.trajectory.values
+        
+        # Unreached indicators only get the yearly clip to their bounds
+        clipped = np.clip(values[0], self.graph.min, self.graph.max)
+        for year in sub_engine._iter_run(direct_impacts[..., positions], effectiveness):
+            values[year] = clipped
+            values[year][..., positions] = sub_values[year]
+            yield year
+        
+        # Effects still pending after the horizon, over every indicator
+        self.pending = self.trajectory.delayed_effects
+        for years_ahead in range(1, len(sub_engine.pending.buffer) + 1):
+            self.pending.schedule(
+                years_ahead, positions, sub_engine.pending.buffer[sub_engine.pending._slot(years_ahead)]
+            )
+    
+    def run_simulation(self, baseline_state: SimulationState = None,
+                       checkpoint: Dict = None) -> List[SimulationState]:
+        """
+        Run the complete multi-year simulation
+        
+        Args:
+            baseline_state: Year 0 state (graph defaults if omitted)
+            checkpoint: Output of export_checkpoint() for a shorter horizon of
+                this simulation; only the missing years are then computed
+        
+        Returns:
+            List of states for each year (Year 0 to Year N)
+        """
+        for _ in self.iter_simulation(baseline_state, checkpoint):
+            pass
+        return self.states
+    
+    def iter_simulation(self, baseline_state: SimulationState = None,
+                        checkpoint: Dict = None) -> Iterator[SimulationState]:
+        """
+        Run the simulation like run_simulation, yielding each year's state
+        as soon as it is final (restored or cached years at once)
+        """
+        if baseline_state is None:
+            baseline = self.initialize_baseline()
+        else:
+            baseline = self.graph.to_vector(baseline_state.indicators)
+        self.resumed_from_year = 0
+        
+        if checkpoint is not None:
+            start_year = self._resume_trajectory(checkpoint, baseline)
+            self.direct_impacts = np.zeros(len(self.graph))
+            for indicator, impact in checkpoint['direct_impacts'].items():
+                self.direct_impacts[self.graph.position[indicator]] = impact
+        else:
+            start_year = 1
+            self.direct_impacts = self.calculate_direct_impact(self.target_sdgs)
+        
+        # Seeded runs are reproducible, so they can be served from the cache
+        cache_key = self.cache_key(baseline) if self.seed is not None else None
+        if cache_key is not None:
+            hit, cached = simulation_cache.get(cache_key)
+            if hit:
+                self.trajectory = cached.copy()
+                self.pending = self.trajectory.delayed_effects
+                self.states = self.trajectory.states()
+                yield from self.states
+                return
+        
+        if checkpoint is None:
+            self.trajectory = SimulationTrajectory.allocate(self.graph, self.timeline_years, baseline)
+        
+        # States are views over the trajectory rows, which fill in as years are simulated
+        self.states = self.trajectory.states()
+        yield from self.states[:start_year]
+        for year in self._iter_run(self.direct_impacts, self.constraint_engine.get_total_effectiveness(),
+                                   start_year):
+            yield self.states[year]
+        
+        if cache_key is not None:
+            simulation_cache.put(cache_key, self.trajectory.copy())
+    
+    def run_batch(self, n_runs: int, baseline_state: SimulationState = None) -> np.ndarray:
+        """
+        Run n_runs independent realizations as one (runs x indicators) computation
+        Each run draws its own infrastructure readiness and direct impacts
+        
+        Returns:
+            Trajectory array of shape (years + 1, n_runs, indicators)
+        """
+        for _ in self.iter_batch(n_runs, baseline_state):
+            pass
+        return self.batch_values
+    
+    def iter_batch(self, n_runs: int, baseline_state: SimulationState = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Run a batch like run_batch, yielding (year, values of shape
+        (n_runs, indicators)) as soon as each year is simulated
+        """
+        if baseline_state is None:
+            baseline = self.initialize_baseline()
+        else:
+            baseline = self.graph.to_vector(baseline_state.indicators)
+        
+        cache_key = self.cache_key(baseline, 'batch', n_runs) if self.seed is not None else None
+        if cache_key is not None:
+            hit, cached = simulation_cache.get(cache_key)
+            if hit:
+                self.batch_values = cached.copy()
+                yield from enumerate(self.batch_values)
+                return
+        
+        effectiveness = self.constraint_engine.sample_effectiveness(n_runs)[:, None]
+        direct_impacts = self.sample_direct_impacts(self.target_sdgs, n_runs)
+        
+        self.trajectory = SimulationTrajectory.allocate(
+            self.graph, self.timeline_years,
+            np.broadcast_to(baseline, (n_runs, len(self.graph))).copy()
+        )
+        self.batch_values = self.trajectory.values
+        yield 0, self.batch_values[0]
+        for year in self._iter_run(direct_impacts, effectiveness):
+            yield year, self.batch_values[year]
+        
+        if cache_key is not None:
+            simulation_cache.put(cache_key, self.batch_values.copy())
+    
+    def run_with_effectiveness(self, effectiveness: np.ndarray, direct_impacts: np.ndarray,
+                               baseline_state: SimulationState = None,
+                               edge_scale: np.ndarray = None) -> np.ndarray:
+        """
+        Run one realization per effectiveness value, all sharing the same
+        direct impact draws (common random numbers), so that differences
+        between runs come from the parameters alone
+        
+        Args:
+            edge_scale: Optional influence weight multipliers per run, shape
+                (len(effectiveness), edges)
+        
+        Returns:
+            Trajectory array of shape (years + 1, len(effectiveness), indicators)
+        """
+        if baseline_state is None:
+            baseline = self.initialize_baseline()
+        else:
+            baseline = self.graph.to_vector(baseline_state.indicators)
+        
+        n_runs = len(effectiveness)
+        self.edge_scale = edge_scale
+        self.trajectory = SimulationTrajectory.allocate(
+            self.graph, self.timeline_years,
+            np.broadcast_to(baseline, (n_runs, len(self.graph))).copy()
+        )
+        return self._run(direct_impacts, np.asarray(effectiveness, dtype=np.float64)[:, None])
@@ -0,0 +1,57 @@
+"""
+Tests for resuming simulations from end-of-run checkpoints
+A checkpoint only extends runs in its own timeline bracket (under 3, 3 to 7,
+over 7 years), since the horizon sets the effectiveness of every year: in a
+5 -> 10 -> 15 year workflow only the 10 -> 15 step resumes
+
+Usage (from backend/): python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from sdg_graph import get_compiled_graph
+from simulation_cache import simulation_cache
+from simulation_core import TimeStepSimulationEngine
+from simulation_vectorized import VectorizedSimulationEngine
+
+
+TARGET_SDGS = [1, 6]
+SEED = 3
+
+
+def engine(engine_class, timeline_years):
+    simulation_cache.clear()  # Seeded runs are cached; each run must compute its own
+    return engine_class(get_compiled_graph(), TARGET_SDGS, 'success', 100.0, timeline_years, 0, seed=SEED)
+
+
+@pytest.mark.parametrize('engine_class', [TimeStepSimulationEngine, VectorizedSimulationEngine])
+def test_resumes_within_a_bracket(engine_class):
+    shorter = engine(engine_class, 10)
+    shorter.run_simulation()
+    checkpoint = shorter.export_checkpoint()
+    
+    resumed = engine(engine_class, 15)
+    assert resumed.checkpoint_key() == checkpoint['key']
+    resumed.run_simulation(checkpoint=checkpoint)
+    assert resumed.resumed_from_year == 10
+    
+    fresh = engine(engine_class, 15)
+    fresh.run_simulation()
+    assert fresh.resumed_from_year == 0
+    np.testing.assert_allclose(resumed.trajectory.values, fresh.trajectory.values, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('engine_class', [TimeStepSimulationEngine, VectorizedSimulationEngine])
+def test_does_not_resume_across_brackets(engine_class):
+    shorter = engine(engine_class, 5)
+    shorter.run_simulation()
+    checkpoint = shorter.export_checkpoint()
+    
+    longer = engine(engine_class, 10)
+    assert longer.checkpoint_key() != checkpoint['key']
+    with pytest.raises(ValueError):
+        longer.run_simulation(checkpoint=checkpoint)
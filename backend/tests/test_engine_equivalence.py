@@ -0,0 +1,73 @@
+"""
+Equivalence tests for the simulation engines
+The vectorized engine, pruned or not, must reproduce the scalar
+TimeStepSimulationEngine run for run; so must the worklist engine when it
+is held to a single propagation round (its first-order special case)
+
+Usage (from backend/): python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+import simulation_worklist
+from sdg_graph import get_compiled_graph, synthetic_graph
+from simulation_cache import simulation_cache
+from simulation_core import TimeStepSimulationEngine
+from simulation_vectorized import VectorizedSimulationEngine
+from simulation_worklist import WorklistSimulationEngine
+
+
+# (target SDGs, scenario, funding, years, delay months)
+CASES = [
+    ([6], 'success', 100.0, 5, 0),
+    ([4, 8], 'partial_success', 80.0, 10, 6),
+    ([1, 3, 7, 9, 12], 'failure', 100.0, 15, 0),
+    ([4, 7, 9, 16], 'underfunded', 50.0, 12, 0),
+    ([2], 'delay', 100.0, 1, 12),
+    ([13], 'success', 100.0, 0, 0),
+]
+
+SEEDS = [0, 1, 7]
+
+GRAPHS = {
+    'built-in': get_compiled_graph,
+    'synthetic': lambda: synthetic_graph(150, 400, seed=3).compile(),
+}
+
+
+def run(engine_class, graph, case, seed, prune=True):
+    target_sdgs, scenario_type, funding_percentage, timeline_years, delay_months = case
+    simulation_cache.clear()  # Seeded runs are cached; each engine must compute its own
+    engine = engine_class(graph, target_sdgs, scenario_type, funding_percentage,
+                          timeline_years, delay_months, seed=seed)
+    engine.prune = prune
+    engine.run_simulation()
+    return engine.trajectory
+
+
+@pytest.mark.parametrize('graph_name', list(GRAPHS))
+@pytest.mark.parametrize('case', CASES)
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('engine_class, prune', [
+    (VectorizedSimulationEngine, True),
+    (VectorizedSimulationEngine, False),
+    (WorklistSimulationEngine, True),
+])
+def test_matches_scalar_engine(monkeypatch, engine_class, prune, seed, case, graph_name):
+    monkeypatch.setattr(simulation_worklist, 'MAX_PROPAGATION_ROUNDS', 1)
+    graph = GRAPHS[graph_name]()
+    expected = run(TimeStepSimulationEngine, graph, case, seed)
+    actual = run(engine_class, graph, case, seed, prune)
+    
+    np.testing.assert_allclose(actual.values, expected.values, rtol=0, atol=1e-9)
+    
+    # Effects still pending after the horizon match too
+    pending = sorted(actual.delayed_effects.pending())
+    expected_pending = sorted(expected.delayed_effects.pending())
+    assert [(p, years) for p, _, years in pending] == [(p, years) for p, _, years in expected_pending]
+    np.testing.assert_allclose([effect for _, effect, _ in pending],
+                               [effect for _, effect, _ in expected_pending], rtol=0, atol=1e-9)
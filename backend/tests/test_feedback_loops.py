@@ -0,0 +1,70 @@
+"""
+Regression tests for the feedback loops derived from graph cycles
+Pins the loops of the built-in graph and the end values they produce, so any
+change to feedback behaviour shows up here and must be made deliberately
+
+Usage (from backend/): python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from sdg_graph import get_compiled_graph
+from simulation_core import FeedbackLoopEngine, TimeStepSimulationEngine
+from simulation_vectorized import VectorizedSimulationEngine
+
+
+# (chain, strength, delay) of every cycle of the built-in graph
+EXPECTED_LOOPS = [
+    (['health_index', 'employment_rate', 'health_index'], 0.09, 2),
+    (['health_index', 'education_index', 'employment_rate', 'health_index'], 0.03, 4),
+    (['health_index', 'education_index', 'health_index'], 0.06, 4),
+    (['health_index', 'education_index', 'innovation_index', 'employment_rate', 'health_index'], 0.0144, 5),
+    (['health_index', 'education_index', 'innovation_index', 'clean_energy', 'emissions_reduction',
+      'health_index'], 0.02304, 7),
+    (['health_index', 'education_index', 'innovation_index', 'clean_energy', 'health_index'], 0.0216, 6),
+    (['health_index', 'education_index', 'innovation_index', 'circular_economy', 'emissions_reduction',
+      'health_index'], 0.012, 8),
+    (['health_index', 'education_index', 'innovation_index', 'circular_economy', 'employment_rate',
+      'health_index'], 0.0054, 7),
+    (['clean_energy', 'innovation_index', 'clean_energy'], 0.24, 3),
+]
+
+# Final indicator values (graph order) of seeded runs: (target SDGs, scenario, years) -> values
+EXPECTED_END_VALUES = [
+    (([1, 6], 'success', 10), [
+        71.022967, 65.226614, 70.268928, 68.00028, 72.0, 79.550348, 30.000162, 65.152132, 55.000104,
+        60.0, 58.0, 40.000019, 35.00008, 62.0, 68.0, 64.0, 60.0
+    ]),
+    (([3, 8], 'partial_success', 5), [
+        15.604336, 65.33155, 74.735366, 68.089654, 72.0, 75.0, 30.0, 69.602314, 55.000184,
+        60.203735, 58.0, 40.0, 35.0, 62.0, 68.0, 64.0, 60.0
+    ]),
+    (([7, 9, 13], 'success', 20), [
+        18.304153, 65.098087, 73.110295, 68.088025, 72.0, 75.0, 81.089098, 66.994317, 78.389732,
+        60.072386, 58.0, 47.163062, 82.310645, 65.927072, 70.509701, 64.0, 60.0
+    ]),
+]
+
+
+def test_loops_are_the_graph_cycles():
+    loops = FeedbackLoopEngine(get_compiled_graph()).feedback_loops
+    
+    assert [(loop['chain'], loop['delay']) for loop in loops] == [
+        (chain, delay) for chain, _, delay in EXPECTED_LOOPS
+    ]
+    np.testing.assert_allclose([loop['strength'] for loop in loops],
+                               [strength for _, strength, _ in EXPECTED_LOOPS])
+
+
+@pytest.mark.parametrize('parameters, expected', EXPECTED_END_VALUES)
+@pytest.mark.parametrize('engine_class', [TimeStepSimulationEngine, VectorizedSimulationEngine])
+def test_end_values(engine_class, parameters, expected):
+    target_sdgs, scenario_type, timeline_years = parameters
+    engine = engine_class(get_compiled_graph(), target_sdgs, scenario_type, 100.0, timeline_years, 0, seed=1)
+    engine.run_simulation()
+    
+    np.testing.assert_allclose(engine.trajectory.values[-1], expected, rtol=0, atol=1e-5)
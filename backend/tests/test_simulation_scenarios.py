@@ -0,0 +1,53 @@
+"""
+Tests for batched scenario comparison
+Each variant of a seeded comparison must match a standalone run of that variant
+
+Usage (from backend/): python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from sdg_graph import get_compiled_graph
+from simulation_core import TimeStepSimulationEngine
+from simulation_explainer import SimulationExplainer
+from simulation_scenarios import ScenarioComparison, SCENARIOS, default_variant
+
+
+TARGET_SDGS = [1, 6]
+TIMELINE_YEARS = 3  # Short enough to leave delayed effects pending
+SEED = 1
+
+
+@pytest.fixture(scope='module')
+def comparison():
+    variants = [default_variant(scenario_type) for scenario_type in SCENARIOS]
+    return variants, ScenarioComparison(TARGET_SDGS, TIMELINE_YEARS, variants, SEED).run(fields=('risks',))
+
+
+@pytest.mark.parametrize('index', range(len(SCENARIOS)))
+def test_variant_matches_standalone_run(comparison, index):
+    variants, results = comparison
+    variant, result = variants[index], results[index]
+    graph = get_compiled_graph()
+    engine = TimeStepSimulationEngine(
+        graph, TARGET_SDGS, variant['scenario_type'], variant['funding_percentage'],
+        TIMELINE_YEARS, variant['delay_months'], seed=SEED
+    )
+    engine.run_simulation()
+    summary = SimulationExplainer(
+        graph=graph,
+        states=engine.states,
+        constraint_engine=engine.constraint_engine,
+        target_sdgs=TARGET_SDGS
+    ).generate_summary(('risks',))
+    
+    assert result['risks'] == summary['risks']
+    assert result['net_progress'] == pytest.approx(summary['net_sdg_progress'], abs=1e-6)
+    np.testing.assert_allclose(
+        [result['final_state'][key] for key in graph.keys],
+        engine.trajectory.values[-1], rtol=0, atol=1e-6
+    )